@@ -2,8 +2,7 @@ from __future__ import annotations
 
 import csv
 import pathlib
-from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -15,26 +14,7 @@ def _parse_ts(s: str) -> datetime:
         return datetime.now(timezone.utc)
 
 
-def predict_geofence_risk(
-    config: dict[str, Any],
-    incidents: Iterable[dict[str, Any]],
-    horizon_days: int = 30,
-    out_csv: str = "artifacts/predictions/risk_map.csv",
-) -> list[dict[str, Any]]:
-    cutoff = datetime.now(timezone.utc) - timedelta(days=horizon_days)
-    scores: dict[str, list[float]] = defaultdict(list)
-    for inc in incidents:
-        ts = _parse_ts(inc.get("timestamp", ""))
-        if ts < cutoff:
-            continue
-        gf = inc.get("geofence_id") or "unknown"
-        sev = float(inc.get("severity", {}).get("overall", 0.0))
-        scores[gf].append(sev)
-    results: list[dict[str, Any]] = []
-    for gf, vals in scores.items():
-        risk = sum(vals) / len(vals) if vals else 0.0
-        results.append({"geofence_id": gf, "risk": round(risk, 4), "count": len(vals)})
-    # Write CSV
+def _write_csv(out_csv: str, results: list[dict[str, Any]]) -> list[dict[str, Any]]:
     p = pathlib.Path(out_csv)
     p.parent.mkdir(parents=True, exist_ok=True)
     with p.open("w", encoding="utf-8", newline="") as f:
@@ -43,3 +23,97 @@ def predict_geofence_risk(
         for row in results:
             w.writerow(row)
     return results
+
+
+class RiskAggregator:
+    """Running per-geofence mean severity over incidents within the horizon.
+
+    Only a sum and a count per geofence and day are kept, so incidents can be fed in
+    batches of any size without holding them. The horizon is applied (at day
+    granularity) when results are read, so in a long-running service incidents age out
+    of the risk map as time passes.
+    """
+
+    def __init__(self, horizon_days: int = 30, clock: Callable[[], datetime] | None = None) -> None:
+        self.horizon_days = horizon_days
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.state = GeofenceRiskState()
+
+    def _cutoff(self) -> str:
+        return (self.clock() - timedelta(days=self.horizon_days)).date().isoformat()
+
+    def add(self, incidents: Iterable[dict[str, Any]]) -> None:
+        cutoff = self._cutoff()
+        for inc in incidents:
+            ts = inc.get("timestamp", "")
+            if _parse_ts(ts).date().isoformat() < cutoff:
+                continue
+            overall = float(inc.get("severity", {}).get("overall", 0.0))
+            self.state.add(inc.get("geofence_id"), ts, overall)
+
+    def results(self) -> list[dict[str, Any]]:
+        cutoff = self._cutoff()
+        for gf, days in list(self.state.days.items()):
+            for day in [d for d in days if d < cutoff]:
+                del days[day]  # expired for good: the clock only moves forward
+            if not days:
+                del self.state.days[gf]
+        return self.state.results(self.horizon_days, self.clock())
+
+    def write_csv(
+        self, out_csv: str = "artifacts/predictions/risk_map.csv"
+    ) -> list[dict[str, Any]]:
+        return _write_csv(out_csv, self.results())
+
+
+def risk_map_path(config: dict[str, Any]) -> str:
+    """The risk map CSV under ``artifacts.predictions_dir``."""
+    predictions_dir = config.get("artifacts", {}).get("predictions_dir", "artifacts/predictions")
+    return f"{predictions_dir}/risk_map.csv"
+
+
+def predict_geofence_risk(
+    config: dict[str, Any],
+    incidents: Iterable[dict[str, Any]],
+    horizon_days: int = 30,
+    out_csv: str | None = None,
+) -> list[dict[str, Any]]:
+    """Write the risk map of ``incidents`` to ``out_csv`` (default :func:`risk_map_path`)."""
+    agg = RiskAggregator(horizon_days)
+    agg.add(incidents)
+    return agg.write_csv(out_csv or risk_map_path(config))
+
+
+class GeofenceRiskState:
+    """Persistent per-geofence, per-day severity sums for incremental runs.
+
+    Contributions can be added and withdrawn (when an incident is re-scored), and the
+    horizon is applied at day granularity when results are read.
+    """
+
+    def __init__(self, days: dict[str, dict[str, list[float]]] | None = None) -> None:
+        self.days: dict[str, dict[str, list[float]]] = days or {}  # gf -> day -> [sum, count]
+
+    def add(self, geofence_id: str | None, timestamp: str, overall: float, sign: int = 1) -> None:
+        day = _parse_ts(timestamp).date().isoformat()
+        cell = self.days.setdefault(geofence_id or "unknown", {}).setdefault(day, [0.0, 0])
+        cell[0] += sign * overall
+        cell[1] += sign
+        if cell[1] <= 0:
+            del self.days[geofence_id or "unknown"][day]
+
+    def results(self, horizon_days: int = 30, now: datetime | None = None) -> list[dict[str, Any]]:
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=horizon_days)).date().isoformat()
+        results: list[dict[str, Any]] = []
+        for gf, days in self.days.items():
+            total = sum(v[0] for d, v in days.items() if d >= cutoff)
+            n = int(sum(v[1] for d, v in days.items() if d >= cutoff))
+            if n:
+                results.append({"geofence_id": gf, "risk": round(total / n, 4), "count": n})
+        return results
+
+    def write_csv(
+        self, out_csv: str = "artifacts/predictions/risk_map.csv", horizon_days: int = 30
+    ) -> list[dict[str, Any]]:
+        return _write_csv(out_csv, self.results(horizon_days))
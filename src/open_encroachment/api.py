@@ -4,6 +4,7 @@ OpenEncroachment FastAPI Application
 Provides REST API endpoints for the OpenEncroachment threat detection system.
 """
 
+import os
 from contextlib import asynccontextmanager
 from typing import Any
 
@@ -11,12 +12,13 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from .agents.agent import run_agent
 from .case_management.case_manager import CaseManager
 from .comms.dispatcher import Dispatcher
 from .config import load_config
 from .evidence.chain_of_custody import verify_ledger
-from .pipeline import run_pipeline
+
+# The agent SDK and the pipeline (sklearn, pandas, PIL) are imported by the endpoints
+# that use them, so the app starts without loading them unless models.warm_up is set.
 
 
 class AgentRequest(BaseModel):
@@ -43,7 +45,13 @@ class NotificationRequest(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    # Startup
+    # Startup: models are cached process-wide, so loading them here takes the load
+    # off the first pipeline request
+    cfg = load_config(os.environ.get("OPEN_ENCROACHMENT_CONFIG"))
+    if cfg.get("models", {}).get("warm_up", False):
+        from .models.threat_classifier import ThreatClassifier
+
+        ThreatClassifier.from_config(cfg)
     yield
     # Shutdown
 
@@ -80,6 +88,8 @@ async def health_check() -> dict[str, str]:
 @app.post("/api/v1/agent/run")
 async def agent_run(request: AgentRequest) -> dict[str, Any]:
     """Run the OpenEncroachment agent with a prompt."""
+    from .agents.agent import run_agent
+
     try:
         result = run_agent(
             prompt=request.prompt,
@@ -97,6 +107,8 @@ async def agent_run(request: AgentRequest) -> dict[str, Any]:
 @app.post("/api/v1/pipeline/run")
 async def pipeline_run(request: PipelineRequest) -> dict[str, Any]:
     """Execute the complete pipeline."""
+    from .pipeline import run_pipeline
+
     try:
         result = run_pipeline(
             config_path=request.config_path,
@@ -0,0 +1,378 @@
+"""Seeded synthetic workloads and an end-to-end pipeline benchmark (``open-encroachment bench``).
+
+:func:`generate_workload` writes a reproducible data set of any size in the layout the
+ingestion sources read: ground sensors reporting at fixed positions, GPS devices on
+random walks, social posts (threat and benign templates, some geotagged, some reposts),
+satellite/aerial image tiles and geofences of configurable count and vertex count.
+
+:func:`run_bench` builds a self-contained workspace (data, models, outputs and a derived
+``settings.yaml``), runs the pipeline in it ``repeat`` times after ``warmup`` untimed
+runs and reports per-stage and end-to-end latency percentiles, throughput and memory.
+Outputs are cleared between runs so every run does the same work; trained models are
+kept, as in production. Reports saved with ``--save-baseline`` can be compared with
+:func:`compare` to catch regressions.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, cast
+
+import numpy as np
+import yaml
+
+from .utils.metrics import peak_rss_kb
+
+# Area around the sample conservation area that generated data is spread over
+LAT_RANGE = (37.30, 37.40)
+LON_RANGE = (-122.06, -121.96)
+
+_THREAT_TEXTS = [
+    "Illegal dumping spotted near {place}",
+    "Unauthorized excavation within {place}",
+    "Pipeline tampering reported by locals at {place}",
+    "Trucks unloading debris at night by {place}",
+    "Fence cut and heavy machinery inside {place}",
+]
+_BENIGN_TEXTS = [
+    "Great weather for a hike near {place}",
+    "Birds nesting by {place}, beautiful scene",
+    "Road repair completed successfully at {place}",
+    "Community cleanup day at {place} was a success",
+    "Farmers market opening next to {place}",
+]
+_PLACES = ["the river", "the north gate", "the protected forest", "the reservoir", "the ridge"]
+
+
+@dataclass
+class Workload:
+    seed: int = 0
+    sensors: int = 100
+    readings: int = 24  # per sensor
+    devices: int = 50
+    fixes: int = 50  # per device
+    posts: int = 2000
+    tiles: int = 20  # split between satellite and aerial
+    tile_size: int = 256
+    geofences: int = 10
+    vertices: int = 32  # per geofence
+    span_h: float = 24.0
+
+    @property
+    def events(self) -> int:
+        return self.sensors * self.readings + self.devices * self.fixes + self.posts + self.tiles
+
+
+def _geofences(rng: np.random.Generator, w: Workload) -> list[dict[str, Any]]:
+    fences = []
+    for g in range(w.geofences):
+        clat = rng.uniform(*LAT_RANGE)
+        clon = rng.uniform(*LON_RANGE)
+        radius = rng.uniform(0.004, 0.012)
+        angles = np.sort(rng.uniform(0.0, 2 * np.pi, max(3, w.vertices)))
+        radii = radius * rng.uniform(0.6, 1.0, angles.size)
+        polygon = [
+            [round(float(clat + r * np.sin(a)), 6), round(float(clon + r * np.cos(a)), 6)]
+            for a, r in zip(angles, radii, strict=True)
+        ]
+        fences.append({"id": f"bench_gf_{g}", "name": f"Bench area {g}", "polygon": polygon})
+    return fences
+
+
+def _iso(start: datetime, offsets_s: np.ndarray) -> list[str]:
+    return [(start + timedelta(seconds=float(s))).isoformat() for s in offsets_s]
+
+
+def generate_workload(
+    root: str | os.PathLike[str], w: Workload, start: datetime | None = None
+) -> list[dict[str, Any]]:
+    """Write the workload's data files under ``root``; returns its geofences.
+
+    Timestamps cover the ``span_h`` hours before ``start`` (default: the last midnight
+    UTC), so incidents fall inside the risk horizon and a seed gives the same data set
+    all day.
+    """
+    import pandas as pd
+    from PIL import Image
+
+    rng = np.random.default_rng(w.seed)
+    root = pathlib.Path(root)
+    if start is None:
+        start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    begin = start - timedelta(hours=w.span_h)
+    span_s = w.span_h * 3600
+
+    geofences = _geofences(rng, w)
+
+    # Ground sensors: fixed positions, evenly spaced readings, ~5% anomalous
+    n = w.sensors * w.readings
+    step = span_s / max(1, w.readings)
+    offsets = np.tile(np.arange(w.readings) * step, w.sensors) + rng.uniform(0, step, n)
+    anomalous = rng.random(n) < 0.05
+    ground = pd.DataFrame(
+        {
+            "timestamp": _iso(begin, offsets),
+            "lat": np.repeat(rng.uniform(*LAT_RANGE, w.sensors), w.readings).round(6),
+            "lon": np.repeat(rng.uniform(*LON_RANGE, w.sensors), w.readings).round(6),
+            "pm25": (rng.normal(15, 4, n) + anomalous * rng.uniform(30, 60, n)).round(2),
+            "noise_db": (rng.normal(50, 5, n) + anomalous * rng.uniform(20, 35, n)).round(2),
+            "vibration": (rng.gamma(2.0, 0.1, n) + anomalous * rng.uniform(0.5, 1.0, n)).round(3),
+            "temp_c": rng.normal(22, 2, n).round(2),
+        }
+    ).iloc[np.argsort(offsets, kind="stable")]
+    (root / "ground").mkdir(parents=True, exist_ok=True)
+    ground.to_csv(root / "ground" / "ground_sensors.csv", index=False)
+
+    # GPS: one random walk per device, fixes interleaved by time
+    n = w.devices * w.fixes
+    step = span_s / max(1, w.fixes)
+    offsets = np.tile(np.arange(w.fixes) * step, w.devices) + rng.uniform(0, step, n)
+    walk = rng.normal(0, 0.0005, (w.devices, w.fixes, 2)).cumsum(axis=1)
+    lat = (rng.uniform(*LAT_RANGE, w.devices)[:, None] + walk[..., 0]).ravel()
+    lon = (rng.uniform(*LON_RANGE, w.devices)[:, None] + walk[..., 1]).ravel()
+    gps = pd.DataFrame(
+        {"timestamp": _iso(begin, offsets), "lat": lat.round(6), "lon": lon.round(6)}
+    ).iloc[np.argsort(offsets, kind="stable")]
+    (root / "gps").mkdir(parents=True, exist_ok=True)
+    gps.to_csv(root / "gps" / "gps_events.csv", index=False)
+
+    # Social: ~30% threat-indicative, ~60% geotagged, ~10% reposts of an earlier post
+    n = w.posts
+    offsets = np.sort(rng.uniform(0, span_s, n))
+    threat = rng.random(n) < 0.3
+    texts = [
+        rng.choice(_THREAT_TEXTS if t else _BENIGN_TEXTS).format(place=rng.choice(_PLACES))
+        for t in threat
+    ]
+    geotagged = rng.random(n) < 0.6
+    lat = np.where(geotagged, rng.uniform(*LAT_RANGE, n).round(6), np.nan)
+    lon = np.where(geotagged, rng.uniform(*LON_RANGE, n).round(6), np.nan)
+    for i in np.flatnonzero(rng.random(n) < 0.1)[1:]:
+        j = int(rng.integers(0, i))
+        texts[i], lat[i], lon[i] = texts[j], lat[j], lon[j]
+    social = pd.DataFrame(
+        {
+            "timestamp": _iso(begin, offsets),
+            "source": rng.choice(["twitter", "news", "forum"], n),
+            "text": texts,
+            "lat": lat,
+            "lon": lon,
+        }
+    )
+    (root / "social").mkdir(parents=True, exist_ok=True)
+    social.to_csv(root / "social" / "sample_social.csv", index=False)
+
+    # Image tiles: noisy ground with a few dark rectangular structures
+    for sub in ("satellite", "aerial"):
+        shutil.rmtree(root / sub, ignore_errors=True)
+        (root / sub).mkdir(parents=True)
+    size = w.tile_size
+    for t in range(w.tiles):
+        px = rng.normal(190, 15, (size, size, 3))
+        for _ in range(int(rng.integers(0, 4))):
+            y, x = rng.integers(0, size * 3 // 4, 2)
+            h, wd = rng.integers(size // 16, size // 4, 2)
+            px[y : y + h, x : x + wd] = rng.uniform(60, 110)
+        img = Image.fromarray(px.clip(0, 255).astype(np.uint8))
+        path = root / ("satellite", "aerial")[t % 2] / f"tile_{t:05d}.png"
+        img.save(path)
+        # Image events are timestamped with the file mtime; place it inside the span
+        mtime = begin.timestamp() + rng.uniform(0, span_s)
+        os.utime(path, (mtime, mtime))
+    return geofences
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50_s": round(p50, 6), "p95_s": round(p95, 6), "p99_s": round(p99, 6)}
+
+
+def _bench_config(cfg: dict[str, Any], geofences: list[dict[str, Any]]) -> dict[str, Any]:
+    """``cfg`` with the workload's geofences and all outputs inside the workspace."""
+    cache = cfg.get("cache", {})
+    return {
+        **cfg,
+        "geofences": geofences,
+        "dispatch": {**cfg.get("dispatch", {}), "mode": "local", "outbox_dir": "out/outbox"},
+        "metrics": {"enabled": True, "log_path": None},
+        "cache": {**cache, "dir": "cache"},
+        "artifacts": {
+            "models_dir": "models",
+            "predictions_dir": "out/predictions",
+            "db_path": "out/case_manager.db",
+            "evidence_ledger": "out/evidence_ledger.jsonl",
+            "event_store_dir": (
+                "out/events" if cfg.get("artifacts", {}).get("event_store_dir") else None
+            ),
+        },
+    }
+
+
+def run_bench(
+    cfg: dict[str, Any],
+    workload: Workload,
+    workdir: str | os.PathLike[str] = "artifacts/bench",
+    repeat: int = 3,
+    warmup: int = 1,
+    stream: bool = False,
+) -> dict[str, Any]:
+    """Generate ``workload`` in ``workdir`` and benchmark the pipeline over it."""
+    from .pipeline import run_pipeline
+
+    work = pathlib.Path(workdir).resolve()
+    t0 = time.perf_counter()
+    geofences = generate_workload(work / "data", workload)
+    generate_s = time.perf_counter() - t0
+    with (work / "settings.yaml").open("w", encoding="utf-8") as f:
+        yaml.safe_dump(_bench_config(cfg, geofences), f, sort_keys=False)
+
+    totals: list[float] = []
+    stages: dict[str, list[dict[str, float]]] = {}
+    result: dict[str, Any] = {}
+    # Every source path is relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(work)
+    try:
+        for i in range(warmup + repeat):
+            shutil.rmtree("out", ignore_errors=True)
+            t0 = time.perf_counter()
+            result = run_pipeline(config_path="settings.yaml", stream=stream)
+            if i < warmup:
+                continue
+            totals.append(time.perf_counter() - t0)
+            for name, rec in result.get("timings", {}).items():
+                stages.setdefault(name, []).append(rec)
+    finally:
+        os.chdir(cwd)
+
+    events = result.get("events", 0)
+    p50 = float(np.median(totals))
+    return {
+        "workload": {**asdict(workload), "events": workload.events},
+        "mode": "stream" if stream else "batch",
+        "runs": repeat,
+        "generate_s": round(generate_s, 3),
+        "total": {
+            **_percentiles(totals),
+            "events": events,
+            "events_per_s": round(events / p50, 1) if p50 > 0 else 0.0,
+        },
+        "stages": {
+            name: {
+                **_percentiles([r["wall_s"] for r in recs]),
+                "cpu_s": round(float(np.median([r["cpu_s"] for r in recs])), 6),
+                "items": int(recs[-1]["items"]),
+                "items_per_s": round(float(np.median([r["items_per_s"] for r in recs])), 1),
+                "rss_peak_delta_kb": int(max(r["rss_peak_delta_kb"] for r in recs)),
+            }
+            for name, recs in stages.items()
+        },
+        "incidents": result.get("incidents", 0),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def synthetic_incidents(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Classified-looking rows with a random mix of modalities, for scoring benchmarks."""
+    from .models.features import FEATURES
+
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.0, 1.5, (n, len(FEATURES)))
+    keep = rng.random((n, len(FEATURES))) < 0.4
+    probs = rng.random(n)
+    in_geofence = rng.random(n) < 0.3
+    return [
+        {
+            "threat_probability": float(probs[i]),
+            "text_threat": float(probs[i]),
+            "in_geofence": bool(in_geofence[i]),
+            "features": {
+                name: float(values[i, j]) for j, name in enumerate(FEATURES) if keep[i, j]
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def bench_scoring(n: int = 100_000, seed: int = 0) -> dict[str, Any]:
+    """Time the scalar and the vectorized baseline probability and severity paths."""
+    from .models.features import FeatureMatrix
+    from .models.severity import severity_score, severity_scores
+    from .models.threat_classifier import baseline_probabilities, baseline_probability
+
+    rows = synthetic_incidents(n, seed)
+
+    t0 = time.perf_counter()
+    scalar_prob = [
+        baseline_probability(r["features"], r["text_threat"], r["in_geofence"]) for r in rows
+    ]
+    scalar_sev = [
+        severity_score(r["threat_probability"], r["features"], r["in_geofence"], None)["overall"]
+        for r in rows
+    ]
+    scalar_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fm = FeatureMatrix.from_dicts([r["features"] for r in rows])
+    matrix_s = time.perf_counter() - t0
+    in_geofence = np.array([r["in_geofence"] for r in rows])
+    probs = np.array([r["threat_probability"] for r in rows])
+    prob = baseline_probabilities(fm, probs, in_geofence)
+    sev = severity_scores(probs, fm, in_geofence)["overall"]
+    vector_s = time.perf_counter() - t0
+    return {
+        "incidents": n,
+        "scalar_s": round(scalar_s, 4),
+        "vectorized_s": round(vector_s, 4),
+        "matrix_build_s": round(matrix_s, 4),
+        "speedup": round(scalar_s / vector_s, 1) if vector_s > 0 else None,
+        "max_abs_diff": float(
+            max(np.abs(prob - scalar_prob).max(), np.abs(sev - scalar_sev).max()) if n else 0.0
+        ),
+    }
+
+
+def compare(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = 0.25,
+    floor_s: float = 0.005,
+) -> list[dict[str, Any]]:
+    """Median latencies that grew by more than ``tolerance`` relative to ``baseline``.
+
+    Stages whose baseline median is under ``floor_s`` are ignored as timer noise.
+    """
+    pairs = [("total", report["total"], baseline.get("total", {}))]
+    pairs += [
+        (name, rec, baseline.get("stages", {}).get(name, {}))
+        for name, rec in report["stages"].items()
+    ]
+    regressions = []
+    for name, new, old in pairs:
+        base = old.get("p50_s")
+        if not base or base < floor_s:
+            continue
+        ratio = new["p50_s"] / base
+        if ratio > 1.0 + tolerance:
+            regressions.append(
+                {"stage": name, "p50_s": new["p50_s"], "baseline_p50_s": base, "ratio": ratio}
+            )
+    return regressions
+
+
+def load_report(path: str | os.PathLike[str]) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return cast(dict[str, Any], json.load(f))
+
+
+def save_report(path: str | os.PathLike[str], report: dict[str, Any]) -> None:
+    p = pathlib.Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
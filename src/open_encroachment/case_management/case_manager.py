@@ -2,21 +2,42 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from typing import Any
 
 from open_encroachment.utils.io import ensure_dir
 
 
 class CaseManager:
-    def __init__(self, db_path: str = "artifacts/case_manager.db") -> None:
+    def __init__(
+        self, db_path: str = "artifacts/case_manager.db", persistent: bool = False
+    ) -> None:
+        """``persistent`` keeps one SQLite connection open until :meth:`close` (for
+        long-running services); otherwise each call opens and closes its own."""
         self.db_path = db_path
         ensure_dir("artifacts")
+        self._con: sqlite3.Connection | None = sqlite3.connect(db_path) if persistent else None
         self._init_db()
 
-    def _init_db(self) -> None:
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        if self._con is not None:
+            yield self._con
+            return
         con = sqlite3.connect(self.db_path)
         try:
+            yield con
+        finally:
+            con.close()
+
+    def close(self) -> None:
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    def _init_db(self) -> None:
+        with self._connection() as con:
             cur = con.cursor()
             cur.execute(
                 """
@@ -51,15 +72,13 @@ class CaseManager:
                 """
             )
             con.commit()
-        finally:
-            con.close()
 
     def record_incidents(self, incidents: Iterable[dict[str, Any]]) -> None:
-        con = sqlite3.connect(self.db_path)
-        try:
+        with self._connection() as con:
             cur = con.cursor()
             for inc in incidents:
                 sev = inc.get("severity", {})
+                text = inc.get("text_threat", 0.0)
                 cur.execute(
                     """
                     INSERT OR REPLACE INTO incidents (
@@ -77,7 +96,7 @@ class CaseManager:
                         inc.get("geofence_id"),
                         1 if inc.get("in_geofence") else 0,
                         float(inc.get("threat_probability", 0.0)),
-                        float(inc.get("text_threat", 0.0)),
+                        float(text) if text is not None else None,
                         float(sev.get("overall", 0.0)),
                         float(sev.get("environmental", 0.0)),
                         float(sev.get("legal", 0.0)),
@@ -87,26 +106,20 @@ class CaseManager:
                     ),
                 )
             con.commit()
-        finally:
-            con.close()
 
     def list_incidents(self, limit: int = 50) -> list[dict[str, Any]]:
-        con = sqlite3.connect(self.db_path)
-        con.row_factory = sqlite3.Row
-        try:
+        with self._connection() as con:
+            con.row_factory = sqlite3.Row
             cur = con.cursor()
             cur.execute("SELECT * FROM incidents ORDER BY timestamp DESC LIMIT ?", (limit,))
             rows = cur.fetchall()
             return [dict(r) for r in rows]
-        finally:
-            con.close()
 
     def create_case(self, incident_id: str, assigned_to: str = "", status: str = "open") -> int:
         from datetime import datetime, timezone
 
         ts = datetime.now(timezone.utc).isoformat()
-        con = sqlite3.connect(self.db_path)
-        try:
+        with self._connection() as con:
             cur = con.cursor()
             cur.execute(
                 "INSERT INTO cases (incident_id, status, assigned_to, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
@@ -114,28 +127,50 @@ class CaseManager:
             )
             con.commit()
             return int(cur.lastrowid)
-        finally:
-            con.close()
 
     def update_case_status(self, case_id: int, status: str) -> None:
         from datetime import datetime, timezone
 
         ts = datetime.now(timezone.utc).isoformat()
-        con = sqlite3.connect(self.db_path)
-        try:
+        with self._connection() as con:
             cur = con.cursor()
             cur.execute("UPDATE cases SET status=?, updated_at=? WHERE id=?", (status, ts, case_id))
             con.commit()
-        finally:
-            con.close()
 
     def list_cases(self, limit: int = 50) -> list[dict[str, Any]]:
-        con = sqlite3.connect(self.db_path)
-        con.row_factory = sqlite3.Row
-        try:
+        with self._connection() as con:
+            con.row_factory = sqlite3.Row
             cur = con.cursor()
             cur.execute("SELECT * FROM cases ORDER BY id DESC LIMIT ?", (limit,))
             rows = cur.fetchall()
             return [dict(r) for r in rows]
-        finally:
-            con.close()
+
+    def labeled_incidents(
+        self, positive: Iterable[str], negative: Iterable[str]
+    ) -> list[dict[str, Any]]:
+        """Incidents whose latest case ended in an outcome status, with ``label`` 1 or 0.
+
+        Statuses in ``positive`` mark confirmed threats and those in ``negative`` false
+        alarms; incidents without a case or with an open one are left out.
+        """
+        positive, negative = list(positive), list(negative)
+        statuses = positive + negative
+        if not statuses:
+            return []
+        marks = ", ".join("?" * len(statuses))
+        with self._connection() as con:
+            con.row_factory = sqlite3.Row
+            cur = con.cursor()
+            cur.execute(
+                f"""
+                SELECT i.*, c.status AS case_status FROM incidents i
+                JOIN cases c ON c.id = (SELECT MAX(id) FROM cases WHERE incident_id = i.id)
+                WHERE c.status IN ({marks})
+                ORDER BY i.timestamp
+                """,
+                statuses,
+            )
+            rows = [dict(r) for r in cur.fetchall()]
+        for r in rows:
+            r["label"] = 1 if r["case_status"] in positive else 0
+        return rows
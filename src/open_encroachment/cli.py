@@ -9,12 +9,126 @@ from .analytics.predictive import predict_geofence_risk
 from .case_management.case_manager import CaseManager
 from .config import load_config
 from .evidence.chain_of_custody import verify_ledger
-from .pipeline import run_pipeline
+
+# Only stdlib- and yaml-backed modules are imported here: commands that need the
+# pipeline (numpy, pandas, sklearn, PIL, pydantic) import it when they run, so that
+# scripted `case` and `evidence` calls start quickly (see tests/test_cli_startup.py).
 
 
 def cmd_run_pipeline(args: argparse.Namespace) -> None:
-    result = run_pipeline(config_path=args.config, use_sample_data=args.sample_data)
+    from .pipeline import run_pipeline
+
+    result = run_pipeline(
+        config_path=args.config,
+        use_sample_data=args.sample_data,
+        stream=args.stream,
+        metrics=True if args.timings else None,
+        incremental=args.incremental,
+    )
     print(json.dumps(result, indent=2))
+    if args.timings:
+        from .utils.metrics import format_table
+
+        print(format_table(result.get("timings", {})), file=sys.stderr)
+
+
+def cmd_watch(args: argparse.Namespace) -> None:
+    from .ingestion.watcher import watch
+
+    cfg = load_config(args.config)
+    try:
+        for result in watch(cfg, interval=args.interval, once=args.once, mode=args.mode):
+            print(json.dumps(result), flush=True)
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_serve_stream(args: argparse.Namespace) -> None:
+    from .service import StreamService
+
+    svc = StreamService(load_config(args.config))
+    svc.install_signal_handlers()
+    for result in svc.serve(interval=args.interval, max_events=args.max_events):
+        print(json.dumps(result), flush=True)
+
+
+def cmd_bench(args: argparse.Namespace) -> None:
+    from .bench import Workload, compare, load_report, run_bench, save_report
+    from .utils.metrics import format_table
+
+    if args.scoring:
+        from .bench import bench_scoring
+
+        print(json.dumps(bench_scoring(args.scoring, args.seed), indent=2))
+        return
+    cfg = load_config(args.config)
+    bcfg = cfg.get("bench", {})
+    workload = Workload(
+        seed=args.seed,
+        sensors=args.sensors,
+        readings=args.readings,
+        devices=args.devices,
+        fixes=args.fixes,
+        posts=args.posts,
+        tiles=args.tiles,
+        tile_size=args.tile_size,
+        geofences=args.geofences,
+        vertices=args.vertices,
+    )
+    report = run_bench(
+        cfg,
+        workload,
+        workdir=args.workdir or bcfg.get("workdir", "artifacts/bench"),
+        repeat=args.repeat if args.repeat is not None else int(bcfg.get("repeat", 3)),
+        warmup=args.warmup if args.warmup is not None else int(bcfg.get("warmup", 1)),
+        stream=args.stream,
+    )
+    print(json.dumps(report, indent=2))
+    cols = ["items", "p50_s", "p95_s", "p99_s", "cpu_s", "items_per_s", "rss_peak_delta_kb"]
+    print(format_table({**report["stages"], "total": report["total"]}, cols), file=sys.stderr)
+    if args.save_baseline:
+        save_report(args.save_baseline, report)
+    if args.baseline:
+        tolerance = float(bcfg.get("tolerance", 0.25))
+        regressions = compare(report, load_report(args.baseline), tolerance)
+        for r in regressions:
+            print(
+                f"Regression in {r['stage']}: p50 {r['p50_s']:.3f}s vs "
+                f"{r['baseline_p50_s']:.3f}s baseline ({r['ratio']:.2f}x)",
+                file=sys.stderr,
+            )
+        if regressions:
+            sys.exit(1)
+
+
+def cmd_replay(args: argparse.Namespace) -> None:
+    from .replay import capture, sweep
+    from .utils.metrics import format_table
+
+    cfg = load_config(args.config)
+    if args.capture:
+        n = capture(cfg, args.archive)
+        print(f"Archived {n} events to {args.archive}", file=sys.stderr)
+    table = {}
+    for report in sweep(
+        cfg,
+        args.archive,
+        args.speed or [1.0],
+        workdir=args.workdir,
+        interval=args.interval,
+        max_events=args.max_events,
+    ):
+        print(json.dumps(report), flush=True)
+        table[f"{report['speed']:g}x"] = {
+            "events": report["events"],
+            "offered_rate": report["offered_rate"] or 0.0,
+            "throughput": report["throughput"] or 0.0,
+            "p95_s": report["dispatch_latency"]["p95_s"],
+            "max_backlog": report["backlog"]["max"],
+            "sustained": str(report["sustained"]),
+        }
+    cols = ["events", "offered_rate", "throughput", "p95_s", "max_backlog", "sustained"]
+    print(format_table(table, cols), file=sys.stderr)
 
 
 def cmd_predict(args: argparse.Namespace) -> None:
@@ -32,6 +146,118 @@ def cmd_case(args: argparse.Namespace) -> None:
         print(json.dumps(cm.list_cases(limit=args.limit), indent=2))
     elif args.action == "incidents":
         print(json.dumps(cm.list_incidents(limit=args.limit), indent=2))
+    elif args.action == "open":
+        if not args.incident:
+            sys.exit("case open needs --incident")
+        print(json.dumps({"case_id": cm.create_case(args.incident)}, indent=2))
+    elif args.action == "update":
+        if args.id is None or not args.status:
+            sys.exit("case update needs --id and --status")
+        cm.update_case_status(args.id, args.status)
+        print(json.dumps({"case_id": args.id, "status": args.status}, indent=2))
+
+
+def cmd_train_classifier(args: argparse.Namespace) -> None:
+    from .models.training import train_fused_classifier
+
+    cfg = load_config(args.config)
+    if args.min_samples is not None:
+        cfg["training"] = {**cfg.get("training", {}), "min_samples": args.min_samples}
+    try:
+        summary = train_fused_classifier(cfg)
+    except ValueError as e:
+        print(json.dumps({"ok": False, "error": str(e)}, indent=2))
+        sys.exit(1)
+    print(json.dumps({"ok": True, **summary}, indent=2))
+
+
+def cmd_export_nlp(args: argparse.Namespace) -> None:
+    from .nlp.exported import LinearTextScorer, export_linear_model, max_abs_diff
+    from .nlp.nlp_engine import SocialNLP, load_training_data
+
+    cfg = load_config(args.config)
+    models_dir = cfg.get("artifacts", {}).get("models_dir", "artifacts/models")
+    out = args.out or cfg.get("nlp", {}).get("export_dir") or f"{models_dir}/social_nlp_export"
+    nlp = SocialNLP.from_config(cfg)
+    try:
+        path = export_linear_model(nlp.pipeline, out, nlp.version)
+    except ValueError as e:
+        print(json.dumps({"ok": False, "error": str(e)}, indent=2))
+        sys.exit(1)
+    scorer = LinearTextScorer.load(path)
+    texts, _ = load_training_data()
+    report = {
+        "ok": True,
+        "path": str(path),
+        "version": nlp.version,
+        "terms": len(scorer.vocabulary),
+        # Agreement with the pipeline on the training texts
+        "max_abs_diff": max_abs_diff(nlp.pipeline, scorer, texts),
+    }
+    print(json.dumps(report, indent=2))
+
+
+def cmd_nlp_model(args: argparse.Namespace) -> None:
+    from .nlp.nlp_engine import SocialNLP, start_training
+
+    cfg = load_config(args.config)
+    store = SocialNLP.model_store(cfg)
+    if args.action == "retrain":
+        ncfg = cfg.get("nlp", {})
+        start_training(store, bool(ncfg.get("online")), int(ncfg.get("n_features", 2**18))).result()
+    elif args.action == "rollback":
+        try:
+            store.rollback(args.to)
+        except ValueError as e:
+            print(json.dumps({"ok": False, "error": str(e)}, indent=2))
+            sys.exit(1)
+    print(json.dumps({"current": store.current(), "versions": store.versions()}, indent=2))
+
+
+def cmd_score_texts(args: argparse.Namespace) -> None:
+    import csv
+    import time
+    from collections import deque
+    from collections.abc import Iterator
+
+    from .nlp.backfill import model_version, score_texts
+
+    cfg = load_config(args.config)
+    version = model_version(cfg)
+    ids: deque[str] = deque()
+    n = 0
+    t0 = time.perf_counter()
+    with open(args.input, newline="", encoding="utf-8") as fin:
+        reader = csv.DictReader(fin)
+        fields = reader.fieldnames or []
+        missing = [c for c in (args.column, args.id_column) if c and c not in fields]
+        if missing:
+            error = f"{args.input} has no column {missing[0]!r}"
+            print(json.dumps({"ok": False, "error": error}, indent=2))
+            sys.exit(1)
+
+        def texts() -> Iterator[str]:
+            # ids wait here only while their chunk is being scored
+            for i, row in enumerate(reader):
+                ids.append(row[args.id_column] if args.id_column else str(i))
+                yield row[args.column] or ""
+
+        with open(args.out, "w", newline="", encoding="utf-8") as fout:
+            writer = csv.writer(fout)
+            writer.writerow([args.id_column or "row", "threat_score"])
+            for scores in score_texts(cfg, texts(), args.chunk_size, args.workers, version):
+                writer.writerows((ids.popleft(), f"{s:.6f}") for s in scores)
+                n += len(scores)
+    seconds = time.perf_counter() - t0
+    report = {
+        "ok": True,
+        "out": args.out,
+        "texts": n,
+        "version": version,
+        "seconds": round(seconds, 3),
+        "texts_per_s": round(n / seconds, 1) if seconds else None,
+    }
+    print(json.dumps(report, indent=2))
 
 
 def cmd_evidence(args: argparse.Namespace) -> None:
@@ -47,16 +273,113 @@ def build_parser() -> argparse.ArgumentParser:
 
     rp = sub.add_parser("run-pipeline", help="Run end-to-end pipeline")
     rp.add_argument("--sample-data", action="store_true", help="Generate/use sample data inputs")
+    rp.add_argument(
+        "--stream", action="store_true", help="Run stages concurrently over bounded queues"
+    )
+    rp.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Process only input that is new since the last incremental run",
+    )
+    rp.add_argument(
+        "--timings", action="store_true", help="Record stage timings; print a table to stderr"
+    )
     rp.set_defaults(func=cmd_run_pipeline)
 
+    wp = sub.add_parser("watch", help="Watch data directories and process new files")
+    wp.add_argument("--interval", type=float, default=None, help="Seconds between polls")
+    wp.add_argument("--mode", choices=["auto", "poll"], default=None, help="Change detection")
+    wp.add_argument("--once", action="store_true", help="Process pending data and exit")
+    wp.set_defaults(func=cmd_watch)
+
+    sp = sub.add_parser("serve-stream", help="Resident service running micro-batches")
+    sp.add_argument("--interval", type=float, default=None, help="Max seconds between batches")
+    sp.add_argument(
+        "--max-events", type=int, default=None, help="Run a batch once this many are pending"
+    )
+    sp.set_defaults(func=cmd_serve_stream)
+
+    bp = sub.add_parser("bench", help="Benchmark the pipeline on a seeded synthetic workload")
+    bp.add_argument("--workdir", default=None, help="Workspace for generated data and outputs")
+    bp.add_argument("--seed", type=int, default=0)
+    bp.add_argument("--sensors", type=int, default=100, help="Ground sensors")
+    bp.add_argument("--readings", type=int, default=24, help="Readings per sensor")
+    bp.add_argument("--devices", type=int, default=50, help="GPS devices")
+    bp.add_argument("--fixes", type=int, default=50, help="Fixes per device")
+    bp.add_argument("--posts", type=int, default=2000, help="Social posts")
+    bp.add_argument("--tiles", type=int, default=20, help="Satellite/aerial image tiles")
+    bp.add_argument("--tile-size", type=int, default=256, help="Tile edge in pixels")
+    bp.add_argument("--geofences", type=int, default=10)
+    bp.add_argument("--vertices", type=int, default=32, help="Vertices per geofence")
+    bp.add_argument("--repeat", type=int, default=None, help="Timed runs")
+    bp.add_argument("--warmup", type=int, default=None, help="Untimed runs first")
+    bp.add_argument("--stream", action="store_true", help="Benchmark streaming mode")
+    bp.add_argument(
+        "--scoring",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Only time scalar vs vectorized scoring on N synthetic incidents",
+    )
+    bp.add_argument("--save-baseline", default=None, help="Write the report to this path")
+    bp.add_argument(
+        "--baseline", default=None, help="Compare with a saved report; exit 1 on regression"
+    )
+    bp.set_defaults(func=cmd_bench)
+
+    rl = sub.add_parser("replay", help="Replay archived events at N x speed for load testing")
+    rl.add_argument("archive", help="JSON lines file of ingested events")
+    rl.add_argument(
+        "--capture", action="store_true", help="First archive what the sources ingest now"
+    )
+    rl.add_argument(
+        "--speed",
+        type=float,
+        action="append",
+        help="Speed multiplier (default 1); repeat to sweep several speeds",
+    )
+    rl.add_argument("--workdir", default=None, help="Workspace for replay outputs")
+    rl.add_argument("--interval", type=float, default=None, help="Max seconds between batches")
+    rl.add_argument("--max-events", type=int, default=None, help="Batch once this many pending")
+    rl.set_defaults(func=cmd_replay)
+
     pr = sub.add_parser("predict", help="Compute geofence risk map")
     pr.set_defaults(func=cmd_predict)
 
     cm = sub.add_parser("case", help="Case management operations")
-    cm.add_argument("action", choices=["list", "incidents"], help="Action to perform")
+    cm.add_argument(
+        "action", choices=["list", "incidents", "open", "update"], help="Action to perform"
+    )
     cm.add_argument("--limit", type=int, default=20)
+    cm.add_argument("--incident", default=None, help="Incident id (open)")
+    cm.add_argument("--id", type=int, default=None, help="Case id (update)")
+    cm.add_argument("--status", default=None, help="New status, e.g. confirmed (update)")
     cm.set_defaults(func=cmd_case)
 
+    tc = sub.add_parser(
+        "train-classifier", help="Train the fused threat classifier on labeled case outcomes"
+    )
+    tc.add_argument("--min-samples", type=int, default=None, help="Labeled incidents required")
+    tc.set_defaults(func=cmd_train_classifier)
+
+    ex = sub.add_parser("export-nlp", help="Export the text model for scoring without scikit-learn")
+    ex.add_argument("--out", default=None, help="Directory (default nlp.export_dir)")
+    ex.set_defaults(func=cmd_export_nlp)
+
+    nm = sub.add_parser("nlp-model", help="List, retrain or roll back text model versions")
+    nm.add_argument("action", choices=["list", "retrain", "rollback"])
+    nm.add_argument("--to", default=None, help="Version to roll back to (default: previous)")
+    nm.set_defaults(func=cmd_nlp_model)
+
+    st = sub.add_parser("score-texts", help="Score an archive of texts in chunks across processes")
+    st.add_argument("input", help="CSV file with a text column")
+    st.add_argument("--out", required=True, help="CSV of threat scores, in input order")
+    st.add_argument("--column", default="text", help="Text column (default text)")
+    st.add_argument("--id-column", default=None, help="Column copied to the output (default row)")
+    st.add_argument("--chunk-size", type=int, default=None, help="Default backfill.chunk_size")
+    st.add_argument("--workers", type=int, default=None, help="Default backfill.workers")
+    st.set_defaults(func=cmd_score_texts)
+
     ev = sub.add_parser("evidence", help="Verify evidence ledger")
     ev.set_defaults(func=cmd_evidence)
 
@@ -26,11 +26,93 @@ DEFAULT_CONFIG = {
         "headers": {},
     },
     "thresholds": {"severity_notify_min": 0.6, "severity_escalate_min": 0.8},
+    "ingestion": {
+        "chunk_size": 100000,  # rows per CSV chunk
+        "concurrent": True,
+        "io_workers": 4,  # threads for CSV/stream sources
+        "image_workers": 2,  # processes for image sources; 0 = use threads
+        # stop waiting for a source after this; its thread is abandoned, its worker killed
+        "source_timeout_s": 300,
+        # collapse reposts/near-duplicate texts within window_s before NLP and fusion
+        "dedup": {"enabled": True, "window_s": 3600, "threshold": 0.8},
+    },
+    "streaming": {"queue_size": 4},  # batches buffered between stages in --stream runs
+    # per-stage timings in results; appended as JSON lines to log_path when set
+    "metrics": {"enabled": False, "log_path": None},
+    # run-pipeline --incremental: watermarks, open clusters and risk aggregates
+    "incremental": {"state_dir": "artifacts/state"},
+    # content-addressed fuse/classify/score results, LRU-evicted beyond max_mb
+    "cache": {"enabled": False, "dir": "artifacts/cache", "max_mb": 512},
+    # joblib mmap_mode for model arrays (e.g. "r"); warm_up loads models at API startup
+    "models": {"mmap_mode": None, "warm_up": False},
+    # online: hashed n-grams + partial_fit on feedback, snapshotted every snapshot_every
+    # labels (or on the next label once snapshot_interval_s has passed) and on service
+    # shutdown, instead of a full refit per feedback call
+    "nlp": {
+        "online": False,
+        "n_features": 2**18,
+        "snapshot_every": 100,
+        "snapshot_interval_s": 60,
+        "export_dir": None,  # score with the model exported here (export-nlp), no sklearn
+        # train a missing text model in a worker process (texts score 0 until it is
+        # published) instead of in the first request; versions kept for rollback
+        "background_training": False,
+        "keep_versions": 5,
+        # per-text scores memoized by normalized text and model version (0 disables)
+        "cache_entries": 100000,
+        "cache_ttl_s": None,
+    },
+    # two-tier classification: events the text-free heuristic puts below low (even with
+    # a maximal text score) or above high skip text and trained-model scoring
+    "cascade": {"enabled": False, "low": 0.2, "high": 0.8},
+    # `open-encroachment score-texts`: texts per chunk and scoring processes (None: one
+    # per CPU, 0: score in the calling process)
+    "backfill": {"chunk_size": 10000, "workers": None},
+    # threat phrases counted into each event's features (lexicon_hits); with prefilter,
+    # events without hits whose heuristic is below max_prior skip text and trained-model
+    # scoring and keep that heuristic probability
+    "lexicon": {
+        "enabled": False,
+        "path": "data/social/threat_lexicon.txt",
+        "prefilter": False,
+        "max_prior": 0.3,
+    },
+    # `open-encroachment train-classifier`: case statuses that label an incident as a
+    # confirmed threat (1) or a false alarm (0); other statuses are not used
+    "training": {
+        "positive_statuses": ["confirmed"],
+        "negative_statuses": ["false_positive"],
+        "min_samples": 20,
+    },
+    "service": {  # serve-stream: run a micro-batch every interval_s or at max_events
+        "interval_s": 10,
+        "max_events": 1000,
+        "poll_s": 1.0,
+        "persistent_db": True,
+        "index_path": "artifacts/service_index.json",
+    },
+    # `open-encroachment bench`: workspace for generated data, runs per benchmark and
+    # the median slowdown against a baseline that counts as a regression
+    "bench": {"workdir": "artifacts/bench", "repeat": 3, "warmup": 1, "tolerance": 0.25},
+    # `open-encroachment replay`: outputs go to workdir; micro-batches as in `service`
+    "replay": {
+        "workdir": "artifacts/replay",
+        "interval_s": 1.0,
+        "max_events": 1000,
+        "poll_s": 0.05,
+    },
+    "watch": {
+        "interval_s": 5,
+        "mode": "auto",  # auto (inotify via watchfiles when installed) | poll
+        "index_path": "artifacts/watch_index.json",
+    },
     "artifacts": {
         "models_dir": "artifacts/models",
         "predictions_dir": "artifacts/predictions",
         "db_path": "artifacts/case_manager.db",
         "evidence_ledger": "artifacts/evidence_ledger.jsonl",
+        # spill ingested events as memory-mapped .npy when set (one subdirectory per run)
+        "event_store_dir": None,
     },
 }
 
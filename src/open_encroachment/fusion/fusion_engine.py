@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import bisect
+import hashlib
 from collections.abc import Sequence
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, cast
 
+import numpy as np
+
+from open_encroachment.models.event_batch import EventBatch
 from open_encroachment.utils.geo import any_geofence_contains, haversine_distance_m
-from open_encroachment.utils.io import gen_id
+
+# Default clustering radius and time window
+MAX_DISTANCE_M = 500.0
+MAX_TIME_DELTA_S = 600
 
 
 def _as_dict(obj: Any) -> dict[str, Any]:
@@ -28,74 +36,113 @@ def _parse_ts(s: str) -> datetime:
         return datetime.now(timezone.utc)
 
 
-def fuse_events(
-    events: Sequence[Any],
-    config: dict[str, Any],
-    max_distance_m: float = 500.0,
-    max_time_delta_s: int = 600,
-) -> list[dict[str, Any]]:
-    """Fuse events based on spatio-temporal proximity and enrich with geofence membership."""
-    # Separate locatable and non-locatable
-    loc: list[tuple[int, dict[str, Any]]] = []
-    nloc: list[tuple[int, dict[str, Any]]] = []
-    for i, e in enumerate(events):
-        d = _as_dict(e)
-        if d.get("lat") is not None and d.get("lon") is not None:
-            loc.append((i, d))
-        else:
-            nloc.append((i, d))
+class _Cluster:
+    """Running centroid and sorted member times, so placement never rescans members."""
+
+    __slots__ = ("members", "n_loc", "sum_lat", "sum_lon", "times")
+
+    def __init__(self) -> None:
+        self.members: list[int] = []
+        self.n_loc = 0
+        self.sum_lat = 0.0
+        self.sum_lon = 0.0
+        self.times: list[float] = []
+
+    def add(self, i: int, lat: float | None, lon: float | None, t: float) -> None:
+        self.members.append(i)
+        if lat is not None and lon is not None:
+            self.n_loc += 1
+            self.sum_lat += lat
+            self.sum_lon += lon
+        bisect.insort(self.times, t)
 
-    # Sort locatable by time
-    loc.sort(key=lambda t: _parse_ts(t[1].get("timestamp", "")))
+    def median_time(self) -> float:
+        return self.times[len(self.times) // 2]
 
-    clusters: list[list[dict[str, Any]]] = []
-    for _, e in loc:
-        placed = False
-        et = _parse_ts(e.get("timestamp", ""))
+
+def _cluster(
+    lats: Sequence[float | None],
+    lons: Sequence[float | None],
+    times: Sequence[float],
+    max_distance_m: float,
+    max_time_delta_s: float,
+) -> list[list[int]]:
+    """Group event indices by spatio-temporal proximity.
+
+    Locatable events are visited in time order and join the first cluster whose centroid
+    and median time are within range; non-locatable events then attach to the cluster
+    with the nearest median time, if close enough.
+    """
+    loc = [i for i in range(len(times)) if lats[i] is not None and lons[i] is not None]
+    nloc = [i for i in range(len(times)) if lats[i] is None or lons[i] is None]
+    loc.sort(key=times.__getitem__)
+
+    clusters: list[_Cluster] = []
+    for i in loc:
+        lat, lon, t = cast(float, lats[i]), cast(float, lons[i]), times[i]
         for cl in clusters:
-            # Compare with cluster centroid (time/space)
-            # Compute centroid lat/lon and median time
-            cl_lats = [x["lat"] for x in cl if x.get("lat") is not None]
-            cl_lons = [x["lon"] for x in cl if x.get("lon") is not None]
-            if not cl_lats or not cl_lons:
+            if not cl.n_loc:
                 continue
-            cl_lat = sum(cl_lats) / len(cl_lats)
-            cl_lon = sum(cl_lons) / len(cl_lons)
-            d = haversine_distance_m(e["lat"], e["lon"], cl_lat, cl_lon)
-            times = sorted(_parse_ts(x.get("timestamp", "")) for x in cl)
-            dt = abs((et - times[len(times) // 2]).total_seconds())
+            d = haversine_distance_m(lat, lon, cl.sum_lat / cl.n_loc, cl.sum_lon / cl.n_loc)
+            dt = abs(t - cl.median_time())
             if d <= max_distance_m and dt <= max_time_delta_s:
-                cl.append(e)
-                placed = True
+                cl.add(i, lat, lon, t)
                 break
-        if not placed:
-            clusters.append([e])
+        else:
+            cl = _Cluster()
+            cl.add(i, lat, lon, t)
+            clusters.append(cl)
 
-    # Attach non-locatable to nearest cluster by time (if close)
-    for _, e in nloc:
-        et = _parse_ts(e.get("timestamp", ""))
-        best_idx: int | None = None
+    for i in nloc:
+        t = times[i]
+        best: _Cluster | None = None
         best_dt = float("inf")
-        for i, cl in enumerate(clusters):
-            times = sorted(_parse_ts(x.get("timestamp", "")) for x in cl)
-            dt = abs((et - times[len(times) // 2]).total_seconds())
+        for cl in clusters:
+            dt = abs(t - cl.median_time())
             if dt < best_dt:
                 best_dt = dt
-                best_idx = i
-        if best_idx is not None and best_dt <= max_time_delta_s:
-            clusters[best_idx].append(e)
-        else:
-            clusters.append([e])
+                best = cl
+        if best is None or best_dt > max_time_delta_s:
+            best = _Cluster()
+            clusters.append(best)
+        best.add(i, None, None, t)
+    return [cl.members for cl in clusters]
+
+
+def fuse_events(
+    events: Sequence[Any] | EventBatch,
+    config: dict[str, Any],
+    max_distance_m: float = MAX_DISTANCE_M,
+    max_time_delta_s: int = MAX_TIME_DELTA_S,
+) -> list[dict[str, Any]]:
+    """Fuse events based on spatio-temporal proximity and enrich with geofence membership.
+
+    ``events`` may be Pydantic ``Event`` models, plain dicts or a columnar ``EventBatch``;
+    a batch is clustered straight from its arrays without building per-event dicts.
+
+    Fused ids derive from the id of the event that founded the cluster, so re-fusing a
+    cluster that gained members keeps its id.
+    """
+    if isinstance(events, EventBatch):
+        return _fuse_batch(events, config, max_distance_m, max_time_delta_s)
+
+    ds = [_as_dict(e) for e in events]
+    lats = [d.get("lat") if d.get("lon") is not None else None for d in ds]
+    lons = [d.get("lon") if d.get("lat") is not None else None for d in ds]
+    parsed = [_parse_ts(d.get("timestamp", "")) for d in ds]
+    times = [p.timestamp() for p in parsed]
+    clusters = _cluster(lats, lons, times, max_distance_m, max_time_delta_s)
 
     # Build fused events
     fused: list[dict[str, Any]] = []
     geofences = config.get("geofences", [])
-    for cl in clusters:
+    for members in clusters:
+        cl = [ds[i] for i in members]
         # Aggregate features by source, compute centroid lat/lon whenever possible
-        lats = [x["lat"] for x in cl if x.get("lat") is not None]
-        lons = [x["lon"] for x in cl if x.get("lon") is not None]
-        lat = sum(lats) / len(lats) if lats else None
-        lon = sum(lons) / len(lons) if lons else None
+        cl_lats = [x["lat"] for x in cl if x.get("lat") is not None]
+        cl_lons = [x["lon"] for x in cl if x.get("lon") is not None]
+        lat = sum(cl_lats) / len(cl_lats) if cl_lats else None
+        lon = sum(cl_lons) / len(cl_lons) if cl_lons else None
         feats: dict[str, Any] = {}
         texts: list[str] = []
         for e in cl:
@@ -105,21 +152,92 @@ def fuse_events(
                 else:
                     # Simple namespacing by source
                     feats[f"{e['source']}_{k}"] = v
-        inside, gf_id = (False, None)
-        if lat is not None and lon is not None:
-            inside, gf_id = any_geofence_contains(lat, lon, geofences)
+        first = min(members, key=times.__getitem__)
+        fused.append(
+            _fused_record(
+                geofences=geofences,
+                timestamp=parsed[first].isoformat(),
+                lat=lat,
+                lon=lon,
+                feats=feats,
+                texts=texts,
+                sources=[e["source"] for e in cl],
+                raw_event_ids=[e["id"] for e in cl],
+            )
+        )
+    return fused
+
+
+def _fuse_batch(
+    batch: EventBatch,
+    config: dict[str, Any],
+    max_distance_m: float,
+    max_time_delta_s: float,
+) -> list[dict[str, Any]]:
+    located = (~(np.isnan(batch.lat) | np.isnan(batch.lon))).tolist()
+    lats = [la if ok else None for la, ok in zip(batch.lat.tolist(), located, strict=True)]
+    lons = [lo if ok else None for lo, ok in zip(batch.lon.tolist(), located, strict=True)]
+    times = batch.timestamps.tolist()
+    clusters = _cluster(lats, lons, times, max_distance_m, max_time_delta_s)
+
+    fused: list[dict[str, Any]] = []
+    geofences = config.get("geofences", [])
+    for members in clusters:
+        cl_lats = [cast(float, lats[i]) for i in members if located[i]]
+        cl_lons = [cast(float, lons[i]) for i in members if located[i]]
+        lat = sum(cl_lats) / len(cl_lats) if cl_lats else None
+        lon = sum(cl_lons) / len(cl_lons) if cl_lons else None
+        sources = [batch.sources[c] for c in batch.source_codes[members].tolist()]
+        feats: dict[str, Any] = {}
+        rows, cols = np.nonzero(~np.isnan(batch.features[members]))
+        values = batch.features[members][rows, cols].tolist()
+        for r, c, v in zip(rows.tolist(), cols.tolist(), values, strict=True):
+            feats[f"{sources[r]}_{batch.feature_names[c]}"] = v
+        texts = [batch.texts[t] for t in batch.text_index[members].tolist() if t >= 0]
+        first = min(members, key=times.__getitem__)
         fused.append(
-            {
-                "id": gen_id("fused"),
-                "timestamp": sorted(_parse_ts(x.get("timestamp", "")) for x in cl)[0].isoformat(),
-                "lat": lat,
-                "lon": lon,
-                "in_geofence": inside,
-                "geofence_id": gf_id,
-                "features": feats,
-                "texts": texts,
-                "sources": [e["source"] for e in cl],
-                "raw_event_ids": [e["id"] for e in cl],
-            }
+            _fused_record(
+                geofences=geofences,
+                timestamp=datetime.fromtimestamp(times[first], timezone.utc).isoformat(),
+                lat=lat,
+                lon=lon,
+                feats=feats,
+                texts=texts,
+                sources=sources,
+                raw_event_ids=[x.decode("utf-8") for x in batch.ids[members].tolist()],
+            )
         )
     return fused
+
+
+def fused_id(founder_event_id: str) -> str:
+    """Stable fused/incident id for the cluster founded by ``founder_event_id``."""
+    digest = hashlib.blake2b(founder_event_id.encode("utf-8"), digest_size=16).hexdigest()
+    return f"fused_{digest}"
+
+
+def _fused_record(
+    geofences: list[dict[str, Any]],
+    timestamp: str,
+    lat: float | None,
+    lon: float | None,
+    feats: dict[str, Any],
+    texts: list[str],
+    sources: list[str],
+    raw_event_ids: list[str],
+) -> dict[str, Any]:
+    inside, gf_id = (False, None)
+    if lat is not None and lon is not None:
+        inside, gf_id = any_geofence_contains(lat, lon, geofences)
+    return {
+        "id": fused_id(raw_event_ids[0]),
+        "timestamp": timestamp,
+        "lat": lat,
+        "lon": lon,
+        "in_geofence": inside,
+        "geofence_id": gf_id,
+        "features": feats,
+        "texts": texts,
+        "sources": sources,
+        "raw_event_ids": raw_event_ids,
+    }
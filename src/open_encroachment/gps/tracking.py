@@ -1,32 +1,50 @@
 from __future__ import annotations
 
-import csv
 import pathlib
+from collections.abc import Iterator
 from typing import Any
 
-from open_encroachment.utils.io import gen_id
+from open_encroachment.utils.io import gen_ids, iter_csv_chunks
 
 
-def ingest_tracks(path: str = "data/gps/gps_events.csv") -> list[dict[str, Any]]:
-    events: list[dict[str, Any]] = []
+def iter_tracks(
+    path: str = "data/gps/gps_events.csv",
+    chunk_size: int = 100_000,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield GPS fix events in batches; rows without a parseable lat/lon are dropped.
+
+    ``start``/``end`` restrict reading to a byte range of rows (see ``iter_csv_chunks``).
+    """
     p = pathlib.Path(path)
     if not p.exists():
-        return events
-    with p.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            try:
-                events.append(
-                    {
-                        "id": gen_id("gps"),
-                        "source": "gps",
-                        "timestamp": r.get("timestamp"),
-                        "lat": float(r.get("lat")),
-                        "lon": float(r.get("lon")),
-                        "features": {},
-                        "artifacts": {"raw": r},
-                    }
-                )
-            except Exception:
-                continue
+        return
+    for chunk in iter_csv_chunks(p, ["lat", "lon"], chunk_size, start=start, end=end):
+        chunk = chunk[chunk["lat"].notna() & chunk["lon"].notna()]
+        if chunk.empty:
+            continue
+        raw_rows = chunk.to_dict("records")
+        ts = chunk["timestamp"].tolist() if "timestamp" in chunk.columns else [None] * len(chunk)
+        lats = chunk["lat"].tolist()
+        lons = chunk["lon"].tolist()
+        ids = gen_ids("gps", len(chunk))
+        yield [
+            {
+                "id": ids[i],
+                "source": "gps",
+                "timestamp": ts[i],
+                "lat": lats[i],
+                "lon": lons[i],
+                "features": {},
+                "artifacts": {"raw": raw_rows[i]},
+            }
+            for i in range(len(chunk))
+        ]
+
+
+def ingest_tracks(path: str = "data/gps/gps_events.csv") -> list[dict[str, Any]]:
+    events: list[dict[str, Any]] = []
+    for batch in iter_tracks(path):
+        events.extend(batch)
     return events
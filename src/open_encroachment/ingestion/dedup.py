@@ -0,0 +1,166 @@
+"""Near-duplicate suppression for social posts.
+
+Retweets and syndicated stories arrive as floods of (nearly) identical texts. Before they
+reach NLP scoring and fusion, posts are grouped by exact normalized-text hash and by
+MinHash/LSH similarity within a sliding time window; each group is reduced to its first
+post, which carries a ``repost_count`` feature with the number of suppressed copies.
+
+Groups are also told apart by location: the same alert posted near two sites is two
+reports, so a post only joins a group whose first post lies within the fusion radius of
+it (posts without coordinates group among themselves). Each hash key therefore holds
+every live group with that text or band, and the distance decides among them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import zlib
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from open_encroachment.fusion.fusion_engine import MAX_DISTANCE_M
+from open_encroachment.utils.geo import haversine_distance_m
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_URL = re.compile(r"https?://\S+|www\.\S+")
+_RT = re.compile(r"^\s*rt\s+@\w+:?\s*")
+_MENTION = re.compile(r"@\w+")
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop URLs, retweet prefixes, mentions and punctuation; collapse spaces."""
+    t = _RT.sub("", text.lower())
+    t = _URL.sub(" ", t)
+    t = _MENTION.sub(" ", t)
+    t = _NON_WORD.sub(" ", t)
+    return _SPACE.sub(" ", t).strip()
+
+
+def _parse_ts(s: str) -> float:
+    try:
+        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except Exception:
+        dt = datetime.now(timezone.utc)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _location(e: dict[str, Any]) -> tuple[float, float] | None:
+    try:
+        return float(e["lat"]), float(e["lon"])
+    except (KeyError, TypeError, ValueError):
+        return None  # not validated yet: bad coordinates are dropped later
+
+
+class MinHasher:
+    """MinHash signatures over character shingles using universal hashing mod a prime."""
+
+    def __init__(self, num_perm: int = 64, shingle: int = 5, seed: int = 7) -> None:
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2**32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+        self.shingle = shingle
+
+    def signature(self, text: str) -> np.ndarray:
+        k = self.shingle
+        grams = {text[i : i + k] for i in range(max(1, len(text) - k + 1))}
+        h = np.fromiter(
+            (zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams)
+        )
+        # a, h < 2**32 so a*h + b stays below 2**64
+        return np.asarray(((self.a[:, None] * h[None, :] + self.b[:, None]) % _PRIME).min(axis=1))
+
+
+def suppress_duplicates(
+    events: list[dict[str, Any]],
+    window_s: float = 3600.0,
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    bands: int = 16,
+    max_distance_m: float = MAX_DISTANCE_M,
+) -> list[dict[str, Any]]:
+    """Collapse duplicate text events; events without text pass through untouched.
+
+    Posts are visited in time order. A post joins an earlier group when its normalized
+    text hashes identically, or when it shares an LSH band with the group's representative
+    and their estimated Jaccard similarity is at least ``threshold`` -- in both cases only
+    if the group was last seen within ``window_s`` seconds and its first post is within
+    ``max_distance_m``. Output keeps input order.
+    """
+    norms = {
+        i: normalize_text(text)
+        for i, e in enumerate(events)
+        if isinstance(text := e.get("features", {}).get("text"), str)
+    }
+    text_idx = [i for i, norm in norms.items() if norm]
+    if len(text_idx) < 2:
+        return events
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm=bands * rows)
+    times = {i: _parse_ts(events[i].get("timestamp") or "") for i in text_idx}
+    locs = {i: _location(events[i]) for i in text_idx}
+
+    def nearby(rep: int, i: int) -> bool:
+        a, b = locs[rep], locs[i]
+        if a is None or b is None:
+            return a is None and b is None
+        return haversine_distance_m(a[0], a[1], b[0], b[1]) <= max_distance_m
+
+    # group state: representative index -> [last_seen, copies, signature]
+    groups: dict[int, list[Any]] = {}
+    exact: dict[bytes, list[int]] = {}
+    buckets: dict[tuple[int, bytes], list[int]] = {}
+    suppressed: set[int] = set()
+
+    def candidates(reps: list[int], t: float, i: int) -> list[int]:
+        # Posts come in time order, so a group that left the window never comes back
+        reps[:] = [r for r in reps if t - groups[r][0] <= window_s]
+        return [r for r in reps if nearby(r, i)]
+
+    for i in sorted(text_idx, key=times.__getitem__):
+        t = times[i]
+        norm = norms[i]
+        key = hashlib.blake2b(norm.encode("utf-8"), digest_size=16).digest()
+        same = exact.setdefault(key, [])
+        near = candidates(same, t, i)
+        rep = near[0] if near else None
+        sig: np.ndarray | None = None
+        band_keys: list[tuple[int, bytes]] = []
+        if rep is None:
+            sig = hasher.signature(norm)
+            band_keys = [(b, sig[b * rows : (b + 1) * rows].tobytes()) for b in range(bands)]
+            for bk in band_keys:
+                reps = buckets.get(bk)
+                for cand in candidates(reps, t, i) if reps else ():
+                    if float(np.mean(groups[cand][2] == sig)) >= threshold:
+                        rep = cand
+                        break
+                if rep is not None:
+                    break
+        if rep is None:
+            assert sig is not None
+            groups[i] = [t, 0, sig]
+            same.append(i)
+            for bk in band_keys:
+                buckets.setdefault(bk, []).append(i)
+            continue
+        groups[rep][0] = t
+        groups[rep][1] += 1
+        if rep not in same:
+            same.append(rep)
+        suppressed.add(i)
+
+    out: list[dict[str, Any]] = []
+    for i, e in enumerate(events):
+        if i in suppressed:
+            continue
+        if i in groups:
+            e = {**e, "features": {**e["features"], "repost_count": groups[i][1]}}
+        out.append(e)
+    return out
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import itertools
+import os
 import pathlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
 from typing import Any
 
 import numpy as np
 from PIL import Image, ImageFilter
 
-from open_encroachment.utils.io import gen_id, now_iso
+from open_encroachment.utils.io import gen_id
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".ppm")
 
 
 def _image_features(img: Image.Image) -> dict[str, float]:
@@ -26,23 +31,22 @@ def _image_features(img: Image.Image) -> dict[str, float]:
     }
 
 
-def ingest(config: dict[str, Any], data_dir: str = "data/satellite") -> list[dict[str, Any]]:
+def ingest_paths(config: dict[str, Any], paths: Iterable[pathlib.Path]) -> list[dict[str, Any]]:
+    """Extract features from the given image files; unreadable files are skipped."""
     events: list[dict[str, Any]] = []
-    p = pathlib.Path(data_dir)
-    if not p.exists():
-        return events
-    for path in itertools.chain(
-        p.glob("*.jpg"), p.glob("*.jpeg"), p.glob("*.png"), p.glob("*.ppm")
-    ):
+    for path in paths:
         try:
             with Image.open(path) as img:
                 feats = _image_features(img)
+            # Without capture metadata the file's modification time is the best
+            # observation time (and keeps re-ingested images identical)
+            taken = datetime.fromtimestamp(os.stat(path).st_mtime, timezone.utc).isoformat()
         except Exception:
             continue
         evt = {
             "id": gen_id("sat"),
             "source": "satellite",
-            "timestamp": now_iso(),
+            "timestamp": taken,
             # In real setup, lat/lon would come from metadata; not available in sample files
             "lat": None,
             "lon": None,
@@ -51,3 +55,29 @@ def ingest(config: dict[str, Any], data_dir: str = "data/satellite") -> list[dic
         }
         events.append(evt)
     return events
+
+
+def has_images(config: dict[str, Any], data_dir: str = "data/satellite") -> bool:
+    p = pathlib.Path(data_dir)
+    return p.is_dir() and any(next(p.glob(f"*{s}"), None) for s in IMAGE_SUFFIXES)
+
+
+def ingest(config: dict[str, Any], data_dir: str = "data/satellite") -> list[dict[str, Any]]:
+    p = pathlib.Path(data_dir)
+    if not p.exists():
+        return []
+    return ingest_paths(config, itertools.chain(*(p.glob(f"*{s}") for s in IMAGE_SUFFIXES)))
+
+
+def iter_events(
+    config: dict[str, Any], data_dir: str = "data/satellite", batch_size: int = 32
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield image events in batches of at most ``batch_size`` files."""
+    p = pathlib.Path(data_dir)
+    if not p.exists():
+        return
+    paths = itertools.chain(*(p.glob(f"*{s}") for s in IMAGE_SUFFIXES))
+    while chunk := list(itertools.islice(paths, batch_size)):
+        events = ingest_paths(config, chunk)
+        if events:
+            yield events
@@ -0,0 +1,181 @@
+"""Concurrent multi-source ingestion.
+
+Sources are independent, so they are scheduled together: CSV/stream sources on daemon
+threads (mostly I/O and pandas parsing, which releases the GIL) and image sources on a
+process pool (pure CPU feature extraction). Results are merged in registry order, so the
+output does not depend on which source finishes first.
+
+A source that overruns ``source_timeout_s`` is abandoned, not waited for: its thread is a
+daemon, so it never holds up interpreter exit, and the image worker processes are
+terminated once the results are in. The process pool is only started when an image
+source has files to read.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import multiprocessing.pool
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any
+
+from open_encroachment.gps.tracking import ingest_tracks, iter_tracks
+from open_encroachment.ingestion import aerial, ground_sensors, satellite, social_media
+from open_encroachment.utils.metrics import StageTimer, TimedCall, timed_call
+
+IngestFn = Callable[[dict[str, Any]], list[dict[str, Any]]]
+BatchFn = Callable[[dict[str, Any]], Iterator[list[dict[str, Any]]]]
+
+
+@dataclass(frozen=True)
+class Source:
+    """An ingestion source; ``kind`` is ``"io"`` (thread pool) or ``"image"`` (process pool).
+
+    ``batches`` optionally yields the same events in bounded batches for streaming runs;
+    without it the whole ``func`` result is one batch. ``has_input`` is a cheap check
+    for anything to read; when it returns false the source is not scheduled at all.
+    """
+
+    name: str
+    func: IngestFn
+    kind: str = "io"
+    batches: BatchFn | None = None
+    has_input: Callable[[dict[str, Any]], bool] | None = None
+
+    def iter_batches(self, config: dict[str, Any]) -> Iterator[list[dict[str, Any]]]:
+        if self.batches is not None:
+            yield from self.batches(config)
+        else:
+            yield self.func(config)
+
+
+def _gps(config: dict[str, Any]) -> list[dict[str, Any]]:
+    return ingest_tracks()
+
+
+def _gps_batches(config: dict[str, Any]) -> Iterator[list[dict[str, Any]]]:
+    return iter_tracks(chunk_size=int(config.get("ingestion", {}).get("chunk_size", 100_000)))
+
+
+SOURCES: list[Source] = [
+    Source("satellite", satellite.ingest, "image", satellite.iter_events, satellite.has_images),
+    Source("aerial", aerial.ingest, "image", aerial.iter_events, aerial.has_images),
+    Source("ground_sensors", ground_sensors.ingest, batches=ground_sensors.iter_events),
+    Source("social_media", social_media.ingest, batches=social_media.iter_events),
+    Source("gps", _gps, batches=_gps_batches),
+]
+
+
+def register_source(source: Source) -> None:
+    """Add a source to the default registry, replacing any source with the same name."""
+    SOURCES[:] = [s for s in SOURCES if s.name != source.name]
+    SOURCES.append(source)
+
+
+def _start_daemon(slots: threading.Semaphore, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+    """Run ``fn(*args)`` on a daemon thread once one of ``slots`` is free."""
+    fut: Future[Any] = Future()
+
+    def run() -> None:
+        with slots:
+            if not fut.set_running_or_notify_cancel():
+                return
+            try:
+                fut.set_result(fn(*args))
+            except BaseException as err:
+                fut.set_exception(err)
+
+    threading.Thread(target=run, name="ingest", daemon=True).start()
+    return fut
+
+
+def ingest_all(
+    config: dict[str, Any],
+    sources: Sequence[Source] | None = None,
+    timer: StageTimer | None = None,
+) -> list[dict[str, Any]]:
+    """Run all sources concurrently and return their events merged in registry order.
+
+    Config (``ingestion`` section):
+    - ``concurrent``: set false to run sources one after another (default true)
+    - ``io_workers``: how many I/O sources run at once (default 4)
+    - ``image_workers``: process pool size; 0 runs image sources on threads
+    - ``source_timeout_s``: how long to wait for each source, measured from scheduling
+      (default 300). A source that fails or times out contributes no events; a timed-out
+      thread is left to finish in the background and a timed-out image worker is killed.
+
+    With an enabled ``timer`` each source is recorded as stage ``source:<name>``.
+    """
+    sources = list(SOURCES if sources is None else sources)
+    ing = config.get("ingestion", {})
+    timed = timer is not None and timer.enabled
+    if not ing.get("concurrent", True):
+        events: list[dict[str, Any]] = []
+        for src in sources:
+            events += _run_inline(src, config, timer)
+        return events
+
+    timeout = float(ing.get("source_timeout_s", 300))
+    io_slots = threading.BoundedSemaphore(max(1, int(ing.get("io_workers", 4))))
+    image_workers = int(ing.get("image_workers", 2))
+    image_pool: multiprocessing.pool.Pool | None = None
+    try:
+        start = time.monotonic()
+        pending: list[tuple[Source, Callable[[float], Any]]] = []
+        for src in sources:
+            if src.has_input is not None and not src.has_input(config):
+                continue
+            fn: Callable[..., Any] = timed_call if timed else src.func
+            args = (src.func, config) if timed else (config,)
+            if src.kind == "image" and image_workers > 0:
+                if image_pool is None:
+                    image_pool = multiprocessing.Pool(image_workers)
+                pending.append((src, image_pool.apply_async(fn, args).get))
+            else:
+                pending.append((src, _start_daemon(io_slots, fn, *args).result))
+        events = []
+        for src, result in pending:
+            remaining = max(0.0, start + timeout - time.monotonic())
+            try:
+                res = result(remaining)
+                out: list[dict[str, Any]] = res
+                if timed:
+                    assert timer is not None
+                    call: TimedCall = res
+                    out = call.result
+                    timer.add(
+                        f"source:{src.name}",
+                        call.wall_s,
+                        call.cpu_s,
+                        len(out),
+                        call.rss_peak_delta_kb,
+                    )
+                events += out
+            except (FutureTimeoutError, multiprocessing.TimeoutError):
+                print(f"Ingestion source {src.name} timed out after {timeout:.0f}s")
+            except Exception as err:
+                print(f"Ingestion source {src.name} failed: {err}")
+        return events
+    finally:
+        if image_pool is not None:
+            # Every result is in or abandoned; this also kills workers stuck on a source
+            image_pool.terminate()
+
+
+def _run_inline(
+    src: Source, config: dict[str, Any], timer: StageTimer | None = None
+) -> list[dict[str, Any]]:
+    try:
+        if timer is None:
+            return src.func(config)
+        with timer.stage(f"source:{src.name}") as span:
+            events = src.func(config)
+            span.items = len(events)
+        return events
+    except Exception as err:
+        print(f"Ingestion source {src.name} failed: {err}")
+        return []
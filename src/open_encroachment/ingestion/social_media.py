@@ -1,10 +1,60 @@
 from __future__ import annotations
 
-import csv
 import pathlib
+from collections.abc import Iterator
 from typing import Any
 
-from open_encroachment.utils.io import gen_id, now_iso
+from open_encroachment.utils.io import gen_ids, iter_csv_chunks, now_iso
+
+
+def iter_events(
+    config: dict[str, Any],
+    path: str = "data/social/sample_social.csv",
+    chunk_size: int | None = None,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield social post events in batches of at most ``chunk_size`` rows.
+
+    lat/lon are only kept when both parse as numbers; otherwise both are None.
+    ``start``/``end`` restrict reading to a byte range of rows (see ``iter_csv_chunks``).
+    """
+    p = pathlib.Path(path)
+    if not p.exists():
+        return
+    if chunk_size is None:
+        chunk_size = int(config.get("ingestion", {}).get("chunk_size", 100_000))
+    for chunk in iter_csv_chunks(p, ["lat", "lon"], chunk_size, start=start, end=end):
+        if chunk.empty:
+            continue
+        n = len(chunk)
+        located = chunk["lat"].notna() & chunk["lon"].notna()
+        lats = chunk["lat"].astype(object).where(located, None).tolist()
+        lons = chunk["lon"].astype(object).where(located, None).tolist()
+        texts = chunk["text"].str.strip().tolist() if "text" in chunk.columns else [""] * n
+        sources = (
+            chunk["source"].replace("", "social").tolist()
+            if "source" in chunk.columns
+            else ["social"] * n
+        )
+        if "timestamp" in chunk.columns:
+            ts = chunk["timestamp"].replace("", now_iso()).tolist()
+        else:
+            ts = [now_iso()] * n
+        raw_rows = chunk.drop(columns=["lat", "lon"]).to_dict("records")
+        ids = gen_ids("soc", len(chunk))
+        yield [
+            {
+                "id": ids[i],
+                "source": sources[i],
+                "timestamp": ts[i],
+                "lat": lats[i],
+                "lon": lons[i],
+                "features": {"text": texts[i]},
+                "artifacts": {"raw": {**raw_rows[i], "lat": lats[i], "lon": lons[i]}},
+            }
+            for i in range(n)
+        ]
 
 
 def ingest(
@@ -15,30 +65,6 @@ def ingest(
     Falls back to None for lat/lon if missing.
     """
     events: list[dict[str, Any]] = []
-    p = pathlib.Path(path)
-    if not p.exists():
-        return events
-    with p.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            text = (r.get("text") or "").strip()
-            lat: float | None = None
-            lon: float | None = None
-            try:
-                if r.get("lat") not in (None, ""):
-                    lat = float(r["lat"])  # may raise
-                if r.get("lon") not in (None, ""):
-                    lon = float(r["lon"])  # may raise
-            except Exception:
-                lat, lon = None, None
-            evt = {
-                "id": gen_id("soc"),
-                "source": r.get("source") or "social",
-                "timestamp": r.get("timestamp") or now_iso(),
-                "lat": lat,
-                "lon": lon,
-                "features": {"text": text},
-                "artifacts": {"raw": r},
-            }
-            events.append(evt)
+    for batch in iter_events(config, path):
+        events.extend(batch)
     return events
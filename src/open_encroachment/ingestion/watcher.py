@@ -0,0 +1,242 @@
+"""Directory watcher that feeds newly arrived data to ingestion as micro-batches.
+
+The watcher keeps an index of every file it has consumed (inode, size, mtime and, for
+CSV files, the byte offset of the last complete row). Each poll only ``stat``s the
+watched paths; new or changed images and rows appended to CSV files are handed to the
+regular ingestion functions. The index is persisted so a restarted daemon resumes where
+it stopped instead of re-ingesting everything.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from open_encroachment.gps.tracking import iter_tracks
+from open_encroachment.ingestion import aerial, ground_sensors, satellite, social_media
+from open_encroachment.utils.io import write_json
+
+
+@dataclass(frozen=True)
+class WatchTarget:
+    """A watched path: an image directory (``kind="images"``) or a CSV file (``"csv"``)."""
+
+    source: str
+    path: str
+    kind: str
+
+
+DEFAULT_TARGETS = [
+    WatchTarget("satellite", "data/satellite", "images"),
+    WatchTarget("aerial", "data/aerial", "images"),
+    WatchTarget("ground_sensors", "data/ground/ground_sensors.csv", "csv"),
+    WatchTarget("social_media", "data/social/sample_social.csv", "csv"),
+    WatchTarget("gps", "data/gps/gps_events.csv", "csv"),
+]
+
+_IMAGE_INGEST = {"satellite": satellite, "aerial": aerial}
+
+
+@dataclass
+class FileState:
+    inode: int
+    size: int
+    mtime_ns: int
+    offset: int = 0  # CSV only: end of the last complete row consumed
+
+
+class FileIndex:
+    """Seen-file index, optionally persisted as JSON."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self.files: dict[str, FileState] = {}
+        self.stats: dict[str, dict[str, Any]] = {}  # ground sensor running stats per file
+        if path and pathlib.Path(path).exists():
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.files = {k: FileState(**v) for k, v in data.get("files", {}).items()}
+            self.stats = data.get("stats", {})
+
+    def save(self) -> None:
+        if self.path:
+            write_json(
+                self.path,
+                {"files": {k: asdict(v) for k, v in self.files.items()}, "stats": self.stats},
+            )
+
+
+def targets_from_config(config: dict[str, Any]) -> list[WatchTarget]:
+    raw = config.get("watch", {}).get("targets")
+    if not raw:
+        return list(DEFAULT_TARGETS)
+    return [WatchTarget(t["source"], t["path"], t.get("kind", "csv")) for t in raw]
+
+
+def _complete_end(path: str, start: int, size: int) -> int:
+    """Offset just past the last newline in ``[start, size)``; ``start`` if there is none."""
+    with open(path, "rb") as f:
+        pos = size
+        while pos > start:
+            step = min(65536, pos - start)
+            f.seek(pos - step)
+            nl = f.read(step).rfind(b"\n")
+            if nl >= 0:
+                return pos - step + nl + 1
+            pos -= step
+    return start
+
+
+class DirectoryWatcher:
+    def __init__(
+        self,
+        config: dict[str, Any],
+        targets: Sequence[WatchTarget] | None = None,
+        index_path: str | None = None,
+    ) -> None:
+        self.config = config
+        self.targets = list(targets) if targets is not None else targets_from_config(config)
+        self.index = FileIndex(index_path)
+
+    def poll(self, save: bool = True) -> list[dict[str, Any]]:
+        """Return events for everything that arrived since the previous poll.
+
+        With ``save=False`` the advanced index is only kept in memory until the caller
+        has durably handled the events and calls ``index.save()`` itself.
+        """
+        events: list[dict[str, Any]] = []
+        for target in self.targets:
+            if target.kind == "images":
+                events += self._poll_images(target)
+            else:
+                events += self._poll_csv(target)
+        if save:
+            self.index.save()
+        return events
+
+    def _poll_images(self, target: WatchTarget) -> list[dict[str, Any]]:
+        if not os.path.isdir(target.path):
+            return []
+        module = _IMAGE_INGEST[target.source]
+        fresh: list[pathlib.Path] = []
+        with os.scandir(target.path) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                if not entry.is_file() or not entry.name.lower().endswith(module.IMAGE_SUFFIXES):
+                    continue
+                st = entry.stat()
+                state = FileState(st.st_ino, st.st_size, st.st_mtime_ns)
+                if self.index.files.get(entry.path) == state:
+                    continue
+                self.index.files[entry.path] = state
+                fresh.append(pathlib.Path(entry.path))
+        return module.ingest_paths(self.config, fresh) if fresh else []
+
+    def _poll_csv(self, target: WatchTarget) -> list[dict[str, Any]]:
+        path = target.path
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return []
+        prev = self.index.files.get(path)
+        if (
+            prev is not None
+            and prev.inode == st.st_ino
+            and prev.size == st.st_size
+            and prev.mtime_ns == st.st_mtime_ns
+        ):
+            return []
+        start = prev.offset if prev else 0
+        if prev is None or prev.inode != st.st_ino or st.st_size < prev.offset:
+            # New, rotated or truncated file: start over
+            start = 0
+            self.index.stats.pop(path, None)
+        end = _complete_end(path, start, st.st_size)
+        self.index.files[path] = FileState(st.st_ino, st.st_size, st.st_mtime_ns, end)
+        if end <= start:
+            return []
+        return self._read_rows(target, start, end)
+
+    def _read_rows(self, target: WatchTarget, start: int, end: int) -> list[dict[str, Any]]:
+        events: list[dict[str, Any]] = []
+        if target.source == "ground_sensors":
+            saved = self.index.stats.get(target.path)
+            stats = (
+                ground_sensors.MetricStats.from_dict(saved)
+                if saved
+                else ground_sensors.MetricStats()
+            )
+            for batch in ground_sensors.iter_events(
+                self.config, target.path, start=start, end=end, stats=stats
+            ):
+                events += batch
+            self.index.stats[target.path] = stats.to_dict()
+        elif target.source == "social_media":
+            for batch in social_media.iter_events(self.config, target.path, start=start, end=end):
+                events += batch
+        elif target.source == "gps":
+            for batch in iter_tracks(target.path, start=start, end=end):
+                events += batch
+        else:
+            print(f"Unknown watch source {target.source!r} for {target.path}")
+        return events
+
+    def wait(self, interval: float, mode: str = "auto") -> None:
+        """Block until the next poll is due.
+
+        In ``auto`` mode a filesystem notification (inotify on Linux, via the optional
+        ``watchfiles`` package) ends the wait early; otherwise, or in ``poll`` mode, it
+        simply sleeps for ``interval`` seconds.
+        """
+        if mode == "auto":
+            dirs = {
+                t.path if t.kind == "images" else str(pathlib.Path(t.path).parent)
+                for t in self.targets
+            }
+            if _wait_for_change(sorted(d for d in dirs if os.path.isdir(d)), interval):
+                return
+        time.sleep(interval)
+
+
+def _wait_for_change(dirs: list[str], interval: float) -> bool:
+    """Wait up to ``interval`` for a change under ``dirs``; False if notifications are
+    unavailable."""
+    try:
+        import watchfiles
+    except ImportError:
+        return False
+    if not dirs:
+        return False
+    for _ in watchfiles.watch(*dirs, rust_timeout=int(interval * 1000), yield_on_timeout=True):
+        break
+    return True
+
+
+def watch(
+    config: dict[str, Any],
+    interval: float | None = None,
+    once: bool = False,
+    mode: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Poll for new data forever (or once) and yield a pipeline summary per micro-batch."""
+    from open_encroachment.pipeline import prepare_dirs, process_events
+
+    wcfg = config.get("watch", {})
+    interval = float(interval if interval is not None else wcfg.get("interval_s", 5))
+    mode = mode or wcfg.get("mode", "auto")
+    prepare_dirs(config)
+    watcher = DirectoryWatcher(config, index_path=wcfg.get("index_path"))
+    while True:
+        events = watcher.poll(save=False)
+        summary = process_events(config, events) if events else None
+        # Offsets are saved only once the batch is processed: a crash re-reads it
+        watcher.index.save()
+        if summary is not None:
+            yield {"new_events": len(events), **summary}
+        if once:
+            return
+        watcher.wait(interval, mode)
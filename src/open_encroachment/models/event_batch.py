@@ -0,0 +1,254 @@
+"""Columnar, memory-mappable representation of ingested events.
+
+Between pipeline stages millions of events are much cheaper to hold as a handful of NumPy
+arrays than as nested dicts or Pydantic models. ``EventBatch`` stores one array per field
+plus small string tables, can be spilled to ``.npy`` files and reopened with
+``mmap_mode="r"`` so later stages read it zero-copy from the page cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Literal
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from open_encroachment.models.schemas import Event
+
+_ARRAYS = (
+    "ids",
+    "timestamps",
+    "lat",
+    "lon",
+    "source_codes",
+    "features",
+    "text_index",
+    "path_index",
+)
+_TABLES = ("sources", "feature_names", "texts", "paths")
+_EVENT_LIST: TypeAdapter[list[Event]] = TypeAdapter(list[Event])
+
+
+def _epoch(s: str) -> float:
+    try:
+        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except Exception:
+        dt = datetime.now(timezone.utc)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class _Interner:
+    """Map strings to dense integer codes in first-seen order."""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        c = self.codes.get(value)
+        if c is None:
+            c = self.codes[value] = len(self.codes)
+        return c
+
+    @property
+    def table(self) -> list[str]:
+        return list(self.codes)
+
+
+@dataclass
+class EventBatch:
+    """Events as parallel arrays.
+
+    - ``ids``: UTF-8 encoded ids (``S`` dtype)
+    - ``timestamps``: float64 epoch seconds, UTC
+    - ``lat``/``lon``: float64, NaN when unknown
+    - ``source_codes``: int16 index into ``sources``
+    - ``features``: float64 ``(n, len(feature_names))``; NaN marks an absent feature
+    - ``text_index``/``path_index``: int32 index into ``texts``/``paths``; -1 when absent
+
+    Only numeric features, the ``text`` feature and the ``image_path`` artifact are kept;
+    other artifacts (raw row echoes) stay in the source files.
+    """
+
+    ids: np.ndarray
+    timestamps: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+    source_codes: np.ndarray
+    features: np.ndarray
+    text_index: np.ndarray
+    path_index: np.ndarray
+    sources: list[str]
+    feature_names: list[str]
+    texts: list[str]
+    paths: list[str]
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    @classmethod
+    def from_events(cls, events: Sequence[Event | dict[str, Any]]) -> EventBatch:
+        n = len(events)
+        ids: list[str] = []
+        timestamps = np.empty(n, dtype=np.float64)
+        lat = np.full(n, np.nan)
+        lon = np.full(n, np.nan)
+        source_codes = np.empty(n, dtype=np.int16)
+        text_index = np.full(n, -1, dtype=np.int32)
+        path_index = np.full(n, -1, dtype=np.int32)
+        sources, names, texts, paths = _Interner(), _Interner(), _Interner(), _Interner()
+        cells: list[tuple[int, int, float]] = []
+        for i, e in enumerate(events):
+            # A model's __dict__ holds its validated fields; no need for a model_dump copy
+            d = vars(e) if isinstance(e, Event) else e
+            ids.append(d["id"])
+            timestamps[i] = _epoch(d.get("timestamp") or "")
+            if d.get("lat") is not None and d.get("lon") is not None:
+                lat[i] = d["lat"]
+                lon[i] = d["lon"]
+            source_codes[i] = sources.code(d["source"])
+            for k, v in (d.get("features") or {}).items():
+                if k == "text" and isinstance(v, str):
+                    text_index[i] = texts.code(v)
+                elif isinstance(v, (int, float)):
+                    cells.append((i, names.code(k), float(v)))
+            image_path = (d.get("artifacts") or {}).get("image_path")
+            if image_path is not None:
+                path_index[i] = paths.code(str(image_path))
+        features = np.full((n, len(names.codes)), np.nan)
+        if cells:
+            rows, cols, vals = zip(*cells, strict=True)
+            features[list(rows), list(cols)] = vals
+        return cls(
+            ids=(
+                np.array([x.encode("utf-8") for x in ids], dtype=np.bytes_)
+                if ids
+                else np.empty(0, dtype="S1")
+            ),
+            timestamps=timestamps,
+            lat=lat,
+            lon=lon,
+            source_codes=source_codes,
+            features=features,
+            text_index=text_index,
+            path_index=path_index,
+            sources=sources.table,
+            feature_names=names.table,
+            texts=texts.table,
+            paths=paths.table,
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence[EventBatch]) -> EventBatch:
+        """Concatenate batches, merging their string tables and feature columns."""
+        if not batches:
+            return cls.from_events([])
+        sources, names, texts, paths = _Interner(), _Interner(), _Interner(), _Interner()
+        for b in batches:
+            for v in b.sources:
+                sources.code(v)
+            for v in b.feature_names:
+                names.code(v)
+        n = sum(len(b) for b in batches)
+        features = np.full((n, len(names.codes)), np.nan)
+        source_codes, text_index, path_index = [], [], []
+        offset = 0
+        for b in batches:
+            cols = [names.codes[v] for v in b.feature_names]
+            features[offset : offset + len(b), cols] = b.features
+            offset += len(b)
+            source_codes.append(
+                np.array([sources.codes[v] for v in b.sources], dtype=np.int16)[b.source_codes]
+                if len(b)
+                else b.source_codes
+            )
+            text_index.append(_remap(b.text_index, b.texts, texts))
+            path_index.append(_remap(b.path_index, b.paths, paths))
+        return cls(
+            ids=np.concatenate([b.ids for b in batches]),
+            timestamps=np.concatenate([b.timestamps for b in batches]),
+            lat=np.concatenate([b.lat for b in batches]),
+            lon=np.concatenate([b.lon for b in batches]),
+            source_codes=np.concatenate(source_codes).astype(np.int16),
+            features=features,
+            text_index=np.concatenate(text_index).astype(np.int32),
+            path_index=np.concatenate(path_index).astype(np.int32),
+            sources=sources.table,
+            feature_names=names.table,
+            texts=texts.table,
+            paths=paths.table,
+        )
+
+    def content_digest(self) -> str:
+        """Hash of everything but the ids, which are minted afresh on each ingestion."""
+        h = hashlib.blake2b(digest_size=20)
+        for name in _ARRAYS[1:]:
+            arr = np.ascontiguousarray(getattr(self, name))
+            h.update(f"{name}{arr.dtype.str}{arr.shape}".encode())
+            h.update(arr.tobytes())
+        h.update(json.dumps([getattr(self, name) for name in _TABLES]).encode("utf-8"))
+        return h.hexdigest()
+
+    def event_dict(self, i: int) -> dict[str, Any]:
+        """Rebuild the plain event dict for row ``i``."""
+        feats: dict[str, Any] = {
+            name: float(v)
+            for name, v in zip(self.feature_names, self.features[i].tolist(), strict=True)
+            if v == v  # skip NaN (absent)
+        }
+        if self.text_index[i] >= 0:
+            feats["text"] = self.texts[self.text_index[i]]
+        artifacts: dict[str, Any] = {}
+        if self.path_index[i] >= 0:
+            artifacts["image_path"] = self.paths[self.path_index[i]]
+        located = not (np.isnan(self.lat[i]) or np.isnan(self.lon[i]))
+        return {
+            "id": self.ids[i].decode("utf-8"),
+            "source": self.sources[self.source_codes[i]],
+            "timestamp": datetime.fromtimestamp(
+                float(self.timestamps[i]), timezone.utc
+            ).isoformat(),
+            "lat": float(self.lat[i]) if located else None,
+            "lon": float(self.lon[i]) if located else None,
+            "features": feats,
+            "artifacts": artifacts,
+        }
+
+    def to_events(self) -> list[Event]:
+        """Convert back to validated ``Event`` models (for the API boundary)."""
+        return _EVENT_LIST.validate_python([self.event_dict(i) for i in range(len(self))])
+
+    def spill(self, directory: str | pathlib.Path) -> EventBatch:
+        """Write the batch as ``.npy`` files plus ``tables.json``; return a memory-mapped view."""
+        d = pathlib.Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(d / f"{name}.npy", getattr(self, name))
+        with (d / "tables.json").open("w", encoding="utf-8") as f:
+            json.dump({name: getattr(self, name) for name in _TABLES}, f)
+        return EventBatch.load(d)
+
+    @classmethod
+    def load(
+        cls, directory: str | pathlib.Path, mmap_mode: Literal["r", "r+", "c"] | None = "r"
+    ) -> EventBatch:
+        d = pathlib.Path(directory)
+        with (d / "tables.json").open("r", encoding="utf-8") as f:
+            tables = json.load(f)
+        arrays = {name: np.load(d / f"{name}.npy", mmap_mode=mmap_mode) for name in _ARRAYS}
+        return cls(**arrays, **tables)
+
+
+def _remap(index: np.ndarray, table: list[str], target: _Interner) -> np.ndarray:
+    """Translate indices into ``table`` to indices into ``target`` (keeping -1)."""
+    if not table:
+        return np.asarray(index)
+    mapping = np.array([target.code(v) for v in table] + [-1], dtype=np.int32)
+    return np.asarray(mapping[index])  # -1 selects the trailing sentinel
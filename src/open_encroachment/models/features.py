@@ -0,0 +1,109 @@
+"""Fixed feature schema and dense feature matrices for batch scoring.
+
+Fused events carry features as sparse dicts. Classification and severity scoring read
+a fixed set of them, so a batch is converted once into a float32 matrix (absent values
+are 0 and flagged in ``present``) plus per-row modality flags, and both stages run as
+array operations over the whole batch.
+
+:func:`design_matrix` lays a batch out in the columns a trained fused classifier was
+fitted on; the column list is saved with the model, so a model keeps working when
+columns are added to :data:`MODEL_COLUMNS` later.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+FEATURES = (
+    "img_edge_strength",
+    "img_texture",
+    "aerial_edge_strength",
+    "aerial_texture",
+    "ground_sensor_pm25_z",
+    "ground_sensor_noise_db_z",
+    "ground_sensor_vibration_z",
+    "ground_sensor_temp_c_z",
+)
+_INDEX = {name: j for j, name in enumerate(FEATURES)}
+MODEL_COLUMNS = (
+    *FEATURES,
+    *(f"{name}_present" for name in FEATURES),
+    "text_threat",
+    "lexicon_hits",
+    "in_geofence",
+    "has_img",
+    "has_aerial",
+    "has_ground",
+)
+
+
+@dataclass(slots=True)
+class FeatureMatrix:
+    values: np.ndarray  # (n, len(FEATURES)) float32, 0 where absent
+    present: np.ndarray  # (n, len(FEATURES)) bool
+    has_img: np.ndarray  # (n,) bool: any img_* feature, in the schema or not
+    has_aerial: np.ndarray
+    has_ground: np.ndarray
+
+    @classmethod
+    def from_dicts(cls, rows: Sequence[dict[str, Any]]) -> FeatureMatrix:
+        n = len(rows)
+        values = np.zeros((n, len(FEATURES)), dtype=np.float32)
+        present = np.zeros((n, len(FEATURES)), dtype=bool)
+        flags = np.zeros((n, 3), dtype=bool)
+        for i, feats in enumerate(rows):
+            for k, v in feats.items():
+                j = _INDEX.get(k)
+                if j is not None:
+                    values[i, j] = v
+                    present[i, j] = True
+                if k.startswith("img_"):
+                    flags[i, 0] = True
+                elif k.startswith("aerial_"):
+                    flags[i, 1] = True
+                elif k.startswith("ground_sensor_"):
+                    flags[i, 2] = True
+        return cls(values, present, flags[:, 0], flags[:, 1], flags[:, 2])
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def column(self, name: str) -> np.ndarray:
+        """A feature as float64 (0 where absent)."""
+        return self.values[:, _INDEX[name]].astype(np.float64)
+
+
+def design_matrix(
+    features: FeatureMatrix,
+    text_scores: np.ndarray,
+    in_geofence: np.ndarray,
+    columns: Sequence[str] = MODEL_COLUMNS,
+    lexicon_hits: np.ndarray | None = None,
+) -> np.ndarray:
+    """Model inputs as an (n, len(columns)) float32 matrix, in ``columns`` order.
+
+    Columns this version does not produce are filled with 0 (with a warning);
+    ``lexicon_hits`` is 0 when no lexicon was applied.
+    """
+    available: dict[str, np.ndarray] = {
+        "text_threat": np.asarray(text_scores),
+        "lexicon_hits": np.zeros(len(features)) if lexicon_hits is None else lexicon_hits,
+        "in_geofence": np.asarray(in_geofence),
+        "has_img": features.has_img,
+        "has_aerial": features.has_aerial,
+        "has_ground": features.has_ground,
+    }
+    for j, name in enumerate(FEATURES):
+        available[name] = features.values[:, j]
+        available[f"{name}_present"] = features.present[:, j]
+    out = np.zeros((len(features), len(columns)), dtype=np.float32)
+    for j, col in enumerate(columns):
+        if col in available:
+            out[:, j] = available[col]
+        else:
+            print(f"Model column {col!r} is not produced by this version; using 0")
+    return out
@@ -0,0 +1,99 @@
+"""Lightweight internal records passed between pipeline stages.
+
+Pydantic models in ``schemas`` validate data where it enters or leaves the system; inside
+the pipeline, incidents travel as slotted dataclasses that are built once and read by
+attribute, with a single plain-dict view shared by persistence, evidence and analytics.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from open_encroachment.models.schemas import Incident
+
+_INCIDENTS: TypeAdapter[list[Incident]] = TypeAdapter(list[Incident])
+
+
+@dataclass(slots=True)
+class IncidentRecord:
+    id: str
+    timestamp: str
+    lat: float | None
+    lon: float | None
+    geofence_id: str | None
+    in_geofence: bool
+    threat_probability: float
+    text_threat: float | None  # None: the texts were not scored (cascade or prefilter)
+    features: dict[str, Any]
+    sources: list[str]
+    raw_event_ids: list[str]
+    severity: dict[str, float]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Plain dict in the ``Incident`` schema layout (nested values are shared)."""
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "lat": self.lat,
+            "lon": self.lon,
+            "geofence_id": self.geofence_id,
+            "in_geofence": self.in_geofence,
+            "threat_probability": self.threat_probability,
+            "text_threat": self.text_threat,
+            "features": self.features,
+            "sources": self.sources,
+            "raw_event_ids": self.raw_event_ids,
+            "severity": self.severity,
+        }
+
+
+_REQUIRED = ("id", "timestamp", "threat_probability", "text_threat")
+_NULLABLE = ("text_threat",)
+
+
+def classified_errors(raw: dict[str, Any]) -> list[str]:
+    """Why a classified event cannot become an incident (empty if it can).
+
+    The cheap checks of the ``Incident`` schema that classifier output can fail: missing
+    keys and probabilities that are not numbers in [0, 1].
+    """
+    errors = [
+        f"{k}: missing"
+        for k in _REQUIRED
+        if k not in raw or (raw[k] is None and k not in _NULLABLE)
+    ]
+    for k in ("threat_probability", "text_threat"):
+        v = raw.get(k)
+        if v is None:
+            continue
+        if isinstance(v, bool) or not isinstance(v, int | float) or not 0.0 <= v <= 1.0:
+            errors.append(f"{k}: {v!r} is not a probability")
+    return errors
+
+
+def incident_record(raw: dict[str, Any], severity: dict[str, float]) -> IncidentRecord:
+    """Record for a classified event that passed :func:`classified_errors`; other keys
+    are ignored."""
+    return IncidentRecord(
+        id=raw["id"],
+        timestamp=raw["timestamp"],
+        lat=raw.get("lat"),
+        lon=raw.get("lon"),
+        geofence_id=raw.get("geofence_id"),
+        in_geofence=bool(raw.get("in_geofence", False)),
+        threat_probability=raw["threat_probability"],
+        text_threat=raw["text_threat"],
+        features=raw.get("features", {}),
+        sources=raw.get("sources", []),
+        raw_event_ids=raw.get("raw_event_ids", []),
+        severity=severity,
+    )
+
+
+def to_incident_models(records: Sequence[IncidentRecord]) -> list[Incident]:
+    """Validate records as ``Incident`` models in one batch (for the API boundary)."""
+    return _INCIDENTS.validate_python([r.as_dict() for r in records])
@@ -0,0 +1,92 @@
+"""Process-wide cache of loaded model artifacts.
+
+Classifiers are constructed per run (and per API request); loading their joblib files
+through the registry makes that a ``stat`` and a dict lookup once a file has been
+loaded. An entry is keyed on the absolute path and ``mmap_mode`` and reloaded when the
+file's mtime or size changes, so a retrained model is picked up by the next run.
+
+Loaded objects are shared between threads and must be treated as read-only: code that
+retrains a model fits a copy, dumps it and registers it with :meth:`ModelRegistry.put`.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import warnings
+from collections.abc import Callable
+from typing import Any
+
+import joblib
+from sklearn.exceptions import InconsistentVersionWarning
+
+_Signature = tuple[int, int]
+
+
+def _signature(path: str) -> _Signature:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class ModelRegistry:
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, str | None], tuple[_Signature, Any]] = {}
+        self._locks: dict[str, threading.RLock] = {}
+        self._guard = threading.Lock()
+        self.loads = 0
+
+    def lock(self, path: str | os.PathLike[str]) -> threading.RLock:
+        """Per-artifact lock; also held while a missing model is trained and saved."""
+        key = os.path.abspath(path)
+        with self._guard:
+            return self._locks.setdefault(key, threading.RLock())
+
+    def load(
+        self,
+        path: str | os.PathLike[str],
+        mmap_mode: str | None = None,
+        loader: Callable[..., Any] = joblib.load,
+    ) -> Any:
+        """Return the object stored at ``path``, loading it only if new or changed.
+
+        ``mmap_mode`` (e.g. ``"r"``) memory-maps the numpy arrays of uncompressed
+        joblib files instead of reading them into memory. Raises ``OSError`` if the
+        file does not exist.
+        """
+        path = os.path.abspath(path)
+        key = (path, mmap_mode)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == _signature(path):
+            return entry[1]
+        with self.lock(path):
+            # Another thread may have loaded it while we waited
+            sig = _signature(path)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                return entry[1]
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", InconsistentVersionWarning)
+                obj = loader(path, mmap_mode=mmap_mode)
+            self._entries[key] = (sig, obj)
+            self.loads += 1
+            return obj
+
+    def put(self, path: str | os.PathLike[str], obj: Any, mmap_mode: str | None = None) -> None:
+        """Register an object just written to ``path`` so it is not loaded back."""
+        path = os.path.abspath(path)
+        self._entries[(path, mmap_mode)] = (_signature(path), obj)
+
+    def signature(
+        self, path: str | os.PathLike[str], mmap_mode: str | None = None
+    ) -> _Signature | None:
+        """(mtime_ns, size) of the file the registered object was loaded from or saved to."""
+        entry = self._entries.get((os.path.abspath(path), mmap_mode))
+        return entry[0] if entry is not None else None
+
+    def clear(self) -> None:
+        with self._guard:
+            self._entries.clear()
+            self.loads = 0
+
+
+REGISTRY = ModelRegistry()
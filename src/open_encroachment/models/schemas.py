@@ -70,7 +70,7 @@ class Incident(BaseModel):
     geofence_id: str | None = None
     in_geofence: bool
     threat_probability: float = Field(..., ge=0.0, le=1.0)
-    text_threat: float = Field(..., ge=0.0, le=1.0)
+    text_threat: float | None = Field(..., ge=0.0, le=1.0)
     features: dict[str, Any]
     sources: list[str]
     raw_event_ids: list[str]
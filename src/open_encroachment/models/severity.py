@@ -2,6 +2,16 @@ from __future__ import annotations
 
 import numpy as np
 
+from open_encroachment.models.features import FeatureMatrix
+
+_ENV_FEATURES = (
+    "ground_sensor_pm25_z",
+    "ground_sensor_noise_db_z",
+    "ground_sensor_vibration_z",
+    "img_edge_strength",
+    "aerial_edge_strength",
+)
+
 
 def severity_score(
     threat_prob: float,
@@ -48,3 +58,21 @@ def severity_score(
         "operational": float(np.clip(operational, 0.0, 1.0)),
         "overall": overall,
     }
+
+
+def severity_scores(
+    threat_prob: np.ndarray, features: FeatureMatrix, in_geofence: np.ndarray
+) -> dict[str, np.ndarray]:
+    """:func:`severity_score` for a whole batch; each sub-score is an (n,) array."""
+    threat_prob = np.asarray(threat_prob, dtype=np.float64)
+    env_mean = np.mean([features.column(k) for k in _ENV_FEATURES], axis=0)
+    env = 1 / (1 + np.exp(-env_mean))
+    legal = np.where(in_geofence, np.minimum(1.0, threat_prob + 0.2), threat_prob)
+    corroboration = 0.2 * (features.has_img & features.has_aerial) + 0.2 * features.has_ground
+    operational = np.minimum(1.0, 0.5 * threat_prob + corroboration)
+    return {
+        "environmental": np.clip(env, 0.0, 1.0),
+        "legal": np.clip(legal, 0.0, 1.0),
+        "operational": np.clip(operational, 0.0, 1.0),
+        "overall": np.clip(0.4 * env + 0.3 * legal + 0.3 * operational, 0.0, 1.0),
+    }
@@ -0,0 +1,107 @@
+"""Versioned model artifacts with an atomically switched current version.
+
+A :class:`ModelStore` keeps each trained model as an immutable file named by its
+version (a UTC timestamp, so versions sort by age) next to a ``CURRENT`` pointer::
+
+    <models_dir>/social_nlp/
+        20261019T031500123456Z.joblib
+        20261019T094512654321Z.joblib
+        CURRENT                  -> "20261019T094512654321Z"
+
+Publishing writes the new file under a temporary name, renames it into place and then
+replaces the pointer the same way, so a reader resolves either the old version or the
+new one and never a partial file. Scorers re-read the pointer on every call and switch
+between calls; work already running keeps the model it started with. Rolling back only
+moves the pointer. The newest ``keep`` versions (and the current one) are retained.
+:meth:`ModelStore.adopt` brings in a model file saved outside the store, such as a
+single-file model from before models were versioned.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import shutil
+from datetime import datetime, timezone
+from typing import Any
+
+import joblib
+
+POINTER = "CURRENT"
+
+
+class ModelStore:
+    def __init__(self, root: str | os.PathLike[str], name: str, keep: int = 5) -> None:
+        self.dir = pathlib.Path(root) / name
+        self.keep = keep
+
+    def path(self, version: str) -> pathlib.Path:
+        return self.dir / f"{version}.joblib"
+
+    def versions(self) -> list[str]:
+        """Stored versions, oldest first."""
+        if not self.dir.is_dir():
+            return []
+        return sorted(p.stem for p in self.dir.glob("*.joblib"))
+
+    def current(self) -> str | None:
+        try:
+            return (self.dir / POINTER).read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+
+    def _point(self, version: str) -> None:
+        tmp = self.dir / f".{POINTER}.{os.getpid()}.tmp"
+        tmp.write_text(version, encoding="utf-8")
+        os.replace(tmp, self.dir / POINTER)
+
+    def _new_version(self) -> str:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        while self.path(version).exists():
+            version += "_"
+        return version
+
+    def _install(self, tmp: pathlib.Path, version: str) -> str:
+        os.replace(tmp, self.path(version))
+        self._point(version)
+        self._prune()
+        return version
+
+    def publish(self, obj: Any) -> str:
+        """Save ``obj`` as a new version and make it current; returns the version."""
+        version = self._new_version()
+        tmp = self.dir / f".{version}.{os.getpid()}.tmp"
+        joblib.dump(obj, tmp)
+        return self._install(tmp, version)
+
+    def adopt(self, path: str | os.PathLike[str]) -> str:
+        """Copy the model file at ``path`` in as a new version and make it current."""
+        version = self._new_version()
+        tmp = self.dir / f".{version}.{os.getpid()}.tmp"
+        shutil.copyfile(path, tmp)
+        return self._install(tmp, version)
+
+    def rollback(self, to: str | None = None) -> str:
+        """Point at ``to``, or at the version before the current one; returns it.
+
+        Raises ``ValueError`` if there is no such version.
+        """
+        versions = self.versions()
+        if to is None:
+            current = self.current()
+            older = [v for v in versions if current is None or v < current]
+            if not older:
+                raise ValueError(f"No version of {self.dir.name} before {current}")
+            to = older[-1]
+        elif to not in versions:
+            raise ValueError(f"Unknown version {to!r} of {self.dir.name}")
+        self._point(to)
+        return to
+
+    def _prune(self) -> None:
+        versions = self.versions()
+        current = self.current()
+        for v in versions[: max(0, len(versions) - self.keep)]:
+            if v != current:
+                self.path(v).unlink(missing_ok=True)
@@ -1,66 +1,229 @@
 from __future__ import annotations
 
-from typing import Any
+import os
+from typing import TYPE_CHECKING, Any
 
-import joblib
 import numpy as np
 
-from open_encroachment.nlp.nlp_engine import SocialNLP
+from open_encroachment.models.features import FEATURES, FeatureMatrix, design_matrix
+
+if TYPE_CHECKING:
+    from open_encroachment.nlp.exported import LinearTextScorer
+    from open_encroachment.nlp.lexicon import ThreatLexicon
+    from open_encroachment.nlp.nlp_engine import SocialNLP
+
+# scikit-learn and joblib are imported only when a pickled model is used: with an
+# exported text model (nlp.export_dir) and no fused model, classification needs NumPy alone
+
+BASELINE_WEIGHTS = {
+    "img_edge_strength": 0.15,
+    "img_texture": 0.1,
+    "aerial_edge_strength": 0.15,
+    "aerial_texture": 0.1,
+    "ground_sensor_pm25_z": 0.1,
+    "ground_sensor_noise_db_z": 0.1,
+    "ground_sensor_vibration_z": 0.1,
+    "ground_sensor_temp_c_z": 0.05,
+}
+_WEIGHT_VECTOR = np.array([BASELINE_WEIGHTS.get(k, 0.0) for k in FEATURES])
+
+
+def baseline_probability(features: dict[str, float], text_score: float, in_geofence: bool) -> float:
+    # Simple heuristic combining available signals into [0,1]
+    score = 0.0
+    # Accumulate weighted normalized values
+    for k, w in BASELINE_WEIGHTS.items():
+        if k in features:
+            val = float(features[k])
+            score += w * float(1.0 / (1.0 + np.exp(-val)))
+    # Include NLP text score
+    score += 0.25 * float(text_score)
+    # Geofence bonus
+    if in_geofence:
+        score = min(1.0, score + 0.1)
+    return float(np.clip(score, 0.0, 1.0))
+
+
+def baseline_probabilities(
+    features: FeatureMatrix, text_scores: np.ndarray, in_geofence: np.ndarray
+) -> np.ndarray:
+    """:func:`baseline_probability` for a whole batch."""
+    sig = 1.0 / (1.0 + np.exp(-features.values.astype(np.float64)))
+    score = np.where(features.present, sig, 0.0) @ _WEIGHT_VECTOR
+    score += 0.25 * np.asarray(text_scores, dtype=np.float64)
+    score = np.where(in_geofence, np.minimum(1.0, score + 0.1), score)
+    return np.asarray(np.clip(score, 0.0, 1.0))
 
 
 class ThreatClassifier:
-    def __init__(self, model_dir: str = "artifacts/models") -> None:
+    def __init__(
+        self,
+        model_dir: str = "artifacts/models",
+        mmap_mode: str | None = None,
+        nlp: SocialNLP | LinearTextScorer | None = None,
+        cascade: tuple[float, float] | None = None,
+        lexicon: ThreatLexicon | None = None,
+        prefilter: float | None = None,
+    ) -> None:
+        """``cascade=(low, high)`` skips text and model scoring for events the heuristic
+        alone puts below ``low`` or above ``high`` (see :meth:`classify`).
+
+        ``lexicon`` adds each event's threat-phrase count to its features as
+        ``lexicon_hits``; with ``prefilter``, events whose texts have no hits and whose
+        heuristic without text is below ``prefilter`` are scored by neither the text model
+        nor the trained model; they keep that heuristic probability.
+        """
         self.model_dir = model_dir
         self.model_path = f"{model_dir}/fused_clf.joblib"
-        self.nlp = SocialNLP(model_dir=model_dir)
+        self.mmap_mode = mmap_mode
+        if nlp is None:
+            from open_encroachment.nlp.nlp_engine import SocialNLP
+
+            # Both models come from the process-wide registry, so construction is cheap
+            nlp = SocialNLP(model_dir=model_dir, mmap_mode=mmap_mode)
+        self.nlp = nlp
         self.model = self._load_model()
+        self.cascade = cascade
+        # Events decided by the heuristic alone (benign/severe) or fully scored
+        self.tiers = {"benign": 0, "severe": 0, "scored": 0}
+        self.lexicon = lexicon
+        self.prefilter = prefilter if lexicon is not None else None
+        self.prefiltered = 0  # events whose texts the prefilter kept from the text model
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> ThreatClassifier:
+        export_dir = cfg.get("nlp", {}).get("export_dir")
+        nlp: SocialNLP | LinearTextScorer
+        if export_dir:
+            from open_encroachment.nlp.exported import LinearTextScorer
+
+            nlp = LinearTextScorer.load(export_dir)
+        else:
+            from open_encroachment.nlp.nlp_engine import SocialNLP
+
+            nlp = SocialNLP.from_config(cfg)
+        ccfg = cfg.get("cascade", {})
+        lcfg = cfg.get("lexicon", {})
+        lexicon = None
+        if lcfg.get("enabled"):
+            from open_encroachment.nlp.lexicon import ThreatLexicon
+
+            lexicon = ThreatLexicon.load(lcfg.get("path") or "data/social/threat_lexicon.txt")
+        return cls(
+            model_dir=cfg.get("artifacts", {}).get("models_dir", "artifacts/models"),
+            mmap_mode=cfg.get("models", {}).get("mmap_mode"),
+            nlp=nlp,
+            cascade=(
+                (float(ccfg.get("low", 0.2)), float(ccfg.get("high", 0.8)))
+                if ccfg.get("enabled")
+                else None
+            ),
+            lexicon=lexicon,
+            prefilter=float(lcfg.get("max_prior", 0.3)) if lcfg.get("prefilter") else None,
+        )
+
+    def _load_model(self) -> dict[str, Any] | None:
+        """The trained model bundle (see :mod:`~open_encroachment.models.training`), if any."""
+        if not os.path.exists(self.model_path):
+            return None
+        from open_encroachment.models.registry import REGISTRY
 
-    def _load_model(self):
         try:
-            return joblib.load(self.model_path)
+            bundle = REGISTRY.load(self.model_path, self.mmap_mode)
         except Exception:
             return None
+        if not isinstance(bundle, dict) or not {"estimator", "columns"} <= bundle.keys():
+            print(f"Ignoring {self.model_path}: no column list saved with the model")
+            return None
+        return bundle
+
+    def versions(self) -> dict[str, str | None]:
+        """Versions of the models in use, for run results (None: heuristic or untrained)."""
+        versions = {
+            "social_nlp": self.nlp.version,
+            "fused_clf": self.model.get("trained_at") if self.model is not None else None,
+        }
+        if self.lexicon is not None:
+            versions["lexicon"] = self.lexicon.version
+        return versions
 
     def _baseline_probability(
         self, features: dict[str, float], text_score: float, in_geofence: bool
     ) -> float:
-        # Simple heuristic combining available signals into [0,1]
-        score = 0.0
-        weights = {
-            "img_edge_strength": 0.15,
-            "img_texture": 0.1,
-            "aerial_edge_strength": 0.15,
-            "aerial_texture": 0.1,
-            "ground_sensor_pm25_z": 0.1,
-            "ground_sensor_noise_db_z": 0.1,
-            "ground_sensor_vibration_z": 0.1,
-            "ground_sensor_temp_c_z": 0.05,
-        }
-        # Accumulate weighted normalized values
-        for k, w in weights.items():
-            if k in features:
-                val = float(features[k])
-                score += w * float(1.0 / (1.0 + np.exp(-val)))
-        # Include NLP text score
-        score += 0.25 * float(text_score)
-        # Geofence bonus
-        if in_geofence:
-            score = min(1.0, score + 0.1)
-        return float(np.clip(score, 0.0, 1.0))
+        return baseline_probability(features, text_score, in_geofence)
+
+    def _uncertain(
+        self, fm: FeatureMatrix, has_text: np.ndarray, in_geofence: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Heuristic probabilities without text, and which events need full scoring.
+
+        An event's text can add up to the heuristic's text weight, so it is decided early
+        only if its heuristic is below ``low`` even with a maximal text score, or above
+        ``high`` with none.
+        """
+        n = len(fm)
+        floor = baseline_probabilities(fm, np.zeros(n), in_geofence)
+        if self.cascade is None:
+            return floor, np.ones(n, dtype=bool)
+        ceiling = np.where(has_text, baseline_probabilities(fm, np.ones(n), in_geofence), floor)
+        low, high = self.cascade
+        benign, severe = ceiling < low, floor > high
+        self.tiers["benign"] += int(benign.sum())
+        self.tiers["severe"] += int(severe.sum())
+        uncertain = ~(benign | severe)
+        self.tiers["scored"] += int(uncertain.sum())
+        return floor, uncertain
 
     def classify(self, fused_events: list[dict[str, Any]]) -> list[dict[str, Any]]:
         results: list[dict[str, Any]] = []
+        norms = []
         for e in fused_events:
-            text_score = self.nlp.threat_score(e.get("texts", []))
-            f = e.get("features", {})
             # Normalize ground sensor feature names (from ingestion)
             norm = {}
-            for k, v in f.items():
+            for k, v in e.get("features", {}).items():
                 if k.startswith("ground_sensor_"):
                     norm[f"ground_sensor_{k.split('ground_sensor_')[1]}"] = v
                 else:
                     norm[k] = v
-            prob = self._baseline_probability(norm, text_score, bool(e.get("in_geofence")))
+            norms.append(norm)
+        in_geofence = np.array([bool(e.get("in_geofence")) for e in fused_events], dtype=bool)
+        fm = FeatureMatrix.from_dicts(norms)
+        texts = [e.get("texts", []) for e in fused_events]
+        has_text = np.array([bool(t) for t in texts], dtype=bool)
+        probs, uncertain = self._uncertain(fm, has_text, in_geofence)
+        hits = None
+        to_score = uncertain
+        if self.lexicon is not None:
+            hits = self.lexicon.hit_counts(texts)
+            for norm, h, t in zip(norms, hits.tolist(), has_text, strict=True):
+                if t:
+                    norm["lexicon_hits"] = h
+            if self.prefilter is not None:
+                # No threat phrase and a low prior: the text model is unlikely to matter
+                skip = uncertain & has_text & (hits == 0) & (probs < self.prefilter)
+                self.prefiltered += int(skip.sum())
+                to_score = uncertain & ~skip
+        # Score the texts of every event that needs it in one batch, not one call per event
+        text_scores = np.zeros(len(fm), dtype=np.float64)
+        sidx = np.flatnonzero(to_score)
+        text_scores[sidx] = self.nlp.threat_scores([texts[i] for i in sidx])
+        # Prefiltered events keep their heuristic prior: the fused model is trained only on
+        # incidents whose texts were scored, so it is not shown a stand-in text score of 0
+        if self.model is not None and len(sidx):
+            # Columns in the order the model was fitted on, one predict_proba per batch
+            X = design_matrix(fm, text_scores, in_geofence, self.model["columns"], hits)[sidx]
+            probs[sidx] = self.model["estimator"].predict_proba(X)[:, 1]
+        elif len(sidx):
+            probs[sidx] = baseline_probabilities(fm, text_scores, in_geofence)[sidx]
+        # Texts kept from the text model have no score: None, not a benign 0.0, so that
+        # training on case outcomes does not learn from it
+        unscored = (has_text & ~to_score).tolist()
+        recorded = [
+            None if skip else s for s, skip in zip(text_scores.tolist(), unscored, strict=True)
+        ]
+        for e, norm, prob, text_score in zip(
+            fused_events, norms, probs.tolist(), recorded, strict=True
+        ):
             results.append(
                 {
                     "id": e["id"],
@@ -0,0 +1,103 @@
+"""Training the fused threat classifier from case outcomes (``open-encroachment train-classifier``).
+
+Analysts close cases with an outcome status; the incidents behind them, with the
+features and text score recorded at the time, are the training set; incidents whose
+texts were never scored (cascade early exits, lexicon prefilter) are left out rather
+than taught as a 0.0 text score. Which statuses
+count as confirmed threats and which as false alarms is configured under ``training``.
+
+The model is saved to ``<models_dir>/fused_clf.joblib`` as a bundle holding the fitted
+estimator and the column list it was fitted on (see
+:func:`~open_encroachment.models.features.design_matrix`).
+:class:`~open_encroachment.models.threat_classifier.ThreatClassifier` uses it when
+present and falls back to the baseline heuristic otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+from datetime import datetime, timezone
+from typing import Any
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from open_encroachment.case_management.case_manager import CaseManager
+from open_encroachment.models.features import MODEL_COLUMNS, FeatureMatrix, design_matrix
+from open_encroachment.models.registry import REGISTRY
+
+
+def training_set(
+    rows: list[dict[str, Any]], columns: tuple[str, ...] = MODEL_COLUMNS
+) -> tuple[np.ndarray, np.ndarray]:
+    """Design matrix and labels from :meth:`CaseManager.labeled_incidents` rows.
+
+    Rows without a text score (NULL ``text_threat``) are skipped.
+    """
+    rows = [r for r in rows if r.get("text_threat") is not None]
+    features = [json.loads(r.get("features") or "{}") for r in rows]
+    fm = FeatureMatrix.from_dicts(features)
+    text = np.array([float(r["text_threat"]) for r in rows])
+    in_gf = np.array([bool(r.get("in_geofence")) for r in rows])
+    hits = np.array([float(f.get("lexicon_hits", 0.0)) for f in features])
+    X = design_matrix(fm, text, in_gf, columns, hits)
+    y = np.array([int(r["label"]) for r in rows], dtype=np.int64)
+    return X, y
+
+
+def train_fused_classifier(cfg: dict[str, Any]) -> dict[str, Any]:
+    """Fit the fused classifier on labeled cases, save it and return a summary.
+
+    Raises ``ValueError`` when there are fewer than ``training.min_samples`` labeled
+    incidents or only one class among them.
+    """
+    arts = cfg.get("artifacts", {})
+    tcfg = cfg.get("training", {})
+    cm = CaseManager(db_path=arts.get("db_path", "artifacts/case_manager.db"))
+    rows = cm.labeled_incidents(
+        tcfg.get("positive_statuses", ["confirmed"]),
+        tcfg.get("negative_statuses", ["false_positive"]),
+    )
+    min_samples = int(tcfg.get("min_samples", 20))
+    X, y = training_set(rows)
+    if len(y) < min_samples:
+        raise ValueError(
+            f"{len(y)} labeled incidents with a text score ({len(rows)} in all); "
+            f"at least {min_samples} are needed"
+        )
+    positives = int(y.sum())
+    if positives in (0, len(y)):
+        raise ValueError("Labeled incidents must include both confirmed threats and false alarms")
+
+    estimator = make_pipeline(
+        StandardScaler(), LogisticRegression(max_iter=1000, class_weight="balanced")
+    )
+    estimator.fit(X, y)
+    bundle = {
+        "estimator": estimator,
+        "columns": list(MODEL_COLUMNS),
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "samples": len(y),
+    }
+    models_dir = pathlib.Path(arts.get("models_dir", "artifacts/models"))
+    models_dir.mkdir(parents=True, exist_ok=True)
+    path = models_dir / "fused_clf.joblib"
+    # Running classifiers see either the old file or the new one, never a partial write
+    tmp = path.with_suffix(".joblib.tmp")
+    joblib.dump(bundle, tmp)
+    os.replace(tmp, path)
+    REGISTRY.put(path, bundle)
+    return {
+        "model_path": str(path),
+        "samples": len(y),
+        "unscored_skipped": len(rows) - len(y),
+        "positives": positives,
+        "negatives": len(y) - positives,
+        "columns": len(MODEL_COLUMNS),
+        "train_accuracy": round(float(estimator.score(X, y)), 4),
+    }
@@ -0,0 +1,104 @@
+"""Streaming threat scoring of large text archives (``open-encroachment score-texts``).
+
+:func:`score_texts` reads texts from any iterable in fixed-size chunks and scores them
+in a process pool, keeping at most two chunks per worker in flight, so memory stays
+bounded however long the archive is. Scores come back chunk by chunk, in input order.
+
+Each worker loads the model once, when it starts: the exported NumPy model when
+``nlp.export_dir`` is set (memory-mapped, so workers share its pages), otherwise the
+text model version that was current when the backfill started. Pinning the version
+keeps a long backfill consistent if a new model is published meanwhile.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+_scorer: Any = None
+
+
+def _load_scorer(cfg: dict[str, Any], version: str | None) -> Any:
+    """An object with ``predict_proba(texts)``."""
+    export_dir = cfg.get("nlp", {}).get("export_dir")
+    if export_dir:
+        from .exported import LinearTextScorer
+
+        return LinearTextScorer.load(export_dir)
+    from open_encroachment.models.registry import REGISTRY
+
+    from .nlp_engine import SocialNLP
+
+    if version is None:
+        raise ValueError("No text model version to score with; train one first")
+    path = SocialNLP.model_store(cfg).path(version)
+    return REGISTRY.load(path, cfg.get("models", {}).get("mmap_mode"))
+
+
+def _init_worker(cfg: dict[str, Any], version: str | None) -> None:
+    global _scorer
+    _scorer = _load_scorer(cfg, version)
+
+
+def _score_chunk(texts: list[str]) -> np.ndarray:
+    return np.asarray(_scorer.predict_proba(texts)[:, 1])
+
+
+def model_version(cfg: dict[str, Any]) -> str | None:
+    """Version a backfill with ``cfg`` scores with, training the text model if missing."""
+    export_dir = cfg.get("nlp", {}).get("export_dir")
+    if export_dir:
+        from .exported import LinearTextScorer
+
+        return LinearTextScorer.load(export_dir).version
+    from .nlp_engine import SocialNLP
+
+    # Train here, once, rather than in every worker
+    cfg = {**cfg, "nlp": {**cfg.get("nlp", {}), "background_training": False}}
+    return SocialNLP.from_config(cfg).version
+
+
+def score_texts(
+    cfg: dict[str, Any],
+    texts: Iterable[str],
+    chunk_size: int | None = None,
+    workers: int | None = None,
+    version: str | None = None,
+) -> Iterator[np.ndarray]:
+    """Threat probabilities of ``texts``, yielded one chunk at a time in input order.
+
+    ``workers=0`` scores in this process. ``version`` defaults to :func:`model_version`.
+    """
+    bcfg = cfg.get("backfill", {})
+    chunk_size = int(chunk_size or bcfg.get("chunk_size", 10_000))
+    if workers is None:
+        workers = bcfg.get("workers")
+    workers = int(workers if workers is not None else os.cpu_count() or 1)
+    version = version or model_version(cfg)
+    it = iter(texts)
+    chunks = iter(lambda: list(itertools.islice(it, chunk_size)), [])
+
+    if workers == 0:
+        scorer = _load_scorer(cfg, version)
+        for chunk in chunks:
+            yield scorer.predict_proba(chunk)[:, 1]
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        workers, mp_context=ctx, initializer=_init_worker, initargs=(cfg, version)
+    ) as pool:
+        pending: deque[Future[np.ndarray]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_score_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
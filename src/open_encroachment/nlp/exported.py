@@ -0,0 +1,187 @@
+"""Exported TF-IDF + linear text model, scored with NumPy alone.
+
+:func:`export_linear_model` writes a fitted :class:`~open_encroachment.nlp.nlp_engine.SocialNLP`
+pipeline as a directory of plain files::
+
+    meta.json   analyzer settings, intercept, n-gram range
+    vocab.json  terms, in column order
+    idf.npy     inverse document frequencies
+    coef.npy    linear coefficients
+
+:class:`LinearTextScorer` memory-maps the arrays, so workers start without importing
+scikit-learn or unpickling a pipeline and the OS shares one copy of the model between
+them. Its probabilities match the pipeline's ``predict_proba`` to floating-point
+rounding. Only the word analyzer with the default tokenization is supported; the
+online (hashing) model cannot be exported.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import re
+import shutil
+from collections.abc import Iterable, Sequence
+from typing import Any, Literal
+
+import numpy as np
+
+FORMAT = 1
+
+
+def export_linear_model(
+    pipeline: Any, out_dir: str | os.PathLike[str], version: str | None = None
+) -> pathlib.Path:
+    """Write the vectorizer and classifier of ``pipeline`` (model ``version``) to ``out_dir``.
+
+    The directory is replaced as a whole, so readers see the old export or the new one.
+    Raises ``ValueError`` for pipelines the scorer cannot reproduce.
+    """
+    vec, clf = pipeline.steps[0][1], pipeline.steps[-1][1]
+    if not hasattr(vec, "vocabulary_"):
+        raise ValueError("Only fitted TF-IDF vocabularies can be exported (not hashed n-grams)")
+    unsupported = {
+        "analyzer": vec.analyzer != "word",
+        "tokenizer": vec.tokenizer is not None,
+        "preprocessor": vec.preprocessor is not None,
+        "stop_words": vec.stop_words is not None,
+        "strip_accents": vec.strip_accents is not None,
+        "binary": vec.binary,
+        "norm": vec.norm not in ("l2", None),
+        "classes": list(clf.classes_) != [0, 1],
+    }
+    bad = [k for k, v in unsupported.items() if v]
+    if bad:
+        raise ValueError(f"Cannot export a text model with custom {', '.join(bad)}")
+
+    terms = [""] * len(vec.vocabulary_)
+    for term, j in vec.vocabulary_.items():
+        terms[j] = term
+    meta = {
+        "format": FORMAT,
+        "version": version,
+        "lowercase": bool(vec.lowercase),
+        "token_pattern": vec.token_pattern,
+        "ngram_range": list(vec.ngram_range),
+        "sublinear_tf": bool(vec.sublinear_tf),
+        "use_idf": bool(vec.use_idf),
+        "norm": vec.norm,
+        "intercept": float(clf.intercept_[0]),
+    }
+    out = pathlib.Path(out_dir)
+    tmp = out.with_name(f"{out.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    idf = vec.idf_ if vec.use_idf else np.ones(len(terms))
+    np.save(tmp / "idf.npy", np.asarray(idf, dtype=np.float64))
+    np.save(tmp / "coef.npy", np.asarray(clf.coef_[0], dtype=np.float64))
+    (tmp / "vocab.json").write_text(json.dumps(terms), encoding="utf-8")
+    (tmp / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    old = out.with_name(f"{out.name}.old-{os.getpid()}")
+    if out.exists():
+        os.replace(out, old)
+    os.replace(tmp, out)
+    shutil.rmtree(old, ignore_errors=True)
+    return out
+
+
+class LinearTextScorer:
+    """Threat probabilities from an exported model; a drop-in for ``SocialNLP`` scoring."""
+
+    online = False
+
+    def __init__(
+        self, meta: dict[str, Any], terms: list[str], idf: np.ndarray, coef: np.ndarray
+    ) -> None:
+        if meta.get("format") != FORMAT:
+            raise ValueError(f"Unsupported text model export format {meta.get('format')!r}")
+        self.meta = meta
+        self.version = meta.get("version")
+        self.vocabulary = {t: j for j, t in enumerate(terms)}
+        self.idf = idf
+        self.coef = coef
+        self.intercept = float(meta["intercept"])
+        self._token = re.compile(meta["token_pattern"])
+        self._ngrams = range(meta["ngram_range"][0], meta["ngram_range"][1] + 1)
+
+    @classmethod
+    def load(
+        cls, path: str | os.PathLike[str], mmap_mode: Literal["r", "c"] | None = "r"
+    ) -> LinearTextScorer:
+        p = pathlib.Path(path)
+        meta = json.loads((p / "meta.json").read_text(encoding="utf-8"))
+        terms = json.loads((p / "vocab.json").read_text(encoding="utf-8"))
+        idf = np.load(p / "idf.npy", mmap_mode=mmap_mode)
+        coef = np.load(p / "coef.npy", mmap_mode=mmap_mode)
+        return cls(meta, terms, idf, coef)
+
+    def _columns(self, text: str) -> list[int]:
+        """Vocabulary columns of the text's n-grams, one entry per occurrence."""
+        if self.meta["lowercase"]:
+            text = text.lower()
+        tokens = self._token.findall(text)
+        vocab = self.vocabulary
+        cols = []
+        for n in self._ngrams:
+            for i in range(len(tokens) - n + 1):
+                j = vocab.get(tokens[i] if n == 1 else " ".join(tokens[i : i + n]))
+                if j is not None:
+                    cols.append(j)
+        return cols
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """(n, 2) probabilities of the benign and threat classes."""
+        rows: list[int] = []
+        cols: list[int] = []
+        for i, text in enumerate(texts):
+            c = self._columns(text)
+            rows += [i] * len(c)
+            cols += c
+        n = len(texts)
+        # Term counts per (text, column), then tf-idf, norm and dot product per text
+        keys, counts = np.unique(
+            np.asarray(rows, dtype=np.int64) * len(self.idf) + np.asarray(cols, dtype=np.int64),
+            return_counts=True,
+        )
+        doc, col = np.divmod(keys, len(self.idf))
+        tf = counts.astype(np.float64)
+        if self.meta["sublinear_tf"]:
+            tf = np.log(tf) + 1.0
+        w = tf * self.idf[col]
+        dot = np.bincount(doc, weights=w * self.coef[col], minlength=n)
+        if self.meta["norm"] == "l2":
+            norm = np.sqrt(np.bincount(doc, weights=w * w, minlength=n))
+            dot = np.divide(dot, norm, out=np.zeros(n), where=norm > 0)
+        p = 1.0 / (1.0 + np.exp(-(dot + self.intercept)))
+        return np.column_stack([1.0 - p, p])
+
+    def threat_score(self, texts: Iterable[str]) -> float:
+        return float(self.threat_scores([list(texts)])[0])
+
+    def threat_scores(self, groups: Sequence[Sequence[str]], batch_size: int = 8192) -> np.ndarray:
+        """Mean threat probability of each group of texts (0.0 for an empty group)."""
+        scores = np.zeros(len(groups), dtype=np.float64)
+        texts = [t for g in groups for t in g]
+        if not texts:
+            return scores
+        proba = np.concatenate(
+            [
+                self.predict_proba(texts[i : i + batch_size])[:, 1]
+                for i in range(0, len(texts), batch_size)
+            ]
+        )
+        lengths = np.fromiter((len(g) for g in groups), dtype=np.int64, count=len(groups))
+        nonempty = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[nonempty]
+        scores[nonempty] = np.add.reduceat(proba, starts) / lengths[nonempty]
+        return np.clip(scores, 0.0, 1.0)
+
+
+def max_abs_diff(pipeline: Any, scorer: LinearTextScorer, texts: Sequence[str]) -> float:
+    """Largest difference between the pipeline's and the scorer's threat probabilities."""
+    if not texts:
+        return 0.0
+    want = pipeline.predict_proba(list(texts))[:, 1]
+    got = scorer.predict_proba(texts)[:, 1]
+    return float(np.abs(want - got).max())
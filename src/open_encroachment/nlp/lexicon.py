@@ -0,0 +1,131 @@
+"""Curated threat-phrase lexicon matched with an Aho-Corasick automaton.
+
+Phrases ("illegal dumping", "pipeline tampering", ...) are compiled once into a trie of
+tokens with failure links, so a text is scanned in a single pass over its tokens
+whatever the size of the lexicon, instead of one regex search per phrase. Text and
+phrases are tokenized the same way (lowercased alphanumeric runs), so phrases match on
+word boundaries and regardless of case or punctuation: "Pipeline-tampering" matches
+"pipeline tampering" but "excavations" does not match "excavation".
+
+:class:`~open_encroachment.models.threat_classifier.ThreatClassifier` adds each event's
+hit count to its features as ``lexicon_hits`` and can skip text-model scoring for
+events with no hits and a low prior (``lexicon.prefilter``).
+
+The lexicon file has one phrase per line; blank lines and ``#`` comments are ignored.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import re
+from collections import deque
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Used when the configured lexicon file is missing
+SEED_PHRASES = (
+    "illegal dumping",
+    "excavation",
+    "pipeline tampering",
+    "fence cut",
+    "trespassing",
+    "illegal logging",
+    "poaching",
+)
+
+
+def tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class ThreatLexicon:
+    def __init__(self, phrases: Iterable[str]) -> None:
+        self.phrases: list[str] = []  # normalized, distinct; a hit is an index into this
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[tuple[int, ...]] = [()]
+        for phrase in phrases:
+            toks = tokens(phrase)
+            if not toks:
+                continue
+            state = 0
+            for tok in toks:
+                nxt = self._goto[state].get(tok)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][tok] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                state = nxt
+            if self._out[state]:
+                continue  # the same phrase again, up to case and punctuation
+            self._out[state] = (len(self.phrases),)
+            self.phrases.append(" ".join(toks))
+        self._vocab = frozenset(tok for edges in self._goto for tok in edges)
+        self._fail = [0] * len(self._goto)
+        # Breadth first, so a state's failure target is complete before the state itself
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for tok, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(tok, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+        self.version = hashlib.blake2b(
+            "\n".join(sorted(self.phrases)).encode(), digest_size=8
+        ).hexdigest()
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> ThreatLexicon:
+        """Compiled lexicon from ``path`` (:data:`SEED_PHRASES` if it does not exist).
+
+        Compiled lexicons are reused until the file changes.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return _compile(None, 0)
+        return _compile(os.fspath(path), mtime_ns)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def scan(self, text: str) -> list[int]:
+        """Indices of the phrases in ``text``, once per occurrence, overlaps included."""
+        goto, fail, out, vocab = self._goto, self._fail, self._out, self._vocab
+        hits: list[int] = []
+        state = 0
+        for tok in _TOKEN.findall(text.lower()):
+            if tok not in vocab:
+                state = 0  # no phrase contains it: every partial match ends here
+                continue
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0)
+            if out[state]:
+                hits.extend(out[state])
+        return hits
+
+    def matches(self, text: str) -> list[str]:
+        return [self.phrases[i] for i in self.scan(text)]
+
+    def hit_counts(self, groups: Sequence[Sequence[str]]) -> np.ndarray:
+        """Total phrase occurrences in each group of texts."""
+        return np.array([sum(len(self.scan(t)) for t in texts) for texts in groups], dtype=np.int64)
+
+
+@functools.lru_cache(maxsize=8)
+def _compile(path: str | None, mtime_ns: int) -> ThreatLexicon:
+    if path is None:
+        return ThreatLexicon(SEED_PHRASES)
+    with open(path, encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return ThreatLexicon(line for line in lines if line)
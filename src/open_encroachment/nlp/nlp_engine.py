@@ -1,90 +1,357 @@
+"""Threat scoring of social media text.
+
+By default the model is TF-IDF + SGD, and feedback refits it on the training data plus
+the new texts. With ``nlp.online`` the model hashes n-grams instead
+(:class:`~sklearn.feature_extraction.text.HashingVectorizer` has no vocabulary to
+refit), so :meth:`SocialNLP.update_with_feedback` folds each batch of labels in with
+``partial_fit`` at a cost proportional to the batch. Updates reach every instance in
+the process at its next scoring call and are snapshotted to disk every
+``nlp.snapshot_every`` labels, or on the next label once ``nlp.snapshot_interval_s``
+seconds have passed; :meth:`SocialNLP.snapshot` publishes the rest (the stream service
+calls it on shutdown).
+
+Models are versioned (:class:`~open_encroachment.models.store.ModelStore`): every
+training run, refit or snapshot publishes a new version, scorers switch to it at their
+next call, and ``open-encroachment nlp-model rollback`` moves back. With
+``nlp.background_training`` a missing model is trained in a worker process instead of
+in the constructor; texts score 0.0 until the first version is published. A
+single-file model from before versioning is adopted as the first version.
+
+Per-text probabilities are memoized in the process-wide
+:data:`~open_encroachment.nlp.score_cache.TEXT_SCORES` cache (``nlp.cache_entries``,
+``nlp.cache_ttl_s``), so only texts not seen with the current model are scored.
+"""
+
 from __future__ import annotations
 
+import copy
+import multiprocessing
 import pathlib
-import warnings
-from collections.abc import Iterable
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
 
-import joblib
 import numpy as np
-from sklearn.exceptions import InconsistentVersionWarning
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.base import clone
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.linear_model import SGDClassifier
 from sklearn.pipeline import Pipeline
 
+from open_encroachment.models.registry import REGISTRY
+from open_encroachment.models.store import ModelStore
+from open_encroachment.nlp.score_cache import TEXT_SCORES, text_key
+
+
+def load_training_data() -> tuple[list[str], list[int]]:
+    path = pathlib.Path("data/social/training_social.csv")
+    texts: list[str] = []
+    labels: list[int] = []  # 1=threat-indicative, 0=benign
+    if path.exists():
+        import csv
+
+        with path.open("r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for r in reader:
+                t = (r.get("text") or "").strip()
+                y = int(r.get("label") or 0)
+                if t:
+                    texts.append(t)
+                    labels.append(1 if y else 0)
+    if not texts:
+        # Minimal inline seed dataset
+        seed: list[tuple[str, int]] = [
+            ("Illegal dumping spotted near river", 1),
+            ("Unauthorized excavation within protected forest", 1),
+            ("Pipeline tampering reported by locals", 1),
+            ("Great weather for a hike today", 0),
+            ("Birds nesting by the lake, beautiful scene", 0),
+            ("Road repair completed successfully", 0),
+        ]
+        texts = [s for s, _ in seed]
+        labels = [y for _, y in seed]
+    return texts, labels
+
+
+def fit_pipeline(online: bool = False, n_features: int = 2**18) -> Pipeline:
+    texts, labels = load_training_data()
+    if online:
+        vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=(1, 2), alternate_sign=False
+        )
+    else:
+        vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1, 2))
+    pipeline = Pipeline(
+        [
+            ("tfidf", vectorizer),
+            ("clf", SGDClassifier(loss="log_loss", max_iter=1000, tol=1e-3, random_state=42)),
+        ]
+    )
+    return pipeline.fit(texts, labels)
+
+
+def _train_version(model_dir: str, name: str, keep: int, online: bool, n_features: int) -> str:
+    # Runs in the training worker process
+    return ModelStore(model_dir, name, keep).publish(fit_pipeline(online, n_features))
+
+
+def _report_failure(job: Future[str]) -> None:
+    if not job.cancelled() and job.exception() is not None:
+        print(f"Background text model training failed: {job.exception()!r}")
+
+
+_executor: ProcessPoolExecutor | None = None
+_jobs: dict[pathlib.Path, Future[str]] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_training(store: ModelStore, online: bool = False, n_features: int = 2**18) -> Future[str]:
+    """Train and publish a new version in a worker process; returns its future.
+
+    While a job for the same store is running, that job's future is returned.
+    """
+    global _executor
+    with _jobs_lock:
+        job = _jobs.get(store.dir)
+        if job is not None and not job.done():
+            return job
+        if _executor is None:
+            # spawn: forking a threaded server process is unsafe
+            ctx = multiprocessing.get_context("spawn")
+            _executor = ProcessPoolExecutor(max_workers=1, mp_context=ctx)
+        job = _executor.submit(
+            _train_version, str(store.dir.parent), store.dir.name, store.keep, online, n_features
+        )
+        job.add_done_callback(_report_failure)
+        _jobs[store.dir] = job
+        print(f"Training {store.dir.name} in the background")
+        return job
+
 
 class SocialNLP:
-    def __init__(self, model_dir: str = "artifacts/models") -> None:
+    def __init__(
+        self,
+        model_dir: str = "artifacts/models",
+        mmap_mode: str | None = None,
+        online: bool = False,
+        n_features: int = 2**18,
+        snapshot_every: int = 100,
+        snapshot_interval_s: float = 60.0,
+        background: bool = False,
+        keep_versions: int = 5,
+    ) -> None:
         self.model_dir = pathlib.Path(model_dir)
-        self.model_path = self.model_dir / "social_nlp.joblib"
+        self.online = online
+        # The two model kinds live side by side so switching modes never loads the other
+        self.store = ModelStore(
+            self.model_dir, "social_nlp_online" if online else "social_nlp", keep_versions
+        )
+        self.mmap_mode = mmap_mode
+        self.n_features = n_features
+        self.snapshot_every = snapshot_every
+        self.snapshot_interval_s = snapshot_interval_s
+        self.background = background
+        self.unsaved = 0  # online labels not yet published
+        self._saved_at = time.monotonic()
         self.pipeline: Pipeline | None = None
+        self.version: str | None = None
+        self.signature: tuple[int, int] | None = None  # of the file self.pipeline came from
         self._ensure_model()
 
-    def _ensure_model(self) -> None:
-        if self.model_path.exists():
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", InconsistentVersionWarning)
-                try:
-                    self.pipeline = joblib.load(self.model_path)
-                    return
-                except Exception:
-                    # Fallback to (re)train if load fails
-                    pass
-        self.model_dir.mkdir(parents=True, exist_ok=True)
-        texts, labels = self._load_training_data()
-        self.pipeline = Pipeline(
-            [
-                ("tfidf", TfidfVectorizer(max_features=5000, ngram_range=(1, 2))),
-                ("clf", SGDClassifier(loss="log_loss", max_iter=1000, tol=1e-3, random_state=42)),
-            ]
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> SocialNLP:
+        ncfg = cfg.get("nlp", {})
+        cls.configure_cache(cfg)
+        return cls(
+            model_dir=cfg.get("artifacts", {}).get("models_dir", "artifacts/models"),
+            mmap_mode=cfg.get("models", {}).get("mmap_mode"),
+            online=bool(ncfg.get("online", False)),
+            n_features=int(ncfg.get("n_features", 2**18)),
+            snapshot_every=int(ncfg.get("snapshot_every", 100)),
+            snapshot_interval_s=float(ncfg.get("snapshot_interval_s", 60.0)),
+            background=bool(ncfg.get("background_training", False)),
+            keep_versions=int(ncfg.get("keep_versions", 5)),
+        )
+
+    @staticmethod
+    def model_store(cfg: dict[str, Any]) -> ModelStore:
+        ncfg = cfg.get("nlp", {})
+        return ModelStore(
+            cfg.get("artifacts", {}).get("models_dir", "artifacts/models"),
+            "social_nlp_online" if ncfg.get("online") else "social_nlp",
+            int(ncfg.get("keep_versions", 5)),
+        )
+
+    @staticmethod
+    def configure_cache(cfg: dict[str, Any]) -> None:
+        """Size the shared text-score cache from ``nlp.cache_entries``/``nlp.cache_ttl_s``."""
+        ncfg = cfg.get("nlp", {})
+        ttl = ncfg.get("cache_ttl_s")
+        TEXT_SCORES.configure(
+            int(ncfg.get("cache_entries", 100_000)), float(ttl) if ttl is not None else None
         )
-        self.pipeline.fit(texts, labels)
-        joblib.dump(self.pipeline, self.model_path)
+
+    @property
+    def model_path(self) -> pathlib.Path | None:
+        return self.store.path(self.version) if self.version else None
+
+    def _load(self) -> bool:
+        """Switch to the store's current version; False if there is none (or it is unreadable)."""
+        version = self.store.current()
+        if version is None:
+            return False
+        path = self.store.path(version)
+        try:
+            # A stat and a dict lookup unless the version changed (see models.registry)
+            pipeline = REGISTRY.load(path, self.mmap_mode)
+        except Exception:
+            return False
+        self.pipeline, self.version = pipeline, version
+        self.signature = REGISTRY.signature(path, self.mmap_mode)
+        return True
+
+    def _ensure_model(self) -> None:
+        # The pipeline is shared by every SocialNLP in the process (see models.registry)
+        if self._load():
+            return
+        with REGISTRY.lock(self.store.dir):
+            # Train once even if several threads find the model missing; a version that
+            # fails to load is replaced by a new one
+            if self._load() or self._adopt_legacy():
+                return
+            if self.background:
+                self.train_in_background()
+                return
+            self._train()
+
+    def _adopt_legacy(self) -> bool:
+        """Publish a model saved before versioning (``<models_dir>/social_nlp.joblib``).
+
+        Only into an empty store, so it becomes the first version instead of being
+        silently replaced by a retrained model.
+        """
+        legacy = self.model_dir / f"{self.store.dir.name}.joblib"
+        if self.store.versions() or not legacy.is_file():
+            return False
+        version = self.store.adopt(legacy)
+        print(f"Adopted {legacy} as {self.store.dir.name} version {version}")
+        return self._load()
+
+    def _train(self) -> None:
+        self._publish(fit_pipeline(self.online, self.n_features))
+
+    def train_in_background(self) -> Future[str]:
+        return start_training(self.store, self.online, self.n_features)
+
+    def _publish(self, pipeline: Pipeline) -> None:
+        version = self.store.publish(pipeline)
+        path = self.store.path(version)
+        REGISTRY.put(path, pipeline, self.mmap_mode)
+        self.pipeline, self.version = pipeline, version
+        self.signature = REGISTRY.signature(path, self.mmap_mode)
+        self.unsaved = 0
+        self._saved_at = time.monotonic()
 
     def _load_training_data(self) -> tuple[list[str], list[int]]:
-        path = pathlib.Path("data/social/training_social.csv")
-        texts: list[str] = []
-        labels: list[int] = []  # 1=threat-indicative, 0=benign
-        if path.exists():
-            import csv
-
-            with path.open("r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for r in reader:
-                    t = (r.get("text") or "").strip()
-                    y = int(r.get("label") or 0)
-                    if t:
-                        texts.append(t)
-                        labels.append(1 if y else 0)
-        if not texts:
-            # Minimal inline seed dataset
-            seed: list[tuple[str, int]] = [
-                ("Illegal dumping spotted near river", 1),
-                ("Unauthorized excavation within protected forest", 1),
-                ("Pipeline tampering reported by locals", 1),
-                ("Great weather for a hike today", 0),
-                ("Birds nesting by the lake, beautiful scene", 0),
-                ("Road repair completed successfully", 0),
-            ]
-            texts = [s for s, _ in seed]
-            labels = [y for _, y in seed]
-        return texts, labels
+        return load_training_data()
 
     def threat_score(self, texts: Iterable[str]) -> float:
-        if self.pipeline is None:
+        return float(self.threat_scores([list(texts)])[0])
+
+    def threat_scores(self, groups: Sequence[Sequence[str]], batch_size: int = 8192) -> np.ndarray:
+        """Mean threat probability of each group of texts (0.0 for an empty group).
+
+        All texts are vectorized and scored together, ``batch_size`` at a time, and the
+        probabilities are averaged back per group with a segment sum.
+        """
+        # Pick up a newly published version, or feedback applied through other instances
+        if not self._load() and self.pipeline is None:
             self._ensure_model()
-        X = list(texts)
-        if not X:
-            return 0.0
-        proba = self.pipeline.predict_proba(X)[:, 1]
-        return float(np.clip(proba.mean(), 0.0, 1.0))
+        lengths = np.fromiter((len(g) for g in groups), dtype=np.int64, count=len(groups))
+        scores = np.zeros(len(groups), dtype=np.float64)
+        texts = [t for g in groups for t in g]
+        if not texts or self.pipeline is None:  # no model until background training ends
+            return scores
+        proba = self._text_probas(texts, batch_size)
+        # reduceat needs non-empty segments; empty groups keep 0.0
+        nonempty = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[nonempty]
+        scores[nonempty] = np.add.reduceat(proba, starts) / lengths[nonempty]
+        return np.clip(scores, 0.0, 1.0)
+
+    def _text_probas(self, texts: list[str], batch_size: int) -> np.ndarray:
+        pipeline, tag = self.pipeline, (self.version, self.signature)
+        if pipeline is None:
+            raise RuntimeError("No text model loaded")
+
+        def predict(batch: list[str]) -> np.ndarray:
+            return np.concatenate(
+                [
+                    pipeline.predict_proba(batch[i : i + batch_size])[:, 1]
+                    for i in range(0, len(batch), batch_size)
+                ]
+            )
+
+        if not TEXT_SCORES.enabled:
+            return predict(texts)
+        version = TEXT_SCORES.version(str(self.store.dir), tag)
+        keys = [text_key(t) for t in texts]
+        # One lookup, and at most one model call, per distinct text
+        distinct = dict(zip(keys, texts, strict=True))
+        found = dict(zip(distinct, TEXT_SCORES.get_many(version, list(distinct)), strict=True))
+        missing = [k for k, v in found.items() if v is None]
+        if missing:
+            scored = predict([distinct[k] for k in missing]).tolist()
+            TEXT_SCORES.put_many(version, missing, scored)
+            found.update(zip(missing, scored, strict=True))
+        return np.array([found[k] for k in keys])
 
     def update_with_feedback(self, texts: Iterable[str], label: int) -> None:
-        # Optional: online learning via partial_fit when available
-        # For simplicity, refit with small batch including the new data
         if self.pipeline is None:
             self._ensure_model()
+        if self.pipeline is None:
+            raise RuntimeError("The text model is still being trained; retry feedback later")
+        texts = list(texts)
+        if self.online:
+            self._partial_fit(texts, [label] * len(texts))
+        else:
+            self._refit(texts, label)
+        # Once the new model is in place, drop (and stop accepting) the old model's scores
+        TEXT_SCORES.invalidate(str(self.store.dir))
+
+    def _refit(self, texts: list[str], label: int) -> None:
         base_texts, base_labels = self._load_training_data()
-        X = base_texts + list(texts)
-        y = base_labels + [label] * len(list(texts))
-        self.pipeline.fit(X, y)
-        joblib.dump(self.pipeline, self.model_path)
+        X = base_texts + texts
+        y = base_labels + [label] * len(texts)
+        # Fit a copy: the loaded pipeline may be in use by other threads
+        self._publish(clone(self.pipeline).fit(X, y))
+
+    def _partial_fit(self, texts: list[str], labels: list[int]) -> None:
+        if not texts:
+            return
+        with REGISTRY.lock(self.store.dir):
+            # Start from the latest update made by any instance in the process; the
+            # shared pipeline may be scoring in other threads, so update a copy
+            self._load()
+            path = self.model_path
+            if self.pipeline is None or path is None:
+                raise RuntimeError("No text model to update yet; train one first")
+            pipeline = copy.deepcopy(self.pipeline)
+            X = pipeline.named_steps["tfidf"].transform(texts)
+            pipeline.named_steps["clf"].partial_fit(X, labels, classes=[0, 1])
+            self.unsaved += len(texts)
+            due = time.monotonic() - self._saved_at >= self.snapshot_interval_s
+            if self.unsaved >= self.snapshot_every or due:
+                self._publish(pipeline)
+            else:
+                # Same file signature, so every instance picks the update up from memory
+                REGISTRY.put(path, pipeline, self.mmap_mode)
+                self.pipeline = pipeline
+
+    def snapshot(self) -> None:
+        """Publish online updates that are not on disk yet (e.g. before shutdown)."""
+        if self.unsaved:
+            with REGISTRY.lock(self.store.dir):
+                self._load()
+                self._publish(self.pipeline)
@@ -0,0 +1,118 @@
+"""Process-wide LRU cache of per-text threat probabilities.
+
+Alerts, reposts, boilerplate news and re-ingested rows bring the same texts back run
+after run. :class:`~open_encroachment.nlp.nlp_engine.SocialNLP` looks each text up here
+before calling the model and scores only the misses.
+
+Texts are keyed on a hash of their normalized form: lowercased with whitespace runs
+collapsed, which leaves the model's tokens (and so its score) unchanged. Keys are
+namespaced by a model version: the model file's signature and a generation that
+:meth:`TextScoreCache.invalidate` bumps when the model is updated in memory, so a
+retrained model never sees its predecessor's scores.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+_Version = tuple[str, Any, int]
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.blake2b(" ".join(text.lower().split()).encode(), digest_size=16).digest()
+
+
+class TextScoreCache:
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl_s: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """``max_entries=0`` disables the cache; ``ttl_s`` expires entries by age."""
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: OrderedDict[tuple[_Version, bytes], tuple[float, float]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_entries: int, ttl_s: float | None) -> None:
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl_s = ttl_s
+            self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def version(self, model: str, tag: Any = None) -> _Version:
+        """Namespace for ``model`` as identified by ``tag`` (e.g. its file signature).
+
+        Take it before scoring and store the scores under it afterwards.
+        """
+        return model, tag, self._generations.get(model, 0)
+
+    def get_many(self, version: _Version, keys: Sequence[bytes]) -> list[float | None]:
+        now = self._clock()
+        out: list[float | None] = []
+        with self._lock:
+            for k in keys:
+                entry = self._entries.get((version, k))
+                if entry is not None and self.ttl_s is not None and now - entry[1] > self.ttl_s:
+                    del self._entries[(version, k)]
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    out.append(None)
+                else:
+                    self._entries.move_to_end((version, k))
+                    self.hits += 1
+                    out.append(entry[0])
+        return out
+
+    def put_many(self, version: _Version, keys: Sequence[bytes], scores: Sequence[float]) -> None:
+        now = self._clock()
+        with self._lock:
+            if version[2] != self._generations.get(version[0], 0):
+                return  # scored by a model that has been replaced meanwhile
+            for k, s in zip(keys, scores, strict=True):
+                self._entries[(version, k)] = (float(s), now)
+                self._entries.move_to_end((version, k))
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, model: str | None = None) -> None:
+        """Drop the scores of ``model`` (all models if None) and start a new generation."""
+        with self._lock:
+            if model is None:
+                self._entries.clear()
+                for m in self._generations:
+                    self._generations[m] += 1
+                return
+            self._generations[model] = self._generations.get(model, 0) + 1
+            for key in [key for key in self._entries if key[0][0] == model]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+TEXT_SCORES = TextScoreCache()
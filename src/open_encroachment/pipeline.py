@@ -1,86 +1,328 @@
 from __future__ import annotations
 
+import shutil
+import tempfile
+import time
+from collections.abc import Sequence
 from typing import Any
 
-from .analytics.predictive import predict_geofence_risk
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+
+from .analytics.predictive import RiskAggregator, predict_geofence_risk, risk_map_path
 from .case_management.case_manager import CaseManager
 from .comms.dispatcher import Dispatcher
 from .config import load_config
 from .evidence.chain_of_custody import append_records
 from .fusion.fusion_engine import fuse_events
-from .gps.tracking import ingest_tracks
-from .ingestion import aerial, ground_sensors, satellite, social_media
-from .models.schemas import Event, FusedEvent, Incident
-from .models.severity import severity_score
+from .ingestion.dedup import suppress_duplicates
+from .ingestion.scheduler import ingest_all
+from .models.event_batch import EventBatch
+from .models.features import FeatureMatrix
+from .models.records import IncidentRecord, classified_errors, incident_record
+from .models.schemas import Event
+from .models.severity import severity_scores
 from .models.threat_classifier import ThreatClassifier
+from .nlp.score_cache import TEXT_SCORES
+from .stage_cache import StageCache, code_version, files_signature
 from .utils.io import ensure_dir
+from .utils.metrics import StageTimer
+
+_EVENT_LIST: TypeAdapter[list[Event]] = TypeAdapter(list[Event])
 
 
-def run_pipeline(config_path: str | None = None, use_sample_data: bool = False) -> dict[str, Any]:
+def run_pipeline(
+    config_path: str | None = None,
+    use_sample_data: bool = False,
+    stream: bool = False,
+    metrics: bool | None = None,
+    incremental: bool = False,
+) -> dict[str, Any]:
+    """Ingest all sources and process them; ``metrics`` overrides ``metrics.enabled``.
+
+    ``incremental`` processes only input that is new since the previous incremental run
+    (see :mod:`open_encroachment.incremental`).
+    """
     cfg = load_config(config_path)
+    if metrics is not None:
+        cfg["metrics"] = {**cfg.get("metrics", {}), "enabled": metrics}
+    prepare_dirs(cfg)
+
+    if use_sample_data:
+        _ensure_sample_data()
+
+    if stream:
+        from .streaming import run_streaming
 
-    # Ensure artifact directories exist
+        return run_streaming(cfg)
+    if incremental:
+        from .incremental import run_incremental
+
+        return run_incremental(cfg)
+
+    timer = StageTimer.from_config(cfg, cpu_clock=time.process_time)
+    # Sources run concurrently; output order is fixed by the source registry
+    with timer.stage("ingest") as span:
+        raw_events = ingest_all(cfg, timer=timer)
+        span.items = len(raw_events)
+    return process_events(cfg, raw_events, timer)
+
+
+def prepare_dirs(cfg: dict[str, Any]) -> None:
+    """Ensure artifact directories exist."""
     ensure_dir(cfg.get("artifacts", {}).get("models_dir", "artifacts/models"))
     ensure_dir(cfg.get("artifacts", {}).get("predictions_dir", "artifacts/predictions"))
     ensure_dir(cfg.get("dispatch", {}).get("outbox_dir", "outbox"))
 
-    if use_sample_data:
-        _ensure_sample_data()
 
-    raw_events: list[dict[str, Any]] = []
-    raw_events += satellite.ingest(cfg)
-    raw_events += aerial.ingest(cfg)
-    raw_events += ground_sensors.ingest(cfg)
-    raw_events += social_media.ingest(cfg)
-    raw_events += ingest_tracks()
+def process_events(
+    cfg: dict[str, Any],
+    raw_events: list[dict[str, Any]],
+    timer: StageTimer | None = None,
+    *,
+    clf: ThreatClassifier | None = None,
+    cm: CaseManager | None = None,
+    dispatcher: Dispatcher | None = None,
+    risk_agg: RiskAggregator | None = None,
+) -> dict[str, Any]:
+    """Run every stage after ingestion on ``raw_events`` and return the run summary.
 
-    events: list[Event] = []
-    for raw in raw_events:
-        try:
-            events.append(Event(**raw))
-        except ValueError as err:
-            print(f"Skipping invalid event: {err}")
-            continue
-
-    # Pass Pydantic Event objects directly; fuser will extract dicts as needed
-    raw_fused = fuse_events(events, cfg)
-    fused: list[FusedEvent] = []
-    for raw in raw_fused:
-        try:
-            fused.append(FusedEvent(**raw))
-        except ValueError as err:
-            print(f"Skipping invalid fused event: {err}")
-            continue
-
-    clf = ThreatClassifier(model_dir=cfg.get("artifacts", {}).get("models_dir", "artifacts/models"))
-    # Classifier expects plain dicts
-    raw_classified = clf.classify([fe.model_dump() for fe in fused])
-
-    # Compute severity and persist incidents
-    incidents: list[Incident] = []
-    for raw_inc in raw_classified:
-        severity = severity_score(
-            raw_inc.get("threat_probability", 0.0),
-            raw_inc.get("features", {}),
-            raw_inc.get("in_geofence", False),
-            raw_inc.get("geofence_id"),
+    When metrics are enabled the summary carries per-stage ``timings``. Long-running
+    callers pass resident ``clf``/``cm``/``dispatcher`` objects, and a ``risk_agg`` that
+    accumulates the risk map across calls; otherwise they are created per call.
+    """
+    if timer is None:
+        timer = StageTimer.from_config(cfg, cpu_clock=time.process_time)
+    with timer.stage("validate") as span:
+        events = validate_events(cfg, raw_events)
+        span.items = len(events)
+    cache = StageCache.from_config(cfg)
+    if cache is not None:
+        fused, classified, incidents, clf = _cached_stages(cfg, events, clf, cache, timer)
+    else:
+        with timer.stage("fuse") as span:
+            fused = fuse_stage(cfg, events)
+            span.items = len(fused)
+
+        with timer.stage("classify") as span:
+            if clf is None:
+                clf = ThreatClassifier.from_config(cfg)
+            classified = classify_stage(clf, fused)
+            span.items = len(classified)
+        with timer.stage("score") as span:
+            incidents = score_stage(classified)
+            span.items = len(incidents)
+
+    with timer.stage("persist") as span:
+        if cm is None:
+            cm = CaseManager(
+                db_path=cfg.get("artifacts", {}).get("db_path", "artifacts/case_manager.db")
+            )
+        rows = [inc.as_dict() for inc in incidents]  # one dict view, shared below
+        cm.record_incidents(rows)
+        span.items = len(incidents)
+
+    with timer.stage("dispatch") as span:
+        notified = notify_stage(cfg, dispatcher or Dispatcher(cfg), incidents)
+        span.items = len(notified)
+    with timer.stage("evidence"):
+        record_evidence(cfg, events, rows)
+
+    # Predictive risk map
+    with timer.stage("risk") as span:
+        if risk_agg is None:
+            risk = predict_geofence_risk(cfg, rows)
+        else:
+            risk_agg.add(rows)
+            risk = risk_agg.write_csv(risk_map_path(cfg))
+        span.items = len(incidents)
+
+    result = {
+        "events": len(events),
+        "fused": len(fused),
+        "incidents": len(incidents),
+        "notified": notified,
+        "risk_geofences": risk,
+        "geofence_breaches": count_breaches(incidents),
+        "models": clf.versions(),
+    }
+    if cache is not None:
+        result["cache"] = {"hits": cache.hits, "misses": cache.misses}
+    if clf.cascade is not None:
+        result["cascade"] = dict(clf.tiers)
+    if clf.prefilter is not None:
+        result["prefiltered"] = clf.prefiltered
+    if TEXT_SCORES.hits or TEXT_SCORES.misses:
+        result["text_cache"] = TEXT_SCORES.stats()  # cumulative for the process
+    return timer.finish(cfg, result)
+
+
+def _cached_stages(
+    cfg: dict[str, Any],
+    events: list[Event],
+    clf: ThreatClassifier | None,
+    cache: StageCache,
+    timer: StageTimer,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[IncidentRecord], ThreatClassifier]:
+    """Fuse, classify and score through the stage cache; each key chains on the last."""
+    ids = [e.id for e in events]
+    models_dir = cfg.get("artifacts", {}).get("models_dir", "artifacts/models")
+    export_dir = cfg.get("nlp", {}).get("export_dir")
+    with timer.stage("fuse") as span:
+        batch = EventBatch.from_events(events)
+        fused, key = cache.run(
+            "fuse",
+            batch.content_digest(),
+            {"geofences": cfg.get("geofences", [])},
+            code_version(
+                "open_encroachment.fusion.fusion_engine", "open_encroachment.models.event_batch"
+            ),
+            ids,
+            lambda: fuse_stage(cfg, batch),
+        )
+        span.items = len(fused)
+    with timer.stage("classify") as span:
+        # Loading the classifier first makes sure trained models exist before they are keyed
+        model = clf or ThreatClassifier.from_config(cfg)
+        classified, key = cache.run(
+            "classify",
+            key,
+            {
+                "models": files_signature(models_dir),
+                "nlp": cfg.get("nlp", {}),
+                "export": files_signature(export_dir) if export_dir else [],
+                "versions": model.versions(),
+                "cascade": cfg.get("cascade", {}),
+                "lexicon": cfg.get("lexicon", {}),
+            },
+            code_version(
+                "open_encroachment.models.threat_classifier",
+                "open_encroachment.models.features",
+                "open_encroachment.nlp.nlp_engine",
+                "open_encroachment.nlp.exported",
+                "open_encroachment.nlp.score_cache",
+                "open_encroachment.nlp.lexicon",
+            ),
+            ids,
+            lambda: classify_stage(model, fused),
+        )
+        span.items = len(classified)
+    with timer.stage("score") as span:
+        rows, _ = cache.run(
+            "score",
+            key,
+            None,
+            code_version(
+                "open_encroachment.models.severity",
+                "open_encroachment.models.features",
+                "open_encroachment.models.records",
+            ),
+            ids,
+            lambda: [inc.as_dict() for inc in score_stage(classified)],
+        )
+        incidents = [IncidentRecord(**row) for row in rows]
+        span.items = len(incidents)
+    return fused, classified, incidents, model
+
+
+def validate_events(cfg: dict[str, Any], raw_events: list[dict[str, Any]]) -> list[Event]:
+    """Collapse duplicate posts and validate raw events, skipping invalid ones."""
+    dedup = cfg.get("ingestion", {}).get("dedup", {})
+    if dedup.get("enabled", True):
+        raw_events = suppress_duplicates(
+            raw_events,
+            window_s=float(dedup.get("window_s", 3600)),
+            threshold=float(dedup.get("threshold", 0.8)),
         )
-        raw_inc["severity"] = severity
+
+    # Validate the whole batch at once; on failure drop the offending items and retry
+    while True:
         try:
-            incidents.append(Incident(**raw_inc))
-        except ValueError as err:
-            print(f"Skipping invalid incident: {err}")
-            continue
+            return _EVENT_LIST.validate_python(raw_events)
+        except ValidationError as err:
+            bad: dict[int, list[str]] = {}
+            for e in err.errors():
+                bad.setdefault(int(e["loc"][0]), []).append(
+                    f"{'.'.join(map(str, e['loc'][1:]))}: {e['msg']}"
+                )
+            for i, msgs in bad.items():
+                raw = raw_events[i]
+                eid = raw.get("id") if isinstance(raw, dict) else None
+                print(f"Skipping invalid event {eid!r}: {'; '.join(msgs)}")
+            raw_events = [raw for i, raw in enumerate(raw_events) if i not in bad]
+
+
+def fuse_stage(
+    cfg: dict[str, Any],
+    events: Sequence[Event | dict[str, Any]] | EventBatch,
+    spill: bool = True,
+) -> list[dict[str, Any]]:
+    # Hand fusion a columnar batch; optionally spill it to memory-mapped .npy files
+    batch = events if isinstance(events, EventBatch) else EventBatch.from_events(events)
+    store_dir = cfg.get("artifacts", {}).get("event_store_dir")
+    run_dir = None
+    if spill and store_dir:
+        # A directory of its own, so concurrent runs never overwrite files the other maps
+        ensure_dir(store_dir)
+        run_dir = tempfile.mkdtemp(prefix="run_", dir=store_dir)
+        batch = batch.spill(run_dir)
+    try:
+        # Fused records stay plain dicts; only the location bounds of ``FusedEvent`` can fail
+        fused: list[dict[str, Any]] = []
+        for raw in fuse_events(batch, cfg):
+            lat, lon = raw["lat"], raw["lon"]
+            if (lat is not None and not -90 <= lat <= 90) or (
+                lon is not None and not -180 <= lon <= 180
+            ):
+                print(f"Skipping invalid fused event: location ({lat}, {lon}) out of bounds")
+                continue
+            fused.append(raw)
+        return fused
+    finally:
+        if run_dir is not None:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def classify_stage(clf: ThreatClassifier, fused: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return clf.classify(fused)
 
-    cm = CaseManager(db_path=cfg.get("artifacts", {}).get("db_path", "artifacts/case_manager.db"))
-    cm.record_incidents([inc.model_dump() for inc in incidents])  # Pass dicts to legacy method
 
-    # Notify
-    dispatcher = Dispatcher(cfg)
+def score_stage(raw_classified: list[dict[str, Any]]) -> list[IncidentRecord]:
+    """Compute severity for classified events and build incident records.
+
+    Events that would fail ``Incident`` validation are skipped one by one.
+    """
+    valid = []
+    for raw in raw_classified:
+        errors = classified_errors(raw)
+        if errors:
+            print(f"Skipping invalid incident {raw.get('id')!r}: {'; '.join(errors)}")
+        else:
+            valid.append(raw)
+    raw_classified = valid
+    sev = severity_scores(
+        np.array([r.get("threat_probability", 0.0) for r in raw_classified], dtype=np.float64),
+        FeatureMatrix.from_dicts([r.get("features", {}) for r in raw_classified]),
+        np.array([bool(r.get("in_geofence", False)) for r in raw_classified], dtype=bool),
+    )
+    columns = [sev[k].tolist() for k in ("environmental", "legal", "operational", "overall")]
+    return [
+        incident_record(
+            raw_inc,
+            {"environmental": env, "legal": legal, "operational": op, "overall": overall},
+        )
+        for raw_inc, env, legal, op, overall in zip(raw_classified, *columns, strict=True)
+    ]
+
+
+def notify_stage(
+    cfg: dict[str, Any], dispatcher: Dispatcher, incidents: list[IncidentRecord]
+) -> list[str]:
+    """Dispatch incidents at or above the notify threshold; return their ids."""
     th_notify = float(cfg.get("thresholds", {}).get("severity_notify_min", 0.6))
     notified: list[str] = []
     for inc in incidents:
-        if inc.severity.overall >= th_notify:
+        if inc.severity["overall"] >= th_notify:
             dispatcher.notify(
                 {
                     "id": inc.id,
@@ -91,13 +333,18 @@ def run_pipeline(config_path: str | None = None, use_sample_data: bool = False)
                         "geofence_id": inc.geofence_id,
                     },
                     "threat_probability": inc.threat_probability,
-                    "severity": inc.severity.model_dump(),
+                    "severity": dict(inc.severity),
                     "sources": inc.sources,
                 }
             )
             notified.append(inc.id)
+    return notified
 
-    # Evidence chain: add image artifacts if any
+
+def record_evidence(
+    cfg: dict[str, Any], events: list[Event], incidents: list[dict[str, Any]]
+) -> None:
+    """Evidence chain: add image artifacts if any"""
     evidence_files: list[str] = []
     for e in events:
         art = e.artifacts
@@ -105,27 +352,20 @@ def run_pipeline(config_path: str | None = None, use_sample_data: bool = False)
             evidence_files.append(art["image_path"])
     if evidence_files:
         for inc in incidents:
-            append_records(cfg, inc.model_dump(), evidence_files)
+            append_records(cfg, inc, evidence_files)
             break
 
-    # Predictive risk map
-    risk = predict_geofence_risk(cfg, [inc.model_dump() for inc in incidents])
 
-    # Geofence breach summary
-    breach_counts: dict[str, int] = {}
+def count_breaches(
+    incidents: list[IncidentRecord], counts: dict[str, int] | None = None
+) -> dict[str, int]:
+    """Geofence breach summary, optionally accumulated into ``counts``."""
+    breach_counts: dict[str, int] = {} if counts is None else counts
     for inc in incidents:
         if inc.in_geofence:
             key = inc.geofence_id or "unknown"
             breach_counts[key] = breach_counts.get(key, 0) + 1
-
-    return {
-        "events": len(events),
-        "fused": len(fused),
-        "incidents": len(incidents),
-        "notified": notified,
-        "risk_geofences": risk,
-        "geofence_breaches": breach_counts,
-    }
+    return breach_counts
 
 
 def _ensure_sample_data() -> None:
@@ -204,10 +444,7 @@ def _ensure_sample_data() -> None:
         img1 = img_dir / "sample1.png"
         if not img1.exists():
             img = Image.new("RGB", (64, 64), color=(200, 200, 200))
-            for i in range(64):
-                for j in range(64):
-                    if 20 < i < 44 and 20 < j < 44:
-                        img.putpixel((i, j), (90, 90, 90))
+            img.paste((90, 90, 90), (21, 21, 44, 44))
             img.save(img1)
 
     # GPS sample
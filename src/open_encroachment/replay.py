@@ -0,0 +1,222 @@
+"""Time-compressed replay of archived events for load testing (``open-encroachment replay``).
+
+:func:`capture` archives what the configured sources currently ingest as JSON lines.
+:func:`replay` feeds an archive through the resident micro-batch service
+(:class:`~open_encroachment.service.StreamService`) on a virtual clock: an event with
+timestamp ``ts`` arrives ``(ts - first_ts) / speed`` seconds after the start, so
+``speed=1`` replays in real time and ``speed=60`` plays an hour per minute.
+
+Each run reports:
+
+- dispatch latency: from the arrival of an incident's first event to the moment its
+  alert was handed to the dispatcher (p50/p95/p99/max)
+- backlog: events that have arrived but are not yet processed, sampled at every poll,
+  with its maximum and its growth rate over the run
+- offered rate (events/s the schedule demands) and achieved throughput
+
+A node that keeps up finishes shortly after the last event arrives and its backlog
+stays flat; one that does not falls further behind with every batch. The report's
+``sustained`` flag is set when throughput reached at least 90% of the offered rate
+(replay long enough schedules that draining the last batch is negligible). Sweeping
+``speed`` finds the highest sustainable rate.
+
+Replays write to their own workspace (``replay.workdir``) and dispatch to a local outbox
+there, so historical incidents never reach the case database or live webhooks.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import shutil
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from .comms.dispatcher import Dispatcher
+from .fusion.fusion_engine import fused_id
+from .service import StreamService
+
+
+def _epoch(s: Any) -> float:
+    try:
+        dt = datetime.fromisoformat(str(s).replace("Z", "+00:00"))
+    except Exception:
+        return float("nan")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def capture(cfg: dict[str, Any], path: str) -> int:
+    """Ingest all configured sources and write the raw events to ``path``; returns the count."""
+    from .ingestion.scheduler import ingest_all
+
+    events = ingest_all(cfg)
+    p = pathlib.Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8") as f:
+        for e in events:
+            f.write(json.dumps(e, default=str) + "\n")
+    return len(events)
+
+
+def load_archive(path: str) -> list[dict[str, Any]]:
+    """Archived events in timestamp order; events without a parseable timestamp are skipped."""
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                events.append(json.loads(line))
+    timed = [(t, e) for e in events if not np.isnan(t := _epoch(e.get("timestamp")))]
+    if len(timed) < len(events):
+        print(f"Skipping {len(events) - len(timed)} archived events without a timestamp")
+    timed.sort(key=lambda te: te[0])
+    return [e for _, e in timed]
+
+
+class _TimedDispatcher(Dispatcher):
+    """Dispatcher that records when each incident was handed over."""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        super().__init__(config)
+        self.sent_at: dict[str, float] = {}
+
+    def notify(self, incident: dict[str, Any]) -> None:
+        super().notify(incident)
+        self.sent_at[incident["id"]] = time.monotonic()
+
+
+class ReplayService(StreamService):
+    """A :class:`StreamService` whose source is an archive played on a virtual clock."""
+
+    def __init__(self, cfg: dict[str, Any], events: list[dict[str, Any]], speed: float) -> None:
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        super().__init__(cfg)
+        self.timed = _TimedDispatcher(self.cfg)
+        self.dispatcher = self.timed
+        self.events = events
+        t0 = _epoch(events[0]["timestamp"]) if events else 0.0
+        self.offsets = [(_epoch(e["timestamp"]) - t0) / speed for e in events]
+        self.next = 0
+        self.start: float | None = None
+        self.arrived: dict[str, float] = {}
+        self.backlog: list[tuple[float, int]] = []  # (seconds since start, backlog)
+        self.latencies: list[float] = []
+
+    def poll(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now
+        elapsed = now - self.start
+        i = self.next
+        while self.next < len(self.events) and self.offsets[self.next] <= elapsed:
+            self.next += 1
+        due = self.events[i : self.next]
+        for e, off in zip(due, self.offsets[i : self.next], strict=True):
+            self.arrived[e["id"]] = self.start + off
+        self.backlog.append((elapsed, len(self.pending) + len(due)))
+        if self.next == len(self.events):
+            self.stop.set()  # serve() drains what is pending and returns
+        return due
+
+    def commit(self) -> None:
+        pass
+
+    def flush(self) -> dict[str, Any]:
+        # Fused ids derive from the cluster's first (earliest) event
+        founders = {fused_id(e["id"]): e["id"] for e in self.pending}
+        summary = super().flush()
+        sent = self.timed.sent_at
+        self.latencies += [
+            sent[i] - self.arrived[founders[i]] for i in summary["notified"] if i in founders
+        ]
+        return summary
+
+
+def _replay_config(cfg: dict[str, Any], workdir: pathlib.Path) -> dict[str, Any]:
+    out = workdir / "out"
+    return {
+        **cfg,
+        "dispatch": {**cfg.get("dispatch", {}), "mode": "local", "outbox_dir": str(out / "outbox")},
+        "metrics": {"enabled": False, "log_path": None},
+        "cache": {**cfg.get("cache", {}), "enabled": False},
+        "service": {**cfg.get("service", {}), "index_path": str(out / "index.json")},
+        "artifacts": {
+            **cfg.get("artifacts", {}),
+            "predictions_dir": str(out / "predictions"),
+            "db_path": str(out / "case_manager.db"),
+            "evidence_ledger": str(out / "evidence_ledger.jsonl"),
+            "event_store_dir": None,
+        },
+    }
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"p50_s": 0.0, "p95_s": 0.0, "p99_s": 0.0, "max_s": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50_s": round(float(p50), 4),
+        "p95_s": round(float(p95), 4),
+        "p99_s": round(float(p99), 4),
+        "max_s": round(max(values), 4),
+    }
+
+
+def replay(
+    cfg: dict[str, Any],
+    events: list[dict[str, Any]],
+    speed: float = 1.0,
+    workdir: str | None = None,
+    interval: float | None = None,
+    max_events: int | None = None,
+) -> dict[str, Any]:
+    """Replay ``events`` (sorted by timestamp) at ``speed``x and report latency and backlog."""
+    rcfg = cfg.get("replay", {})
+    work = pathlib.Path(workdir or rcfg.get("workdir", "artifacts/replay"))
+    shutil.rmtree(work / "out", ignore_errors=True)
+    interval = float(interval if interval is not None else rcfg.get("interval_s", 1.0))
+    max_events = int(max_events if max_events is not None else rcfg.get("max_events", 1000))
+
+    svc = ReplayService(_replay_config(cfg, work), events, speed)
+    batches = incidents = notified = 0
+    t0 = time.monotonic()
+    for summary in svc.serve(interval, max_events, float(rcfg.get("poll_s", 0.05))):
+        batches += 1
+        incidents += summary["incidents"]
+        notified += len(summary["notified"])
+    wall = time.monotonic() - t0
+
+    span = svc.offsets[-1] if events else 0.0
+    samples = np.array(svc.backlog or [(0.0, 0)], dtype=np.float64)
+    growth = float(np.polyfit(samples[:, 0], samples[:, 1], 1)[0]) if len(samples) > 1 else 0.0
+    offered = len(events) / span if span > 0 else float("inf")
+    throughput = len(events) / wall if wall > 0 else float("inf")
+    return {
+        "speed": speed,
+        "events": len(events),
+        "schedule_s": round(span, 3),
+        "wall_s": round(wall, 3),
+        "offered_rate": round(offered, 1) if span > 0 else None,
+        "throughput": round(throughput, 1) if wall > 0 else None,
+        "batches": batches,
+        "incidents": incidents,
+        "notified": notified,
+        "dispatch_latency": _percentiles(svc.latencies),
+        "backlog": {"max": int(samples[:, 1].max()), "growth_per_s": round(growth, 2)},
+        "sustained": throughput >= 0.9 * offered,
+    }
+
+
+def sweep(
+    cfg: dict[str, Any], path: str, speeds: list[float], **kwargs: Any
+) -> Iterator[dict[str, Any]]:
+    """Replay the archive at ``path`` once per speed."""
+    events = load_archive(path)
+    for speed in speeds:
+        yield replay(cfg, events, speed, **kwargs)
@@ -0,0 +1,106 @@
+"""Long-running micro-batch pipeline service (``open-encroachment serve-stream``).
+
+The service loads everything a run needs once -- config, compiled geofences, the NLP
+model and classifier, a persistent SQLite connection and the dispatcher -- then keeps
+polling its local file sources (the directory watcher targets) and runs the pipeline on
+whatever arrived whenever ``interval_s`` has passed or ``max_events`` are pending.
+
+On SIGINT/SIGTERM it stops polling, finishes the batch in flight, processes the events
+already read, publishes pending online text-model updates and saves the watcher index
+before exiting. The index is only saved after a batch has been processed, so events
+read but not processed are read again on restart.
+"""
+
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from .analytics.predictive import RiskAggregator
+from .case_management.case_manager import CaseManager
+from .comms.dispatcher import Dispatcher
+from .ingestion.watcher import DirectoryWatcher
+from .models.threat_classifier import ThreatClassifier
+from .pipeline import prepare_dirs, process_events
+from .utils.geo import compile_geofences
+
+
+class StreamService:
+    def __init__(self, cfg: dict[str, Any]) -> None:
+        self.cfg = {**cfg, "geofences": compile_geofences(cfg.get("geofences", []))}
+        scfg = cfg.get("service", {})
+        arts = cfg.get("artifacts", {})
+        prepare_dirs(cfg)
+        self.clf = ThreatClassifier.from_config(cfg)
+        self.cm = CaseManager(
+            db_path=arts.get("db_path", "artifacts/case_manager.db"),
+            persistent=bool(scfg.get("persistent_db", True)),
+        )
+        self.dispatcher = Dispatcher(cfg)
+        self.risk = RiskAggregator()
+        self.watcher = DirectoryWatcher(
+            self.cfg, index_path=scfg.get("index_path", "artifacts/service_index.json")
+        )
+        self.pending: list[dict[str, Any]] = []
+        self.stop = threading.Event()
+
+    def install_signal_handlers(self) -> None:
+        """Request a graceful stop on SIGINT/SIGTERM (main thread only)."""
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda signum, frame: self.stop.set())
+
+    def poll(self) -> list[dict[str, Any]]:
+        """Events that arrived since the last poll; read again on restart until committed."""
+        return self.watcher.poll(save=False)
+
+    def commit(self) -> None:
+        """Record that every event polled so far has been processed."""
+        self.watcher.index.save()
+
+    def flush(self) -> dict[str, Any]:
+        """Run the pipeline on all pending events, then commit."""
+        batch, self.pending = self.pending, []
+        summary = process_events(
+            self.cfg,
+            batch,
+            clf=self.clf,
+            cm=self.cm,
+            dispatcher=self.dispatcher,
+            risk_agg=self.risk,
+        )
+        self.commit()
+        return {"new_events": len(batch), **summary}
+
+    def serve(
+        self,
+        interval: float | None = None,
+        max_events: int | None = None,
+        poll_s: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield one summary per micro-batch until :attr:`stop` is set, then drain."""
+        scfg = self.cfg.get("service", {})
+        interval = float(interval if interval is not None else scfg.get("interval_s", 10))
+        max_events = int(max_events if max_events is not None else scfg.get("max_events", 1000))
+        poll_s = float(poll_s if poll_s is not None else scfg.get("poll_s", 1.0))
+        last = time.monotonic()
+        try:
+            while not self.stop.is_set():
+                self.pending += self.poll()
+                now = time.monotonic()
+                if len(self.pending) >= max_events or now - last >= interval:
+                    last = now
+                    if self.pending:
+                        yield self.flush()
+                    continue
+                self.stop.wait(min(poll_s, max(0.0, last + interval - now)))
+            if self.pending:
+                yield self.flush()
+        finally:
+            # Online text-model updates below nlp.snapshot_every would be lost otherwise
+            snapshot = getattr(self.clf.nlp, "snapshot", None)
+            if snapshot is not None:
+                snapshot()
+            self.cm.close()
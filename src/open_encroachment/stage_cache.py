@@ -0,0 +1,143 @@
+"""Content-addressed cache for the fuse, classify and score stages.
+
+An entry's key hashes the stage name, the stage's input content, the config slice and
+artifacts it depends on, and the source code of the modules that implement it. Changing
+anything else -- notification thresholds, dispatch settings -- leaves the keys intact,
+so a rerun recomputes only the stages downstream of the change.
+
+Event ids are minted afresh on every ingestion, so cached outputs refer to raw events by
+position instead of id and are re-linked to the current ids on a hit (fused ids derive
+from the founding event id and are rebuilt with it). Entries are pickles under
+``cache.dir``; the least recently used are evicted once the total exceeds ``max_mb``.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import pickle
+import sys
+from collections.abc import Callable
+from typing import Any
+
+from . import __version__
+from .fusion.fusion_engine import fused_id
+
+
+@functools.cache
+def code_version(*modules: str) -> str:
+    """Hash of the package version and the source files of ``modules``."""
+    h = hashlib.blake2b(__version__.encode(), digest_size=16)
+    for name in modules:
+        path = getattr(sys.modules.get(name), "__file__", None)
+        if path:
+            h.update(pathlib.Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def files_signature(directory: str) -> list[tuple[str, int, int]]:
+    """(name, size, mtime_ns) of the files in ``directory``, e.g. trained models."""
+    p = pathlib.Path(directory)
+    if not p.is_dir():
+        return []
+    sig = []
+    for f in p.iterdir():
+        if f.is_file():
+            st = f.stat()
+            sig.append((f.name, st.st_size, st.st_mtime_ns))
+    return sorted(sig)
+
+
+def _encode(rows: list[dict[str, Any]], ids: list[str]) -> list[dict[str, Any]]:
+    pos = {eid: i for i, eid in enumerate(ids)}
+    return [
+        {
+            **{k: v for k, v in r.items() if k != "id"},
+            "raw_event_ids": [pos[e] for e in r["raw_event_ids"]],
+        }
+        for r in rows
+    ]
+
+
+def _decode(rows: list[dict[str, Any]], ids: list[str]) -> list[dict[str, Any]]:
+    out = []
+    for r in rows:
+        raw = [ids[i] for i in r["raw_event_ids"]]
+        out.append({"id": fused_id(raw[0]), **r, "raw_event_ids": raw})
+    return out
+
+
+class StageCache:
+    def __init__(self, directory: str = "artifacts/cache", max_bytes: int = 512 << 20) -> None:
+        self.dir = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> StageCache | None:
+        ccfg = cfg.get("cache", {})
+        if not ccfg.get("enabled", False):
+            return None
+        return cls(ccfg.get("dir", "artifacts/cache"), int(float(ccfg.get("max_mb", 512)) * 2**20))
+
+    def key(self, stage: str, inputs: Any, params: Any, code: str) -> str:
+        payload = json.dumps([stage, inputs, params, code], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.dir / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Any | None:
+        p = self._path(key)
+        try:
+            with p.open("rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        os.utime(p)  # mark as recently used
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, p)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = [(f.stat(), f) for f in self.dir.glob("*/*.pkl")]
+        total = sum(st.st_size for st, _ in entries)
+        for st, f in sorted(entries, key=lambda e: e[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            f.unlink(missing_ok=True)
+            total -= st.st_size
+
+    def run(
+        self,
+        stage: str,
+        inputs: Any,
+        params: Any,
+        code: str,
+        ids: list[str],
+        compute: Callable[[], list[dict[str, Any]]],
+    ) -> tuple[list[dict[str, Any]], str]:
+        """Return a stage's rows (which reference ``ids``) and its cache key.
+
+        The key identifies the output content, so it serves as the next stage's inputs.
+        """
+        key = self.key(stage, inputs, params, code)
+        encoded = self.get(key)
+        if encoded is not None:
+            self.hits += 1
+            return _decode(encoded, ids), key
+        self.misses += 1
+        rows = compute()
+        self.put(key, _encode(rows, ids))
+        return rows, key
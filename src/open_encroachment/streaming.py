@@ -0,0 +1,238 @@
+"""Streaming execution of the pipeline.
+
+Each stage runs in its own thread and hands micro-batches to the next one through a
+bounded queue::
+
+    ingest -> validate -> fuse -> classify -> score -> persist -> dispatch
+
+A full queue blocks its producer, so a slow stage throttles ingestion instead of letting
+batches pile up, and incidents are dispatched while sources are still being read. Only
+flat aggregates (counts, notified ids, per-geofence risk sums) outlive a batch.
+
+Fusion, deduplication and classification see one micro-batch at a time, so events that
+would cluster across a batch boundary are fused separately.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from .analytics.predictive import RiskAggregator, risk_map_path
+from .case_management.case_manager import CaseManager
+from .comms.dispatcher import Dispatcher
+from .evidence.chain_of_custody import append_records
+from .ingestion.scheduler import SOURCES, Source
+from .models.records import IncidentRecord
+from .models.threat_classifier import ThreatClassifier
+from .pipeline import (
+    classify_stage,
+    count_breaches,
+    fuse_stage,
+    notify_stage,
+    score_stage,
+    validate_events,
+)
+from .utils.metrics import StageTimer
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+
+class _Run:
+    """Shared stop flag and first error of a streaming run."""
+
+    def __init__(self) -> None:
+        self.stop = threading.Event()
+        self.error: BaseException | None = None
+
+    def fail(self, err: BaseException) -> None:
+        if self.error is None:
+            self.error = err
+        self.stop.set()
+
+    def put(self, q: queue.Queue[Any], item: Any) -> None:
+        """Block while ``q`` is full; drop the item once the run is stopping."""
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def get(self, q: queue.Queue[Any]) -> Any:
+        """Next item of ``q``, or ``_DONE`` once the run is stopping."""
+        while not self.stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+
+def _stage(
+    run: _Run,
+    fn: Callable[[Any], Any],
+    inbox: queue.Queue[Any],
+    outbox: queue.Queue[Any],
+    timer: StageTimer,
+    name: str,
+) -> None:
+    try:
+        while (item := run.get(inbox)) is not _DONE:
+            with timer.stage(name) as span:
+                out = fn(item)
+                span.items = len(out)
+            if out:
+                run.put(outbox, out)
+    except BaseException as err:
+        run.fail(err)
+    finally:
+        run.put(outbox, _DONE)
+
+
+def _ingest(
+    run: _Run,
+    cfg: dict[str, Any],
+    sources: Sequence[Source],
+    outbox: queue.Queue[Any],
+    timer: StageTimer,
+) -> None:
+    def pump(src: Source) -> None:
+        try:
+            batches = src.iter_batches(cfg)
+            while True:
+                with timer.stage(f"source:{src.name}") as span:
+                    batch = next(batches, None)
+                    span.items = len(batch or ())
+                if batch is None or run.stop.is_set():
+                    return
+                if batch:
+                    run.put(outbox, batch)
+        except Exception as err:
+            print(f"Ingestion source {src.name} failed: {err}")
+
+    try:
+        if cfg.get("ingestion", {}).get("concurrent", True):
+            threads = [
+                threading.Thread(target=pump, args=(src,), name=f"ingest-{src.name}", daemon=True)
+                for src in sources
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        else:
+            for src in sources:
+                pump(src)
+    finally:
+        run.put(outbox, _DONE)
+
+
+def run_streaming(cfg: dict[str, Any], sources: Sequence[Source] | None = None) -> dict[str, Any]:
+    """Run the pipeline as connected stages and return the same summary as batch mode.
+
+    Config: ``streaming.queue_size`` bounds every inter-stage queue (in batches, default
+    4). Batch size follows ``ingestion.chunk_size``. Sources run on one thread each
+    (``ingestion.concurrent``); ``source_timeout_s`` does not apply. With metrics
+    enabled, stage timings (per-thread CPU) accumulate over all micro-batches.
+    """
+    sources = list(SOURCES if sources is None else sources)
+    size = max(1, int(cfg.get("streaming", {}).get("queue_size", 4)))
+    arts = cfg.get("artifacts", {})
+    clf = ThreatClassifier.from_config(cfg)
+    cm = CaseManager(db_path=arts.get("db_path", "artifacts/case_manager.db"))
+    dispatcher = Dispatcher(cfg)
+    timer = StageTimer.from_config(cfg)
+
+    counts = {"events": 0, "fused": 0}
+    evidence_files: list[str] = []
+
+    def validate(raw: list[dict[str, Any]]) -> Any:
+        events = validate_events(cfg, raw)
+        counts["events"] += len(events)
+        evidence_files.extend(
+            e.artifacts["image_path"] for e in events if "image_path" in e.artifacts
+        )
+        return events
+
+    def fuse(events: Any) -> Any:
+        fused = fuse_stage(cfg, events, spill=False)
+        counts["fused"] += len(fused)
+        return fused
+
+    def persist(incidents: list[IncidentRecord]) -> list[IncidentRecord]:
+        cm.record_incidents([inc.as_dict() for inc in incidents])
+        return incidents
+
+    stages: list[tuple[str, Callable[[Any], Any]]] = [
+        ("validate", validate),
+        ("fuse", fuse),
+        ("classify", lambda fused: classify_stage(clf, fused)),
+        ("score", score_stage),
+        ("persist", persist),
+    ]
+    run = _Run()
+    queues: list[queue.Queue[Any]] = [queue.Queue(maxsize=size) for _ in range(len(stages) + 1)]
+    threads = [
+        threading.Thread(
+            target=_ingest, args=(run, cfg, sources, queues[0], timer), name="ingest", daemon=True
+        )
+    ]
+    for i, (name, fn) in enumerate(stages):
+        threads.append(
+            threading.Thread(
+                target=_stage,
+                args=(run, fn, queues[i], queues[i + 1], timer, name),
+                name=f"stage-{name}",
+                daemon=True,
+            )
+        )
+    for t in threads:
+        t.start()
+
+    # Dispatch runs on the calling thread
+    notified: list[str] = []
+    breaches: dict[str, int] = {}
+    risk = RiskAggregator()
+    n_incidents = 0
+    first: IncidentRecord | None = None
+    try:
+        while (incidents := run.get(queues[-1])) is not _DONE:
+            with timer.stage("dispatch") as span:
+                sent = notify_stage(cfg, dispatcher, incidents)
+                span.items = len(sent)
+            notified += sent
+            with timer.stage("risk") as span:
+                risk.add(inc.as_dict() for inc in incidents)
+                span.items = len(incidents)
+            count_breaches(incidents, breaches)
+            n_incidents += len(incidents)
+            if first is None:
+                first = incidents[0]
+    except BaseException as err:
+        run.fail(err)
+    finally:
+        for t in threads:
+            t.join()
+    if run.error is not None:
+        raise run.error
+
+    if evidence_files and first is not None:
+        with timer.stage("evidence"):
+            append_records(cfg, first.as_dict(), evidence_files)
+    result = {
+        "events": counts["events"],
+        "fused": counts["fused"],
+        "incidents": n_incidents,
+        "notified": notified,
+        "risk_geofences": risk.write_csv(risk_map_path(cfg)),
+        "geofence_breaches": breaches,
+        "models": clf.versions(),
+    }
+    if clf.cascade is not None:
+        result["cascade"] = dict(clf.tiers)
+    if clf.prefilter is not None:
+        result["prefiltered"] = clf.prefiltered
+    return timer.finish(cfg, result)
@@ -42,6 +42,22 @@ def point_in_polygon(lat: float, lon: float, polygon: Iterable[tuple[float, floa
     return inside
 
 
+def compile_geofences(geofences: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Pre-process geofences for repeated lookups: vertices as tuples plus a ``bbox``
+    (min_lat, min_lon, max_lat, max_lon) that rejects far-away points cheaply."""
+    compiled: list[dict[str, Any]] = []
+    for gf in geofences:
+        polygon = [(float(p[0]), float(p[1])) for p in gf.get("polygon", [])]
+        if not polygon:
+            continue
+        lats = [p[0] for p in polygon]
+        lons = [p[1] for p in polygon]
+        compiled.append(
+            {**gf, "polygon": polygon, "bbox": (min(lats), min(lons), max(lats), max(lons))}
+        )
+    return compiled
+
+
 def any_geofence_contains(
     lat: float, lon: float, geofences: list[dict[str, Any]]
 ) -> tuple[bool, str | None]:
@@ -50,6 +66,9 @@ def any_geofence_contains(
         polygon = gf.get("polygon", [])
         if not polygon:
             continue
+        bbox = gf.get("bbox")
+        if bbox is not None and not (bbox[0] <= lat <= bbox[2] and bbox[1] <= lon <= bbox[3]):
+            continue
         if point_in_polygon(lat, lon, polygon):
             return True, gf.get("id") or gf.get("name")
     return False, None
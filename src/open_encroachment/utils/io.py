@@ -5,6 +5,7 @@ import hashlib
 import hmac
 import os
 import pathlib
+from collections.abc import Iterator, Mapping, Sequence
 from typing import Any
 
 
@@ -24,6 +25,12 @@ def gen_id(prefix: str = "evt") -> str:
     return f"{prefix}_{uuid.uuid4().hex}"
 
 
+def gen_ids(prefix: str, n: int) -> list[str]:
+    """Bulk variant of :func:`gen_id`: ``n`` random 128-bit hex ids from one urandom call."""
+    raw = os.urandom(16 * n).hex()
+    return [f"{prefix}_{raw[i : i + 32]}" for i in range(0, 32 * n, 32)]
+
+
 def write_json(path: str | os.PathLike[str], data: Any) -> None:
     import json
 
@@ -51,6 +58,93 @@ def read_json(path: str | os.PathLike[str]) -> Any:
         return json.load(f)
 
 
+class _ByteRange:
+    """Read-only binary view of ``f`` from its current position up to ``end``."""
+
+    def __init__(self, f: Any, end: int | None) -> None:
+        self.f = f
+        self.end = end
+
+    def read(self, size: int = -1) -> bytes:
+        if self.end is not None:
+            left = max(0, self.end - self.f.tell())
+            size = left if size < 0 else min(size, left)
+        return bytes(self.f.read(size))
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.f.readline, b"")
+
+
+def iter_csv_chunks(
+    path: str | os.PathLike[str],
+    numeric: Sequence[str] = (),
+    chunksize: int = 100_000,
+    start: int = 0,
+    end: int | None = None,
+    defaults: Mapping[str, float] | None = None,
+    usecols: Sequence[str] | None = None,
+) -> Iterator[Any]:
+    """Yield pandas DataFrame chunks of a CSV file with ``numeric`` columns as float64.
+
+    Every other column is read as a string with missing values kept as ``""``. Numeric
+    columns are parsed by the C reader; a chunk where a column holds malformed values is
+    coerced with ``pd.to_numeric(errors="coerce")`` so those values become NaN instead of
+    aborting the read. Numeric columns absent from the file are all-NaN, and blank cells
+    are NaN too unless the column has an entry in ``defaults``: such columns read blank
+    cells (or their absence from the file) as the default, so NaN there means malformed.
+    ``usecols`` limits parsing to the named columns.
+
+    ``start``/``end`` restrict reading to a byte range of data rows (``start`` must be at a
+    line boundary; the header is always taken from the first line), which lets callers
+    consume rows appended since a previous read.
+    """
+    import numpy as np
+    import pandas as pd
+
+    try:
+        names = list(pd.read_csv(path, nrows=0).columns)
+    except pd.errors.EmptyDataError:
+        return
+    defaults = defaults or {}
+    header = names
+    if usecols is not None:
+        header = [c for c in names if c in usecols]
+        numeric = [c for c in numeric if c in usecols]
+    numeric_present = [c for c in numeric if c in header]
+    opts: dict[str, Any] = {
+        "usecols": header,
+        "dtype": {c: str for c in header if c not in numeric_present},
+        "keep_default_na": False,
+        "na_values": {c: [""] for c in numeric_present},
+        "chunksize": chunksize,
+    }
+    with open(path, "rb") as f:
+        header_end = len(f.readline())
+        if start <= header_end and end is None:
+            f.seek(0)
+            reader = pd.read_csv(f, **opts)
+        else:
+            f.seek(max(start, header_end))
+            rng = _ByteRange(f, end)
+            if not rng.read(1):
+                return
+            f.seek(max(start, header_end))
+            reader = pd.read_csv(rng, header=None, names=names, **opts)
+        for chunk in reader:
+            for col in numeric:
+                if col not in chunk.columns:
+                    chunk[col] = defaults.get(col, np.nan)
+                elif chunk[col].dtype == np.float64:
+                    if col in defaults:
+                        chunk[col] = chunk[col].fillna(defaults[col])
+                else:
+                    blank = chunk[col].isna()
+                    chunk[col] = pd.to_numeric(chunk[col], errors="coerce").astype(np.float64)
+                    if col in defaults:
+                        chunk.loc[blank, col] = defaults[col]
+            yield chunk
+
+
 def file_sha256(path: str | os.PathLike[str]) -> str:
     h = hashlib.sha256()
     with open(path, "rb") as f:
@@ -0,0 +1,153 @@
+"""Per-stage timing and resource instrumentation.
+
+A :class:`StageTimer` accumulates wall time, CPU time, item counts and the growth of the
+process's peak RSS per named stage. When disabled every hook is a no-op, so pipeline code
+can instrument unconditionally.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+
+from .io import append_jsonl, now_iso
+
+try:  # not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+
+def peak_rss_kb() -> int:
+    """High-water resident set size of this process in KiB (0 when unknown)."""
+    if resource is None:
+        return 0
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+class _Span:
+    """Mutable handle yielded by :meth:`StageTimer.stage`; set ``items`` when known."""
+
+    __slots__ = ("items",)
+
+    def __init__(self) -> None:
+        self.items = 0
+
+
+class StageTimer:
+    """Accumulates timings per stage name; repeated stages (micro-batches) add up.
+
+    CPU time is per thread by default, which is what a stage running on its own thread
+    (streaming mode, ingestion pools) costs; pass ``cpu_clock=time.process_time`` to
+    charge the whole process instead.
+    """
+
+    def __init__(
+        self, enabled: bool = True, cpu_clock: Callable[[], float] = time.thread_time
+    ) -> None:
+        self.enabled = enabled
+        self.cpu_clock = cpu_clock
+        self.stages: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any], **kwargs: Any) -> StageTimer:
+        return cls(enabled=bool(cfg.get("metrics", {}).get("enabled", False)), **kwargs)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[_Span]:
+        span = _Span()
+        if not self.enabled:
+            yield span
+            return
+        rss0 = peak_rss_kb()
+        wall0 = time.perf_counter()
+        cpu0 = self.cpu_clock()
+        try:
+            yield span
+        finally:
+            self.add(
+                name,
+                time.perf_counter() - wall0,
+                self.cpu_clock() - cpu0,
+                span.items,
+                peak_rss_kb() - rss0,
+            )
+
+    def add(self, name: str, wall_s: float, cpu_s: float, items: int, rss_kb: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            rec = self.stages.setdefault(
+                name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "items": 0, "rss_peak_delta_kb": 0}
+            )
+            rec["calls"] += 1
+            rec["wall_s"] += wall_s
+            rec["cpu_s"] += cpu_s
+            rec["items"] += items
+            rec["rss_peak_delta_kb"] += rss_kb
+
+    def report(self) -> dict[str, dict[str, float]]:
+        out: dict[str, dict[str, float]] = {}
+        for name, rec in self.stages.items():
+            wall = rec["wall_s"]
+            out[name] = {
+                **rec,
+                "wall_s": round(wall, 6),
+                "cpu_s": round(rec["cpu_s"], 6),
+                "items_per_s": round(rec["items"] / wall, 1) if wall > 0 else 0.0,
+            }
+        return out
+
+    def finish(self, cfg: dict[str, Any], result: dict[str, Any]) -> dict[str, Any]:
+        """Attach ``timings`` to ``result`` and append it to ``metrics.log_path`` if set."""
+        if not self.enabled:
+            return result
+        result["timings"] = self.report()
+        log_path = cfg.get("metrics", {}).get("log_path")
+        if log_path:
+            append_jsonl(log_path, {"ts": now_iso(), "timings": result["timings"]})
+        return result
+
+
+class TimedCall(NamedTuple):
+    result: Any
+    wall_s: float
+    cpu_s: float
+    rss_peak_delta_kb: int
+
+
+def timed_call(func: Callable[..., Any], *args: Any) -> TimedCall:
+    """Call ``func`` and return its result with its wall time, CPU time and RSS growth.
+
+    Module-level so it can run in a process pool worker.
+    """
+    rss0 = peak_rss_kb()
+    wall0 = time.perf_counter()
+    cpu0 = time.thread_time()
+    out = func(*args)
+    return TimedCall(
+        out, time.perf_counter() - wall0, time.thread_time() - cpu0, peak_rss_kb() - rss0
+    )
+
+
+TIMING_COLUMNS = ["calls", "items", "wall_s", "cpu_s", "items_per_s", "rss_peak_delta_kb"]
+
+
+def format_table(timings: dict[str, dict[str, float]], cols: list[str] = TIMING_COLUMNS) -> str:
+    """Render a ``timings`` mapping (or any per-stage mapping) as a fixed-width table."""
+    width = max([len("stage"), *(len(n) for n in timings)])
+    widths = [max(len(c), 10) for c in cols]
+    lines = [
+        f"{'stage':<{width}}  " + "  ".join(f"{c:>{w}}" for c, w in zip(cols, widths, strict=True))
+    ]
+    for name, rec in timings.items():
+        cells = []
+        for c, w in zip(cols, widths, strict=True):
+            v = rec.get(c, 0)
+            cells.append(f"{v:>{w}.3f}" if isinstance(v, float) else f"{v:>{w}}")
+        lines.append(f"{name:<{width}}  " + "  ".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,21 @@
+import pytest
+
+
+class _CountingNLP:
+    """Text model wrapper counting the event groups sent to it for scoring."""
+
+    version = None
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.groups = 0
+
+    def threat_scores(self, groups):
+        self.groups += len(groups)
+        return self.nlp.threat_scores(groups)
+
+
+@pytest.fixture
+def counting_nlp():
+    """Wrap a text model so a test can count the event groups it scores."""
+    return _CountingNLP
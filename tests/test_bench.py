@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from open_encroachment.bench import Workload, compare, generate_workload, run_bench
+from open_encroachment.config import DEFAULT_CONFIG
+
+TINY = Workload(
+    sensors=5, readings=4, devices=3, fixes=4, posts=30, tiles=2, tile_size=32, geofences=2
+)
+
+
+def test_workload_is_reproducible(tmp_path):
+    start = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    gf_a = generate_workload(tmp_path / "a", TINY, start)
+    gf_b = generate_workload(tmp_path / "b", TINY, start)
+    assert gf_a == gf_b and len(gf_a[0]["polygon"]) == TINY.vertices
+    for rel in ("ground/ground_sensors.csv", "gps/gps_events.csv", "social/sample_social.csv"):
+        assert (tmp_path / "a" / rel).read_bytes() == (tmp_path / "b" / rel).read_bytes()
+    assert len((tmp_path / "a" / "social/sample_social.csv").read_text().splitlines()) == 31
+
+
+def test_bench_reports_stages_and_flags_regressions(tmp_path):
+    report = run_bench(DEFAULT_CONFIG, TINY, workdir=tmp_path, repeat=2, warmup=0)
+    assert report["runs"] == 2
+    assert report["total"]["events"] > 0
+    assert {"ingest", "fuse", "classify", "score"} <= set(report["stages"])
+    assert (tmp_path / "out" / "case_manager.db").exists()
+
+    assert compare(report, report) == []
+    slower = {
+        "total": {"p50_s": report["total"]["p50_s"] * 2},
+        "stages": {name: {**rec, "p50_s": 1.0} for name, rec in report["stages"].items()},
+    }
+    baseline = {"total": report["total"], "stages": {"fuse": {"p50_s": 0.5}}}
+    regressions = compare(slower, baseline, tolerance=0.25, floor_s=0.0)
+    assert {r["stage"] for r in regressions} == {"total", "fuse"}
@@ -0,0 +1,43 @@
+import numpy as np
+
+from open_encroachment.bench import synthetic_incidents
+from open_encroachment.models.threat_classifier import ThreatClassifier
+
+
+def test_cascade_scores_only_uncertain_events(tmp_path, counting_nlp):
+    rows = synthetic_incidents(3000, seed=5)
+    texts = ["Illegal dumping spotted near river", "Great weather for a hike today"]
+    events = [
+        {
+            "id": f"fused_{i}",
+            "timestamp": "2026-01-01T00:00:00+00:00",
+            "in_geofence": r["in_geofence"],
+            "features": r["features"],
+            "texts": [texts[i % 2]] if i % 3 == 0 else [],
+        }
+        for i, r in enumerate(rows)
+    ]
+    full = ThreatClassifier(model_dir=str(tmp_path))
+    nlp = counting_nlp(full.nlp)
+    cascade = ThreatClassifier(model_dir=str(tmp_path), nlp=nlp, cascade=(0.15, 0.4))
+    expected = full.classify(events)
+    want = np.array([r["threat_probability"] for r in expected])
+    results = cascade.classify(events)
+    got = np.array([r["threat_probability"] for r in results])
+
+    tiers = cascade.tiers
+    assert sum(tiers.values()) == len(events) and nlp.groups == tiers["scored"]
+    assert tiers["benign"] > 0 and tiers["severe"] > 0 and tiers["scored"] < len(events)
+    # Early exits land on the same side of the band as full scoring would
+    assert ((want < 0.15) == (got < 0.15)).all() and ((want > 0.4) == (got > 0.4)).all()
+    same = (got >= 0.15) & (got <= 0.4)
+    np.testing.assert_allclose(got[same], want[same])
+    # Early exits with texts record no text score rather than a made-up 0.0
+    unscored = [r["text_threat"] is None for r in results]
+    assert any(unscored) and all(events[i]["texts"] for i, u in enumerate(unscored) if u)
+    assert all(
+        r["text_threat"] == w["text_threat"]
+        for r, w in zip(results, expected, strict=True)
+        if r["text_threat"] is not None
+    )
+    assert full.cascade is None and full.tiers["scored"] == 0
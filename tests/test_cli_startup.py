@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+# Cold-start budget for lightweight commands, as cumulative `-X importtime` microseconds
+# of open_encroachment.cli. Loose enough for slow CI machines; importing the pipeline
+# stack (numpy, pandas, sklearn, PIL) takes several times longer.
+BUDGET_US = int(os.environ.get("OPEN_ENCROACHMENT_IMPORT_BUDGET_US", 400_000))
+HEAVY = ("numpy", "pandas", "sklearn", "PIL", "pydantic", "joblib")
+
+
+def _importtime(code: str) -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cum, name = line[len("import time:") :].split("|")
+            if cum.strip().isdigit():
+                cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+def test_case_and_evidence_commands_skip_heavy_imports(tmp_path):
+    cfg = tmp_path / "settings.yaml"
+    cfg.write_text(
+        f"artifacts:\n  db_path: {tmp_path / 'cases.db'}\n"
+        f"  evidence_ledger: {tmp_path / 'ledger.jsonl'}\n"
+    )
+    code = (
+        "from open_encroachment.cli import main\n"
+        f"main(['--config', {str(cfg)!r}, 'case', 'list'])\n"
+        f"main(['--config', {str(cfg)!r}, 'evidence'])\n"
+    )
+    loaded = _importtime(code)
+    assert [m for m in HEAVY if m in loaded] == []
+    assert loaded["open_encroachment.cli"] < BUDGET_US
+
+
+def test_api_import_defers_pipeline_and_agent():
+    loaded = _importtime("import open_encroachment.api")
+    assert "open_encroachment.pipeline" not in loaded
+    assert "open_encroachment.agents.agent" not in loaded
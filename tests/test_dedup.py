@@ -0,0 +1,81 @@
+from open_encroachment.fusion.fusion_engine import MAX_DISTANCE_M
+from open_encroachment.ingestion.dedup import normalize_text, suppress_duplicates
+
+
+def _post(i, text, ts="2025-01-01T12:00:00+00:00"):
+    return {"id": f"soc_{i}", "source": "twitter", "timestamp": ts, "features": {"text": text}}
+
+
+def test_normalize_strips_retweet_noise():
+    assert normalize_text("RT @ranger: Illegal dumping!! https://t.co/x") == "illegal dumping"
+
+
+def test_exact_and_near_duplicates_collapse_to_first_post():
+    events = [
+        _post(0, "Illegal dumping spotted near the river bank this morning"),
+        {"id": "gnd_0", "source": "ground_sensor", "timestamp": "t", "features": {"pm25_z": 1.0}},
+        _post(
+            1,
+            "RT @a: Illegal dumping spotted near the river bank this morning",
+            "2025-01-01T12:01:00+00:00",
+        ),
+        _post(
+            2,
+            "Illegal dumping spotted near the river bank this morning!",
+            "2025-01-01T12:02:00+00:00",
+        ),
+        _post(
+            3,
+            "Illegal dumping spotted near the river bank this morning http://x.co",
+            "2025-01-01T12:03:00+00:00",
+        ),
+        _post(4, "Great weather for a hike today", "2025-01-01T12:04:00+00:00"),
+    ]
+    out = suppress_duplicates(events)
+    assert [e["id"] for e in out] == ["soc_0", "gnd_0", "soc_4"]
+    assert out[0]["features"]["repost_count"] == 3
+    assert out[2]["features"]["repost_count"] == 0
+    assert "repost_count" not in events[0]["features"]  # input not mutated
+
+
+def test_near_duplicate_with_small_edit():
+    a = "Unauthorized excavation reported inside the protected forest near the north gate"
+    b = "Unauthorized excavation reported inside the protected forest near north gate"
+    out = suppress_duplicates([_post(0, a), _post(1, b)], threshold=0.7)
+    assert len(out) == 1
+
+
+def test_duplicates_outside_window_are_kept():
+    events = [
+        _post(0, "Pipeline tampering reported by locals", "2025-01-01T00:00:00+00:00"),
+        _post(1, "Pipeline tampering reported by locals", "2025-01-01T05:00:00+00:00"),
+    ]
+    assert len(suppress_duplicates(events, window_s=3600)) == 2
+
+
+def test_same_text_at_distant_sites_is_kept():
+    text = "Fence cut at north gate"
+    sites = [(37.3400, -122.0150), (37.3401, -122.0151), (37.5000, -122.3000), (None, None)]
+    events = [
+        {**_post(i, text, f"2025-01-01T12:0{i}:00+00:00"), "lat": lat, "lon": lon}
+        for i, (lat, lon) in enumerate(sites)
+    ]
+    out = suppress_duplicates(events)
+    # Only the post ~15 m from the first is a repost; the distant and unlocated ones stay
+    assert [e["id"] for e in out] == ["soc_0", "soc_2", "soc_3"]
+    assert out[0]["features"]["repost_count"] == 1
+
+
+def test_same_text_a_few_metres_apart_is_a_repost_across_grid_lines():
+    text = "Fence cut at north gate"
+    # Straddle a multiple of the fusion radius in latitude and longitude (~2 m apart)
+    edge = 700 * MAX_DISTANCE_M / 111_320.0
+    events = [
+        {**_post(i, text, f"2025-01-01T12:0{i}:00+00:00"), "lat": edge + d, "lon": -edge - d}
+        for i, d in enumerate((-0.00001, 0.00001))
+    ]
+    out = suppress_duplicates(events)
+    assert [e["id"] for e in out] == ["soc_0"] and out[0]["features"]["repost_count"] == 1
+    # Also via LSH, for a near-duplicate rather than an identical text
+    events[1]["features"] = {"text": text + "!!! now"}
+    assert len(suppress_duplicates(events, threshold=0.5)) == 1
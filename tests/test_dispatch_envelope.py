@@ -3,7 +3,8 @@ import json
 from open_encroachment.comms.dispatcher import Dispatcher
 
 
-def test_dispatcher_envelope_matches_schema(tmp_path):
+def test_dispatcher_envelope_matches_schema(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the signing key is created under the working dir
     cfg = {"dispatch": {"mode": "local", "outbox_dir": str(tmp_path)}}
     disp = Dispatcher(cfg)
     incident = {
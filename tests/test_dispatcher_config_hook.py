@@ -3,7 +3,8 @@ import json
 from open_encroachment.comms.dispatcher import Dispatcher
 
 
-def test_dispatcher_reads_external_yaml(tmp_path):
+def test_dispatcher_reads_external_yaml(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the signing key is created under the working dir
     # Create external dispatcher config YAML
     dcfg = {
         "mode": "webhook",
@@ -0,0 +1,125 @@
+import pathlib
+
+import numpy as np
+import pytest
+
+from open_encroachment.fusion.fusion_engine import fuse_events
+from open_encroachment.models.event_batch import EventBatch
+from open_encroachment.models.schemas import Event
+
+
+def _events():
+    return [
+        Event(
+            id="gnd_1",
+            source="ground_sensor",
+            timestamp="2025-01-01T12:00:00+00:00",
+            lat=37.341,
+            lon=-122.017,
+            features={"pm25_z": 1.5, "noise_db_z": -0.25},
+            artifacts={"row": {"pm25": 55}},
+        ),
+        Event(
+            id="soc_1",
+            source="twitter",
+            timestamp="2025-01-01T12:02:00+00:00",
+            lat=37.3412,
+            lon=-122.0171,
+            features={"text": "Illegal dumping spotted near river"},
+            artifacts={},
+        ),
+        Event(
+            id="sat_1",
+            source="satellite",
+            timestamp="2025-01-01T12:05:00+00:00",
+            features={"img_edge_strength": 0.3},
+            artifacts={"image_path": "data/satellite/sample1.png"},
+        ),
+        Event(
+            id="gps_1",
+            source="gps",
+            timestamp="2025-01-02T00:00:00+00:00",
+            lat=10.0,
+            lon=10.0,
+            features={},
+            artifacts={},
+        ),
+    ]
+
+
+def _strip_ids(fused):
+    return [{k: v for k, v in f.items() if k != "id"} for f in fused]
+
+
+def test_round_trip_and_spill(tmp_path):
+    events = _events()
+    batch = EventBatch.from_events(events)
+    assert len(batch) == 4
+    assert batch.sources == ["ground_sensor", "twitter", "satellite", "gps"]
+    assert np.isnan(batch.lat[2])
+
+    mapped = batch.spill(tmp_path / "events")
+    assert isinstance(mapped.features, np.memmap)
+    back = mapped.to_events()
+    for orig, got in zip(events, back, strict=True):
+        assert got.id == orig.id
+        assert got.source == orig.source
+        assert got.lat == orig.lat
+        assert got.features == orig.features
+    assert back[2].artifacts == {"image_path": "data/satellite/sample1.png"}
+
+
+def test_concat_merges_tables():
+    events = _events()
+    merged = EventBatch.concat(
+        [EventBatch.from_events(events[:2]), EventBatch.from_events(events[2:])]
+    )
+    whole = EventBatch.from_events(events)
+    assert [merged.event_dict(i) for i in range(4)] == [whole.event_dict(i) for i in range(4)]
+
+
+def test_fuse_batch_matches_dict_path():
+    cfg = {
+        "geofences": [
+            {
+                "id": "gf",
+                "polygon": [[37.3, -122.1], [37.3, -122.0], [37.4, -122.0], [37.4, -122.1]],
+            }
+        ]
+    }
+    events = _events()
+    from_dicts = fuse_events(events, cfg)
+    from_batch = fuse_events(EventBatch.from_events(events), cfg)
+    assert len(from_dicts) == 2
+    a, b = _strip_ids(from_dicts), _strip_ids(from_batch)
+    for x, y in zip(a, b, strict=True):
+        assert x["features"] == pytest.approx(y["features"])
+        x.pop("features"), y.pop("features")
+    assert a == b
+    assert from_batch[0]["in_geofence"] is True
+    assert from_batch[0]["texts"] == ["Illegal dumping spotted near river"]
+
+
+def test_concurrent_runs_spill_to_their_own_directories(tmp_path, monkeypatch):
+    from open_encroachment import pipeline
+
+    store = tmp_path / "events"
+    cfg = {"artifacts": {"event_store_dir": str(store)}}
+    events = _events()
+    spilled = []
+    fuse = pipeline.fuse_events
+
+    def fuse_while_another_run_spills(batch, cfg):
+        spilled.append(pathlib.Path(batch.features.filename).parent)
+        if len(spilled) == 1:
+            pipeline.fuse_stage(cfg, events[2:])  # e.g. the API during a service batch
+        return fuse(batch, cfg)
+
+    monkeypatch.setattr(pipeline, "fuse_events", fuse_while_another_run_spills)
+    got = pipeline.fuse_stage(cfg, events)
+    want = fuse_events(events, cfg)
+    assert [(f["lat"], f["lon"], f["texts"]) for f in got] == [
+        (f["lat"], f["lon"], f["texts"]) for f in want
+    ]
+    assert len(set(spilled)) == 2 and all(d.parent == store for d in spilled)
+    assert list(store.iterdir()) == []  # removed once fusion is done
@@ -0,0 +1,92 @@
+import numpy as np
+
+from open_encroachment.bench import synthetic_incidents
+from open_encroachment.case_management.case_manager import CaseManager
+from open_encroachment.config import DEFAULT_CONFIG
+from open_encroachment.models.features import MODEL_COLUMNS, FeatureMatrix, design_matrix
+from open_encroachment.models.registry import REGISTRY
+from open_encroachment.models.threat_classifier import ThreatClassifier, baseline_probabilities
+from open_encroachment.models.training import train_fused_classifier, training_set
+
+
+class _CountingEstimator:
+    def __init__(self, estimator):
+        self.estimator = estimator
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        return self.estimator.predict_proba(X)
+
+
+def test_train_from_case_outcomes_and_classify(tmp_path):
+    models = tmp_path / "models"
+    cfg = {
+        **DEFAULT_CONFIG,
+        "artifacts": {"models_dir": str(models), "db_path": str(tmp_path / "cases.db")},
+        "training": {**DEFAULT_CONFIG["training"], "min_samples": 50},
+    }
+    incidents = [{"id": f"fused_{i}", **r} for i, r in enumerate(synthetic_incidents(200, 1))]
+    cm = CaseManager(db_path=cfg["artifacts"]["db_path"])
+    cm.record_incidents(incidents)
+
+    clf = ThreatClassifier.from_config(cfg)
+    assert clf.model is None  # no model yet: heuristic
+    events = [
+        {"id": inc["id"], "timestamp": "2026-01-01T00:00:00+00:00", **inc} for inc in incidents
+    ]
+    heuristic = [r["threat_probability"] for r in clf.classify(events)]
+
+    # Only closed cases label an incident; a later case supersedes an earlier one
+    for inc in incidents[:100]:
+        case = cm.create_case(inc["id"])
+        threat = inc["features"].get("ground_sensor_vibration_z", 0.0) > 0.5
+        cm.update_case_status(case, "confirmed" if threat else "false_positive")
+    cm.create_case(incidents[100]["id"])
+    relabel = cm.create_case(incidents[0]["id"])
+    cm.update_case_status(relabel, "open")
+    labeled = cm.labeled_incidents(["confirmed"], ["false_positive"])
+    assert len(labeled) == 99 and {r["label"] for r in labeled} == {0, 1}
+
+    summary = train_fused_classifier(cfg)
+    assert summary["samples"] == 99 and summary["train_accuracy"] > 0.8
+
+    clf = ThreatClassifier.from_config(cfg)
+    assert clf.model["columns"] == list(MODEL_COLUMNS)
+    clf.model = {**clf.model, "estimator": _CountingEstimator(clf.model["estimator"])}
+    probs = np.array([r["threat_probability"] for r in clf.classify(events)])
+    assert clf.model["estimator"].calls == 1
+    assert not np.allclose(probs, heuristic) and ((probs >= 0) & (probs <= 1)).all()
+    REGISTRY.clear()
+
+
+def test_design_matrix_follows_saved_columns():
+    fm = FeatureMatrix.from_dicts([{"img_texture": 2.0, "ground_sensor_pm25_z": -1.0}, {}])
+    text, in_gf = np.array([0.3, 0.0]), np.array([True, False])
+    full = design_matrix(fm, text, in_gf)
+    assert full.shape == (2, len(MODEL_COLUMNS))
+    # A model saved with another column order, or a column this version dropped
+    cols = ["text_threat", "column_from_the_future", "img_texture", "img_texture_present"]
+    X = design_matrix(fm, text, in_gf, cols)
+    np.testing.assert_allclose(X, [[0.3, 0.0, 2.0, 1.0], [0.0, 0.0, 0.0, 0.0]])
+    assert baseline_probabilities(fm, text, in_gf).shape == (2,)
+
+
+def test_incidents_without_a_text_score_are_not_trained_on(tmp_path):
+    cm = CaseManager(db_path=str(tmp_path / "cases.db"))
+    base = {"timestamp": "2026-01-01T00:00:00+00:00", "in_geofence": True, "features": {}}
+    cm.record_incidents(
+        [
+            {**base, "id": "scored", "threat_probability": 0.9, "text_threat": 0.8},
+            # Decided early by the cascade: its texts were never scored
+            {**base, "id": "early", "threat_probability": 0.9, "text_threat": None},
+        ]
+    )
+    for iid in ("scored", "early"):
+        cm.update_case_status(cm.create_case(iid), "confirmed")
+    rows = cm.labeled_incidents(["confirmed"], ["false_positive"])
+    assert sorted((r["id"], r["text_threat"]) for r in rows) == [("early", None), ("scored", 0.8)]
+    X, y = training_set(rows)
+    assert len(X) == len(y) == 1
+    assert X[0, MODEL_COLUMNS.index("text_threat")] == 0.8
+    cm.close()
@@ -0,0 +1,78 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from open_encroachment.incremental import run_incremental
+
+HEADER = "timestamp,lat,lon,pm25,noise_db,vibration,temp_c\n"
+
+
+def _row(t, lat, pm25):
+    return f"{t.isoformat()},{lat},-122.01,{pm25},40,0.1,20\n"
+
+
+def test_incremental_runs_update_by_delta(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the dispatcher's signing key lives under the working dir
+    ground = tmp_path / "ground.csv"
+    t0 = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=1)
+    ground.write_text(HEADER + _row(t0, 37.34, 10) + _row(t0 + timedelta(minutes=1), 37.34, 30))
+    cfg = {
+        "watch": {"targets": [{"source": "ground_sensors", "path": str(ground)}]},
+        "incremental": {"state_dir": str(tmp_path / "state")},
+        "artifacts": {
+            "models_dir": str(tmp_path / "models"),
+            "predictions_dir": str(tmp_path / "pred"),
+            "db_path": str(tmp_path / "cases.db"),
+            "evidence_ledger": str(tmp_path / "evidence_ledger.jsonl"),
+        },
+        "dispatch": {"outbox_dir": str(tmp_path / "outbox")},
+    }
+
+    first = run_incremental(cfg)
+    assert (first["events"], first["incidents"], first["open_clusters"]) == (2, 1, 1)
+
+    # A late member of the same cluster updates the incident instead of adding one
+    with ground.open("a") as f:
+        f.write(_row(t0 + timedelta(minutes=5), 37.34, 50))
+    second = run_incremental(cfg)
+    assert (second["events"], second["incidents"]) == (1, 1)
+    assert second["risk_geofences"][0]["count"] == 1
+
+    # Far later data opens a new cluster; the replayed one is re-scored once more, then closes
+    with ground.open("a") as f:
+        f.write(_row(t0 + timedelta(hours=2), 38.0, 20))
+    third = run_incremental(cfg)
+    assert (third["events"], third["incidents"], third["open_clusters"]) == (1, 2, 1)
+    assert third["risk_geofences"][0]["count"] == 2
+
+    assert run_incremental(cfg)["events"] == 0
+    con = sqlite3.connect(cfg["artifacts"]["db_path"])
+    assert con.execute("SELECT COUNT(*) FROM incidents").fetchone()[0] == 2
+
+
+def test_late_earlier_event_keeps_the_open_incident_id(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the dispatcher's signing key lives under the working dir
+    ground = tmp_path / "ground.csv"
+    t0 = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=1)
+    ground.write_text(HEADER + _row(t0 + timedelta(minutes=2), 37.34, 10))
+    cfg = {
+        "watch": {"targets": [{"source": "ground_sensors", "path": str(ground)}]},
+        "incremental": {"state_dir": str(tmp_path / "state")},
+        "artifacts": {
+            "models_dir": str(tmp_path / "models"),
+            "predictions_dir": str(tmp_path / "pred"),
+            "db_path": str(tmp_path / "cases.db"),
+            "evidence_ledger": str(tmp_path / "evidence_ledger.jsonl"),
+        },
+        "dispatch": {"outbox_dir": str(tmp_path / "outbox")},
+    }
+    run_incremental(cfg)
+    con = sqlite3.connect(cfg["artifacts"]["db_path"])
+    (first_id,) = con.execute("SELECT id FROM incidents").fetchone()
+
+    # Delivered late, but timestamped before the cluster's founder
+    with ground.open("a") as f:
+        f.write(_row(t0, 37.34, 50))
+    second = run_incremental(cfg)
+    assert (second["events"], second["incidents"], second["open_clusters"]) == (1, 1, 1)
+    assert con.execute("SELECT id FROM incidents").fetchall() == [(first_id,)]
+    assert second["risk_geofences"][0]["count"] == 1
@@ -0,0 +1,80 @@
+import csv
+
+import pytest
+
+from open_encroachment.gps.tracking import ingest_tracks
+from open_encroachment.ingestion import ground_sensors, social_media
+
+
+def _write(path, header, rows):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+def test_ground_sensors_chunked_zscores_match_single_pass(tmp_path):
+    path = tmp_path / "ground.csv"
+    header = ["timestamp", "lat", "lon", "pm25", "noise_db", "vibration", "temp_c"]
+    rows = [
+        ["2025-01-01T12:00:00+00:00", 37.3 + i * 0.001, -122.0, 10 + i, 40 + 2 * i, 0.1 * i, 20]
+        for i in range(25)
+    ]
+    rows.append(["2025-01-01T12:00:00+00:00", "not-a-lat", -122.0, 1, 1, 1, 1])
+    rows.append(["2025-01-01T12:00:00+00:00", 37.3, -122.0, 1, "bad", 1, 1])
+    rows.append(["", 37.3, -122.0, "", 45, 0.5, 21])
+    _write(path, header, rows)
+
+    whole = ground_sensors.ingest({}, str(path))
+    chunked = [e for b in ground_sensors.iter_events({}, str(path), chunk_size=4) for e in b]
+    assert len(whole) == len(chunked) == 26  # unparseable location or metric dropped
+    for a, b in zip(whole, chunked, strict=True):
+        for k, v in a["features"].items():
+            assert b["features"][k] == pytest.approx(v)
+    # A blank metric is treated as zero; blank timestamp falls back to now
+    last = whole[-1]
+    assert last["artifacts"]["row"]["pm25"] == 0.0
+    assert last["artifacts"]["row"]["noise_db"] == 45.0
+    assert last["timestamp"]
+    assert all(e["artifacts"]["row"]["pm25"] != 1 for e in whole)
+
+
+def test_ground_sensors_missing_metric_column_counts_as_zero(tmp_path):
+    path = tmp_path / "ground.csv"
+    rows = [["2025-01-01T12:00:00+00:00", 37.3, -122.0, i, 40, 0.1] for i in range(3)]
+    _write(path, ["timestamp", "lat", "lon", "pm25", "noise_db", "vibration"], rows)
+
+    events = ground_sensors.ingest({}, str(path))
+    assert len(events) == 3
+    assert [e["artifacts"]["row"]["temp_c"] for e in events] == [0.0, 0.0, 0.0]
+    assert events[0]["features"]["temp_c_z"] == 0.0
+
+
+def test_social_and_gps_coerce_bad_coordinates(tmp_path):
+    social = tmp_path / "social.csv"
+    _write(
+        social,
+        ["timestamp", "source", "text", "lat", "lon"],
+        [
+            ["2025-01-01T12:00:00+00:00", "", " Dumping by river ", "37.1", "-122.1"],
+            ["2025-01-01T12:01:00+00:00", "news", "Nice day", "abc", "-122.1"],
+        ],
+    )
+    events = social_media.ingest({}, str(social))
+    assert [e["source"] for e in events] == ["social", "news"]
+    assert events[0]["features"]["text"] == "Dumping by river"
+    assert (events[0]["lat"], events[0]["lon"]) == (37.1, -122.1)
+    assert (events[1]["lat"], events[1]["lon"]) == (None, None)
+
+    gps = tmp_path / "gps.csv"
+    _write(gps, ["timestamp", "lat", "lon"], [["t1", "37.2", "-122.2"], ["t2", "", "-122.2"]])
+    tracks = ingest_tracks(str(gps))
+    assert len(tracks) == 1
+    assert tracks[0]["lat"] == 37.2
+
+
+def test_empty_csv_yields_nothing(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("", encoding="utf-8")
+    assert ground_sensors.ingest({}, str(path)) == []
+    assert social_media.ingest({}, str(path)) == []
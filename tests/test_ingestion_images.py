@@ -0,0 +1,18 @@
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+from PIL import Image
+
+from open_encroachment.ingestion import aerial, satellite
+
+
+def test_image_events_are_timestamped_with_the_file_mtime(tmp_path):
+    taken = datetime(2025, 6, 1, 8, 30, tzinfo=timezone.utc)
+    path = tmp_path / "tile.png"
+    Image.fromarray(np.zeros((8, 8), dtype=np.uint8)).save(path)
+    os.utime(path, (taken.timestamp(), taken.timestamp()))
+    for source in (satellite, aerial):
+        # Re-ingesting the same file yields the same event time (stage cache, replays)
+        first, again = source.ingest_paths({}, [path]), source.ingest_paths({}, [path])
+        assert first[0]["timestamp"] == again[0]["timestamp"] == taken.isoformat()
@@ -0,0 +1,80 @@
+import multiprocessing
+import subprocess
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+from open_encroachment.ingestion.scheduler import SOURCES, Source, ingest_all
+
+
+def _source(name, delay=0.0, fail=False):
+    def run(config):
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("boom")
+        return [{"id": f"{name}_1", "source": name}]
+
+    return Source(name, run)
+
+
+def test_merged_order_follows_registry_not_completion():
+    sources = [_source("slow", delay=0.2), _source("fast"), _source("broken", fail=True)]
+    start = time.monotonic()
+    events = ingest_all({"ingestion": {"io_workers": 3}}, sources)
+    assert [e["source"] for e in events] == ["slow", "fast"]
+    assert time.monotonic() - start < 0.4  # ran concurrently
+
+
+def test_source_timeout_drops_only_that_source():
+    sources = [_source("hung", delay=1.0), _source("ok")]
+    start = time.monotonic()
+    events = ingest_all({"ingestion": {"source_timeout_s": 0.1}}, sources)
+    assert [e["source"] for e in events] == ["ok"]
+    assert time.monotonic() - start < 0.9
+
+
+def test_sequential_mode_and_default_registry():
+    events = ingest_all({"ingestion": {"concurrent": False}}, [_source("a"), _source("b")])
+    assert [e["source"] for e in events] == ["a", "b"]
+    assert [s.name for s in SOURCES] == [
+        "satellite",
+        "aerial",
+        "ground_sensors",
+        "social_media",
+        "gps",
+    ]
+
+
+def test_hung_source_does_not_hold_up_exit():
+    code = (
+        "import time\n"
+        "from open_encroachment.ingestion.scheduler import Source, ingest_all\n"
+        "hung = Source('hung', lambda c: time.sleep(60) or [])\n"
+        "assert ingest_all({'ingestion': {'source_timeout_s': 0.1}}, [hung]) == []\n"
+    )
+    start = time.monotonic()
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert "hung timed out" in proc.stdout and time.monotonic() - start < 30
+
+
+def test_process_pool_only_for_tiles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pools = []
+    real_pool = multiprocessing.Pool
+
+    def pool(n):
+        pools.append(n)
+        return real_pool(n)
+
+    monkeypatch.setattr(multiprocessing, "Pool", pool)
+    image_sources = SOURCES[:2]
+    assert ingest_all({}, [*image_sources, _source("ok")]) == [{"id": "ok_1", "source": "ok"}]
+    assert pools == []
+
+    (tmp_path / "data/satellite").mkdir(parents=True)
+    Image.fromarray(np.zeros((8, 8), dtype=np.uint8)).save(tmp_path / "data/satellite/t.png")
+    events = ingest_all({"ingestion": {"image_workers": 1}}, image_sources)
+    assert [e["source"] for e in events] == ["satellite"] and pools == [1]
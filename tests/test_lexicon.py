@@ -0,0 +1,108 @@
+import random
+
+import numpy as np
+
+from open_encroachment.models.features import MODEL_COLUMNS
+from open_encroachment.models.threat_classifier import ThreatClassifier
+from open_encroachment.nlp.lexicon import ThreatLexicon
+
+
+def test_automaton_finds_every_occurrence(tmp_path):
+    lex = ThreatLexicon(["he", "she", "his", "hers", "She sells", "sells sea", "sea-shells", "he"])
+    assert len(lex) == 7  # duplicates up to case and punctuation are dropped
+    text = "SHE sells sea shells; his, hers... he"
+    assert lex.matches(text) == ["she", "she sells", "sells sea", "sea shells", "his", "hers", "he"]
+    assert lex.matches("shells she's") == ["she"] and lex.matches("ashes") == []
+
+    # Same hits as searching every phrase at every position
+    rng = random.Random(0)
+    words = [f"w{i}" for i in range(20)]
+    lex = ThreatLexicon(" ".join(rng.choices(words, k=rng.randint(1, 4))) for _ in range(200))
+    for _ in range(200):
+        toks = rng.choices(words, k=30)
+        want = [
+            i
+            for k in range(len(toks))
+            for i, p in enumerate(lex.phrases)
+            if toks[k : k + len(p.split())] == p.split()
+        ]
+        assert sorted(lex.scan(" ".join(toks))) == sorted(want)
+
+    path = tmp_path / "lexicon.txt"
+    path.write_text("# dumping\nillegal dumping  # the classic\n\nFence cut\n", encoding="utf-8")
+    lex = ThreatLexicon.load(path)
+    assert lex.phrases == ["illegal dumping", "fence cut"] and ThreatLexicon.load(path) is lex
+    counts = lex.hit_counts([["Illegal dumping, fence-cut!", "fence cut"], [], ["ok"]])
+    assert counts.tolist() == [3, 0, 0]
+    assert len(ThreatLexicon.load(tmp_path / "missing.txt")) > 0
+
+
+def test_lexicon_features_and_prefilter(tmp_path, counting_nlp):
+    texts = [
+        ["Illegal dumping spotted near river"],
+        ["Great weather for a hike today"],
+        ["Birds nesting by the lake", "pipeline tampering reported"],
+        [],
+    ]
+    events = [
+        {
+            "id": f"fused_{i}",
+            "timestamp": "2026-01-01T00:00:00+00:00",
+            "in_geofence": i % 2 == 0,
+            "features": {"img_edge_strength": 0.5 * (i % 3)},
+            "texts": texts[i % 4],
+        }
+        for i in range(40)
+    ]
+    lexicon = ThreatLexicon(["illegal dumping", "pipeline tampering"])
+    full = ThreatClassifier(model_dir=str(tmp_path), lexicon=lexicon)
+    nlp = counting_nlp(full.nlp)
+    pre = ThreatClassifier(model_dir=str(tmp_path), nlp=nlp, lexicon=lexicon, prefilter=1.0)
+    want = full.classify(events)
+    got = pre.classify(events)
+
+    assert [r["features"].get("lexicon_hits") for r in want[:4]] == [1, 0, 1, None]
+    # Only the hike texts (no hits) skip the text model
+    assert pre.prefiltered == 10 and nlp.groups == 30
+    for w, g, e in zip(want, got, events, strict=True):
+        if e["texts"] == texts[1]:
+            assert g["text_threat"] is None and w["text_threat"] > 0
+        else:
+            assert g == w
+    assert full.prefilter is None and full.versions()["lexicon"] == lexicon.version
+    assert ThreatClassifier(model_dir=str(tmp_path), prefilter=1.0).prefilter is None
+
+
+class _SeenRows:
+    def __init__(self):
+        self.text_threat = []
+
+    def predict_proba(self, X):
+        self.text_threat.extend(X[:, MODEL_COLUMNS.index("text_threat")].tolist())
+        return np.tile([0.0, 1.0], (len(X), 1))
+
+
+def test_prefiltered_events_keep_their_prior_with_a_trained_model(tmp_path):
+    events = [
+        {
+            "id": f"fused_{i}",
+            "timestamp": "2026-01-01T00:00:00+00:00",
+            "features": {},
+            "texts": ["Great weather for a hike today"] if i % 2 else ["Illegal dumping here"],
+        }
+        for i in range(6)
+    ]
+    lexicon = ThreatLexicon(["illegal dumping"])
+    clf = ThreatClassifier(model_dir=str(tmp_path), lexicon=lexicon, prefilter=1.0)
+    prior = [r["threat_probability"] for r in clf.classify(events)]
+    seen = _SeenRows()
+    clf.model = {"estimator": seen, "columns": list(MODEL_COLUMNS)}
+    got = clf.classify(events)
+
+    # Trained only on scored texts, the model never sees a prefiltered event's missing score
+    assert len(seen.text_threat) == 3 and all(t > 0 for t in seen.text_threat)
+    for i, r in enumerate(got):
+        if i % 2:
+            assert r["text_threat"] is None and r["threat_probability"] == prior[i] < 1.0
+        else:
+            assert r["threat_probability"] == 1.0
@@ -0,0 +1,49 @@
+import json
+
+from open_encroachment.ingestion.scheduler import Source, ingest_all
+from open_encroachment.pipeline import process_events
+from open_encroachment.utils.metrics import StageTimer, format_table
+
+
+def test_disabled_timer_records_nothing():
+    timer = StageTimer(enabled=False)
+    with timer.stage("x") as span:
+        span.items = 3
+    assert timer.report() == {}
+    assert timer.finish({}, {"events": 0}) == {"events": 0}
+
+
+def test_stages_accumulate_and_render():
+    timer = StageTimer()
+    for n in (2, 3):
+        with timer.stage("fuse") as span:
+            sum(range(10000))
+            span.items = n
+    rec = timer.report()["fuse"]
+    assert rec["calls"] == 2 and rec["items"] == 5
+    assert rec["wall_s"] > 0 and rec["items_per_s"] > 0
+    table = format_table(timer.report())
+    assert table.splitlines()[1].startswith("fuse")
+
+
+def test_per_source_timings_and_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the dispatcher's signing key lives under the working dir
+    cfg = {
+        "metrics": {"enabled": True, "log_path": str(tmp_path / "metrics.jsonl")},
+        "artifacts": {
+            "models_dir": str(tmp_path / "models"),
+            "predictions_dir": str(tmp_path / "predictions"),
+            "db_path": str(tmp_path / "cases.db"),
+            "evidence_ledger": str(tmp_path / "evidence_ledger.jsonl"),
+        },
+        "dispatch": {"outbox_dir": str(tmp_path / "outbox")},
+    }
+    timer = StageTimer.from_config(cfg)
+    src = Source("fake", lambda c: [{"id": "e1", "source": "gps", "lat": 1.0, "lon": 2.0}])
+    raw = ingest_all(cfg, [src], timer=timer)
+    result = process_events(cfg, raw, timer)
+    timings = result["timings"]
+    assert timings["source:fake"]["items"] == 1
+    assert {"validate", "fuse", "classify", "score", "persist", "dispatch"} <= set(timings)
+    logged = json.loads((tmp_path / "metrics.jsonl").read_text().splitlines()[-1])
+    assert logged["timings"].keys() == timings.keys()
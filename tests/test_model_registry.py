@@ -0,0 +1,37 @@
+import os
+
+import joblib
+import numpy as np
+
+from open_encroachment.models.registry import ModelRegistry
+from open_encroachment.models.threat_classifier import ThreatClassifier
+
+
+def test_registry_loads_once_and_reloads_on_change(tmp_path):
+    path = tmp_path / "m.joblib"
+    joblib.dump({"w": np.arange(1000.0)}, path)
+    reg = ModelRegistry()
+    first = reg.load(path)
+    assert reg.load(path) is first
+    assert reg.loads == 1
+
+    mapped = reg.load(path, mmap_mode="r")
+    assert isinstance(mapped["w"], np.memmap)
+    assert reg.loads == 2
+
+    joblib.dump({"w": np.zeros(3)}, path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert reg.load(path)["w"].shape == (3,)
+    assert reg.loads == 3
+
+
+def test_classifiers_share_loaded_models(tmp_path):
+    a = ThreatClassifier(model_dir=str(tmp_path))
+    b = ThreatClassifier.from_config({"artifacts": {"models_dir": str(tmp_path)}})
+    assert (tmp_path / "social_nlp" / f"{a.nlp.version}.joblib").exists()
+    assert a.nlp.pipeline is b.nlp.pipeline
+
+    b.nlp.update_with_feedback(["fence cut at the north gate"], 1)
+    assert ThreatClassifier(model_dir=str(tmp_path)).nlp.pipeline is b.nlp.pipeline
+    assert a.nlp.pipeline is not b.nlp.pipeline
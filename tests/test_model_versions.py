@@ -0,0 +1,65 @@
+import joblib
+import pytest
+
+from open_encroachment.models.store import ModelStore
+from open_encroachment.models.threat_classifier import ThreatClassifier
+from open_encroachment.nlp.nlp_engine import SocialNLP, fit_pipeline
+
+
+def test_background_training_hot_swap_and_rollback(tmp_path):
+    nlp = SocialNLP(model_dir=str(tmp_path), background=True, keep_versions=2)
+    # No model yet: the constructor returns at once and texts score 0 meanwhile
+    assert nlp.pipeline is None
+    assert nlp.threat_scores([["illegal dumping spotted"]]).tolist() == [0.0]
+    first = nlp.train_in_background().result(timeout=300)
+    assert nlp.store.current() == first
+
+    clf = ThreatClassifier(model_dir=str(tmp_path), nlp=nlp)
+    assert clf.nlp.threat_score(["illegal dumping spotted"]) > 0
+    assert clf.versions() == {"social_nlp": first, "fused_clf": None}
+
+    # A version published elsewhere is picked up at the next call
+    in_flight = nlp.pipeline
+    trainer = SocialNLP(model_dir=str(tmp_path), keep_versions=2)
+    trainer.update_with_feedback(["fence cut at the north gate"], 1)
+    second = trainer.version
+    assert second > first and nlp.pipeline is in_flight
+    nlp.threat_score(["fence cut at the north gate"])
+    assert nlp.version == second and nlp.pipeline is not in_flight
+
+    assert nlp.store.rollback() == first
+    nlp.threat_score(["fence cut at the north gate"])
+    assert nlp.version == first and nlp.pipeline is in_flight
+    with pytest.raises(ValueError):
+        nlp.store.rollback()
+    assert nlp.store.rollback(second) == second
+
+    # Only the newest keep_versions survive
+    trainer.update_with_feedback(["birds by the lake"], 0)
+    assert nlp.store.versions() == [second, trainer.version]
+
+
+def test_store_publishes_atomically(tmp_path):
+    store = ModelStore(tmp_path, "m", keep=3)
+    assert store.current() is None and store.versions() == []
+    versions = [store.publish({"w": i}) for i in range(5)]
+    assert store.versions() == versions[-3:] and store.current() == versions[-1]
+    assert store.rollback() == versions[-2]
+    store.publish({"w": 5})
+    assert store.versions() == [*versions[-2:], store.current()]
+    assert [p.name for p in (tmp_path / "m").iterdir() if p.name.startswith(".")] == []
+
+
+def test_pre_versioning_model_becomes_the_first_version(tmp_path):
+    legacy = fit_pipeline()
+    legacy.named_steps["clf"].intercept_ += 1.0  # unlike anything retraining produces
+    joblib.dump(legacy, tmp_path / "social_nlp.joblib")
+    text = ["great weather for a hike"]
+
+    # Adopted, not retrained (background training would leave no model yet)
+    nlp = SocialNLP(model_dir=str(tmp_path), background=True)
+    assert nlp.store.versions() == [nlp.version]
+    assert nlp.threat_score(text) == pytest.approx(legacy.predict_proba(text)[0, 1])
+    # Once the store has a version the old file is left alone
+    nlp.update_with_feedback(text, 0)
+    assert len(SocialNLP(model_dir=str(tmp_path)).store.versions()) == 2
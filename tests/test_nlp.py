@@ -0,0 +1,163 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from open_encroachment.nlp.exported import LinearTextScorer, export_linear_model
+from open_encroachment.nlp.nlp_engine import SocialNLP
+
+
+def test_batched_scores_match_per_group_means(tmp_path):
+    nlp = SocialNLP(model_dir=str(tmp_path))
+    groups = [
+        ["Illegal dumping spotted near river"],
+        [],
+        ["Great weather for a hike today", "Pipeline tampering reported by locals", "ok"],
+        [],
+        ["Unauthorized excavation within protected forest", "Birds nesting by the lake"],
+    ]
+    expected = [float(nlp.pipeline.predict_proba(g)[:, 1].mean()) if g else 0.0 for g in groups]
+    # A small batch size splits groups across model calls
+    scores = nlp.threat_scores(groups, batch_size=2)
+    np.testing.assert_allclose(scores, expected, rtol=1e-12)
+    assert nlp.threat_score(groups[2]) == scores[2]
+    assert nlp.threat_scores([]).shape == (0,)
+
+
+def test_online_feedback_updates_incrementally(tmp_path, monkeypatch):
+    nlp = SocialNLP(model_dir=str(tmp_path), online=True, snapshot_every=3)
+    other = SocialNLP(model_dir=str(tmp_path), online=True)
+    saved = nlp.version
+    text = "fence cut at the north gate"
+    before = nlp.threat_score([text])
+
+    # Feedback never goes back to the training corpus
+    def no_corpus():
+        raise AssertionError("training data reloaded")
+
+    monkeypatch.setattr(nlp, "_load_training_data", no_corpus)
+    nlp.update_with_feedback([text], 1)
+    nlp.update_with_feedback([text], 1)
+    assert nlp.threat_score([text]) > before
+    # Shared in the process at once, on disk only at the next snapshot
+    assert other.threat_score([text]) == nlp.threat_score([text])
+    assert nlp.unsaved == 2 and nlp.store.versions() == [saved]
+    nlp.update_with_feedback([text], 1)
+    assert nlp.unsaved == 0 and nlp.store.versions() == [saved, nlp.version]
+    assert other.threat_score([text]) == nlp.threat_score([text]) and other.version == nlp.version
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["social_nlp_online"]
+
+
+def test_exported_model_matches_pipeline_without_sklearn(tmp_path):
+    nlp = SocialNLP(model_dir=str(tmp_path))
+    out = export_linear_model(nlp.pipeline, tmp_path / "export")
+    export_linear_model(nlp.pipeline, out)  # replacing an export leaves no leftovers
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["export", "social_nlp"]
+    scorer = LinearTextScorer.load(out)
+    texts = [
+        "Illegal dumping spotted near RIVER, illegal dumping again!",
+        "",
+        "ok",
+        "unknown words only",
+        "Pipeline tampering reported by locals",
+    ]
+    np.testing.assert_allclose(
+        scorer.predict_proba(texts), nlp.pipeline.predict_proba(texts), rtol=1e-12
+    )
+    groups = [texts[:2], [], texts[2:]]
+    np.testing.assert_allclose(scorer.threat_scores(groups), nlp.threat_scores(groups))
+
+    code = f"""
+import sys
+from open_encroachment.models.threat_classifier import ThreatClassifier
+clf = ThreatClassifier.from_config(
+    {{"artifacts": {{"models_dir": {str(tmp_path / "none")!r}}}, "nlp": {{"export_dir": {str(out)!r}}}}}
+)
+res = clf.classify([{{"id": "e", "timestamp": "t", "texts": ["illegal dumping"]}}])
+assert res[0]["text_threat"] > 0
+assert "sklearn" not in sys.modules and "joblib" not in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    online = SocialNLP(model_dir=str(tmp_path), online=True)
+    with pytest.raises(ValueError, match="hashed"):
+        export_linear_model(online.pipeline, tmp_path / "online_export")
+
+
+def test_text_scores_are_cached_per_model_version(tmp_path):
+    from open_encroachment.nlp.score_cache import TEXT_SCORES, TextScoreCache
+
+    TEXT_SCORES.invalidate()
+    nlp = SocialNLP(model_dir=str(tmp_path))
+    texts = ["Illegal dumping near the river", "Road repair completed", "ok"]
+    expected = nlp.pipeline.predict_proba(texts)[:, 1]
+    before = TEXT_SCORES.stats()
+    nlp.threat_scores([texts])
+    # Case and spacing do not change the model's tokens, so they share an entry
+    variants = [["ILLEGAL  dumping near\tthe river"], ["Road repair completed", "ok"]]
+    scores = SocialNLP(model_dir=str(tmp_path)).threat_scores(variants)
+    np.testing.assert_allclose(scores, [expected[0], expected[1:].mean()], rtol=1e-12)
+    stats = TEXT_SCORES.stats()
+    assert stats["misses"] - before["misses"] == 3 and stats["hits"] - before["hits"] == 3
+
+    # Feedback replaces the model; its predecessor's scores are not served
+    nlp.update_with_feedback(["Road repair completed"], 1)
+    rescored = nlp.threat_scores([["Road repair completed"]])[0]
+    assert rescored == nlp.pipeline.predict_proba(["Road repair completed"])[0, 1]
+    assert TEXT_SCORES.stats()["misses"] - stats["misses"] == 1
+
+    clock = [0.0]
+    cache = TextScoreCache(max_entries=2, ttl_s=10, clock=lambda: clock[0])
+    v = cache.version("m", (1, 2))
+    cache.put_many(v, [b"a", b"b", b"c"], [0.1, 0.2, 0.3])
+    assert cache.get_many(v, [b"a", b"c"]) == [None, 0.3]  # least recently used evicted
+    clock[0] = 11
+    assert cache.get_many(v, [b"c"]) == [None]  # expired
+    cache.invalidate("m")
+    cache.put_many(v, [b"a"], [0.1])  # scored before the invalidation: dropped
+    assert cache.get_many(cache.version("m", (1, 2)), [b"a"]) == [None]
+
+
+def test_score_texts_streams_chunks_across_workers(tmp_path, capsys):
+    import csv
+    import json
+
+    import yaml
+
+    from open_encroachment.cli import main
+    from open_encroachment.nlp.backfill import score_texts
+
+    base = ["Illegal dumping spotted near river", "Great weather for a hike today", "ok", ""]
+    texts = [f"{base[i % 4]} {i % 7}" for i in range(103)]
+    cfg = {"artifacts": {"models_dir": str(tmp_path / "models")}}
+    want = SocialNLP.from_config(cfg).pipeline.predict_proba(texts)[:, 1]
+
+    consumed = []
+
+    def archive():
+        for t in texts:
+            consumed.append(t)
+            yield t
+
+    chunks = score_texts(cfg, archive(), chunk_size=10, workers=0)
+    first = next(chunks)
+    assert len(first) == 10 and len(consumed) == 10  # read lazily, chunk by chunk
+    np.testing.assert_allclose(np.concatenate([first, *chunks]), want, rtol=1e-12)
+
+    with open(tmp_path / "posts.csv", "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["post_id", "text"])
+        w.writerows((f"p{i}", t) for i, t in enumerate(texts))
+    (tmp_path / "cfg.yaml").write_text(yaml.safe_dump(cfg), encoding="utf-8")
+    out = tmp_path / "scores.csv"
+    args = ["--config", str(tmp_path / "cfg.yaml"), "score-texts", str(tmp_path / "posts.csv")]
+    main(
+        [*args, "--out", str(out), "--id-column", "post_id", "--chunk-size", "8", "--workers", "2"]
+    )
+    report = json.loads(capsys.readouterr().out)
+    assert report["texts"] == len(texts) and report["version"] is not None
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["post_id"] for r in rows] == [f"p{i}" for i in range(len(texts))]
+    np.testing.assert_allclose([float(r["threat_score"]) for r in rows], want, atol=1e-6)
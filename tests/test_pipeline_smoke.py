@@ -2,6 +2,7 @@ from open_encroachment.pipeline import run_pipeline
 
 
 def test_pipeline_smoke(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # default artifact paths are relative to the working dir
     # Use a temporary config path; pipeline will fall back to defaults and generate sample data
     result = run_pipeline(config_path=None, use_sample_data=True)
     assert "events" in result
@@ -1,7 +1,8 @@
 from open_encroachment.pipeline import run_pipeline
 
 
-def test_pipeline_skips_invalid(monkeypatch):
+def test_pipeline_skips_invalid(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # default artifact paths are relative to the working dir
     monkeypatch.setenv("USE_SAMPLE_DATA", "true")  # Mock sample
     result = run_pipeline(use_sample_data=True)
     assert "events" in result
@@ -0,0 +1,83 @@
+from open_encroachment.models.records import to_incident_models
+from open_encroachment.pipeline import score_stage, validate_events
+
+
+def test_batch_validation_skips_only_invalid(capsys):
+    raw = [
+        {
+            "id": "ok1",
+            "source": "gps",
+            "timestamp": "2026-01-01T00:00:00Z",
+            "features": {},
+            "artifacts": {},
+        },
+        {
+            "id": "bad_ts",
+            "source": "gps",
+            "timestamp": "yesterday",
+            "features": {},
+            "artifacts": {},
+        },
+        {"id": "no_feats", "source": "gps", "timestamp": "2026-01-01T00:00:00Z", "artifacts": {}},
+        {
+            "id": "ok2",
+            "source": "gps",
+            "timestamp": "2026-01-01T00:00:00Z",
+            "features": {},
+            "artifacts": {},
+        },
+    ]
+    events = validate_events({"ingestion": {"dedup": {"enabled": False}}}, raw)
+    assert [e.id for e in events] == ["ok1", "ok2"]
+    out = capsys.readouterr().out
+    assert "'bad_ts'" in out and "'no_feats'" in out
+
+
+def test_incident_records_validate_at_the_edge():
+    classified = [
+        {
+            "id": "fused_1",
+            "timestamp": "2026-01-01T00:00:00+00:00",
+            "lat": 1.0,
+            "lon": 2.0,
+            "geofence_id": "gf",
+            "in_geofence": True,
+            "threat_probability": 0.7,
+            "text_threat": 0.5,
+            "features": {"ground_sensor_pm25_z": 2.0},
+            "sources": ["ground_sensor"],
+            "raw_event_ids": ["gnd_1"],
+        }
+    ]
+    (rec,) = score_stage(classified)
+    assert rec.as_dict()["severity"] is rec.severity
+    (model,) = to_incident_models([rec])
+    assert model.severity.overall == rec.severity["overall"]
+    assert model.raw_event_ids == ["gnd_1"]
+
+
+def test_score_stage_skips_only_invalid_incidents(capsys):
+    good = {
+        "id": "ok",
+        "timestamp": "2026-01-01T00:00:00+00:00",
+        "in_geofence": False,
+        "threat_probability": 0.4,
+        "text_threat": 0.0,
+        "features": {},
+        "sources": [],
+        "raw_event_ids": [],
+    }
+    classified = [
+        {**good, "id": "too_high", "threat_probability": 1.5},
+        {**good, "id": "nan", "text_threat": float("nan")},
+        {**good, "id": "text", "threat_probability": "0.4"},
+        {k: v for k, v in good.items() if k != "timestamp"},
+        {**good, "cascade_tier": "scored"},  # unknown keys are ignored
+        {**good, "id": "unscored", "text_threat": None},  # texts the cascade skipped
+    ]
+    rec, unscored = score_stage(classified)
+    assert rec.id == "ok" and unscored.text_threat is None
+    assert to_incident_models([unscored])[0].text_threat is None
+    out = capsys.readouterr().out
+    assert all(f"'{i}'" in out for i in ("too_high", "nan", "text")) and "timestamp" in out
+    to_incident_models([rec])
@@ -0,0 +1,54 @@
+import numpy as np
+
+from open_encroachment.bench import bench_scoring, synthetic_incidents
+from open_encroachment.models.features import FeatureMatrix
+from open_encroachment.models.severity import severity_score
+from open_encroachment.models.threat_classifier import baseline_probabilities, baseline_probability
+from open_encroachment.pipeline import score_stage
+
+
+def test_vectorized_scoring_matches_scalar():
+    rows = synthetic_incidents(2000, seed=3)
+    # Modality flags come from any key with the prefix, not just schema features
+    rows += [
+        {"threat_probability": 0.5, "text_threat": 0.5, "in_geofence": True, "features": {}},
+        {
+            "threat_probability": 0.9,
+            "text_threat": 0.2,
+            "in_geofence": False,
+            "features": {"img_mean_brightness": 120.0, "aerial_mean_brightness": 80.0},
+        },
+    ]
+    fm = FeatureMatrix.from_dicts([r["features"] for r in rows])
+    in_gf = np.array([r["in_geofence"] for r in rows])
+    probs = baseline_probabilities(fm, np.array([r["text_threat"] for r in rows]), in_gf)
+    expected = [
+        baseline_probability(r["features"], r["text_threat"], r["in_geofence"]) for r in rows
+    ]
+    np.testing.assert_allclose(probs, expected, atol=1e-6)
+
+    incidents = score_stage(
+        [
+            {
+                "id": f"fused_{i}",
+                "timestamp": "2026-01-01T00:00:00+00:00",
+                "lat": None,
+                "lon": None,
+                "geofence_id": None,
+                "sources": [],
+                "raw_event_ids": [],
+                **r,
+            }
+            for i, r in enumerate(rows)
+        ]
+    )
+    for inc, r in zip(incidents, rows, strict=True):
+        want = severity_score(r["threat_probability"], r["features"], r["in_geofence"], None)
+        assert inc.severity.keys() == want.keys()
+        np.testing.assert_allclose(list(inc.severity.values()), list(want.values()), atol=1e-6)
+    assert score_stage([]) == []
+
+
+def test_scoring_benchmark_reports_speedup():
+    report = bench_scoring(500)
+    assert report["incidents"] == 500 and report["max_abs_diff"] < 1e-6
@@ -0,0 +1,77 @@
+import threading
+
+from open_encroachment.service import StreamService
+
+HEADER = "timestamp,lat,lon,pm25,noise_db,vibration,temp_c\n"
+ROW = "2026-01-01T12:00:00+00:00,37.34,-122.01,10,40,0.1,20\n"
+
+
+def _config(tmp_path, ground):
+    return {
+        "watch": {"targets": [{"source": "ground_sensors", "path": str(ground)}]},
+        "service": {"index_path": str(tmp_path / "index.json")},
+        "artifacts": {
+            "models_dir": str(tmp_path / "models"),
+            "db_path": str(tmp_path / "cases.db"),
+        },
+        "dispatch": {"outbox_dir": str(tmp_path / "outbox")},
+    }
+
+
+def test_batches_on_event_count_then_drains_on_stop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ground = tmp_path / "ground.csv"
+    ground.write_text(HEADER + ROW * 3)
+    svc = StreamService(_config(tmp_path, ground))
+
+    results = []
+    for result in svc.serve(interval=3600, max_events=3, poll_s=0.01):
+        results.append(result)
+        if len(results) == 1:
+            # Fewer than max_events pending: only the shutdown drain processes them
+            with ground.open("a") as f:
+                f.write(ROW)
+            threading.Timer(0.2, svc.stop.set).start()
+    assert [r["new_events"] for r in results] == [3, 1]
+    assert svc.cm._con is None  # connection closed on exit
+
+    # The index was committed: a restarted service finds nothing new
+    svc2 = StreamService(_config(tmp_path, ground))
+    assert svc2.watcher.poll() == []
+    svc2.cm.close()
+
+
+def test_resident_risk_map_horizon_moves_with_the_clock():
+    from datetime import datetime, timedelta, timezone
+
+    from open_encroachment.analytics.predictive import RiskAggregator
+
+    now = [datetime(2026, 3, 1, tzinfo=timezone.utc)]
+    risk = RiskAggregator(horizon_days=30, clock=lambda: now[0])
+    risk.add(
+        [
+            {"timestamp": "2026-01-01T00:00:00+00:00", "geofence_id": "a", "severity": {}},
+            {"timestamp": "2026-02-20T00:00:00+00:00", "geofence_id": "a", "severity": {}},
+            {"timestamp": "2026-02-27T00:00:00+00:00", "geofence_id": "b", "severity": {}},
+        ]
+    )
+    assert sorted((r["geofence_id"], r["count"]) for r in risk.results()) == [("a", 1), ("b", 1)]
+    now[0] += timedelta(days=25)  # a long-running service, weeks later
+    assert [(r["geofence_id"], r["count"]) for r in risk.results()] == [("b", 1)]
+    assert list(risk.state.days) == ["b"]
+
+
+def test_shutdown_snapshots_online_text_model_updates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ground = tmp_path / "ground.csv"
+    ground.write_text(HEADER)
+    cfg = {**_config(tmp_path, ground), "nlp": {"online": True, "snapshot_every": 100}}
+    svc = StreamService(cfg)
+    nlp = svc.clf.nlp
+    saved = nlp.version
+    nlp.update_with_feedback(["fence cut at the north gate"], 1)
+    assert nlp.unsaved == 1 and nlp.store.versions() == [saved]
+
+    svc.stop.set()
+    assert list(svc.serve(poll_s=0.01)) == []
+    assert nlp.unsaved == 0 and nlp.store.versions() == [saved, nlp.version]
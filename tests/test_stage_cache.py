@@ -0,0 +1,44 @@
+from open_encroachment.pipeline import process_events
+
+
+def _raw(n):
+    return [
+        {
+            "id": f"gnd_{n}_{i}",  # ids differ between ingestions
+            "source": "ground_sensor",
+            "timestamp": f"2026-01-01T00:0{i}:00+00:00",
+            "lat": 10.0 + i,
+            "lon": 20.0,
+            "features": {"pm25_z": 3.0},
+            "artifacts": {},
+        }
+        for i in range(3)
+    ]
+
+
+def test_threshold_change_reuses_cached_stages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the dispatcher's signing key lives under the working dir
+    cfg = {
+        "cache": {"enabled": True, "dir": str(tmp_path / "cache")},
+        "artifacts": {
+            "models_dir": str(tmp_path / "models"),
+            "predictions_dir": str(tmp_path / "predictions"),
+            "db_path": str(tmp_path / "cases.db"),
+            "evidence_ledger": str(tmp_path / "evidence_ledger.jsonl"),
+        },
+        "dispatch": {"outbox_dir": str(tmp_path / "outbox")},
+        "thresholds": {"severity_notify_min": 1.0},
+    }
+    process_events(cfg, _raw(0))  # trains the NLP model on first use
+    first = process_events(cfg, _raw(1))
+    assert first["notified"] == []
+
+    cfg["thresholds"]["severity_notify_min"] = 0.0
+    second = process_events(cfg, _raw(2))
+    assert second["cache"] == {"hits": 3, "misses": 0}
+    assert len(second["notified"]) == second["incidents"] == 3
+    # Cached rows are re-linked to this run's event ids
+    assert all(i.startswith("fused_") for i in second["notified"])
+
+    cfg["geofences"] = [{"id": "gf", "polygon": [[0, 0], [0, 1], [1, 1]]}]
+    assert process_events(cfg, _raw(3))["cache"] == {"hits": 0, "misses": 3}
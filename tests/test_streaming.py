@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from open_encroachment import streaming
+from open_encroachment.ingestion.scheduler import Source
+
+
+def _events(prefix, n):
+    return [
+        {
+            "id": f"{prefix}_{i}",
+            "source": "ground_sensor",
+            "timestamp": "2026-01-01T00:00:00+00:00",
+            "lat": 10.0 + i,
+            "lon": 20.0,
+            "features": {"pm25_z": 3.0},
+            "artifacts": {},
+        }
+        for i in range(n)
+    ]
+
+
+def _config(tmp_path, **extra):
+    return {
+        "artifacts": {
+            "models_dir": str(tmp_path / "models"),
+            "db_path": str(tmp_path / "cases.db"),
+            "evidence_ledger": str(tmp_path / "ledger.jsonl"),
+        },
+        "dispatch": {"outbox_dir": str(tmp_path / "outbox")},
+        "streaming": {"queue_size": 1},
+        **extra,
+    }
+
+
+def test_dispatches_while_ingesting(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dispatched = threading.Event()
+    seen_before_end = []
+
+    def notify(cfg, dispatcher, incidents):
+        dispatched.set()
+        return [inc.id for inc in incidents]
+
+    def batches(config):
+        yield _events("a", 3)
+        # The first batch must reach dispatch before this source finishes
+        seen_before_end.append(dispatched.wait(timeout=30))
+        yield _events("b", 2)
+
+    monkeypatch.setattr(streaming, "notify_stage", notify)
+    src = Source("slow", lambda c: [], batches=batches)
+    result = streaming.run_streaming(_config(tmp_path), [src])
+    assert seen_before_end == [True]
+    assert result["events"] == 5
+    assert result["incidents"] == result["fused"] == 5
+    assert len(result["notified"]) == 5
+
+
+def test_stage_error_propagates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def boom(cfg, events, spill=True):
+        raise RuntimeError("fusion failed")
+
+    def endless(config):
+        while True:
+            yield _events("x", 1)
+
+    monkeypatch.setattr(streaming, "fuse_stage", boom)
+    with pytest.raises(RuntimeError, match="fusion failed"):
+        streaming.run_streaming(
+            _config(tmp_path), [Source("endless", lambda c: [], batches=endless)]
+        )
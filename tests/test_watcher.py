@@ -0,0 +1,92 @@
+import shutil
+
+import pytest
+
+from open_encroachment.ingestion.watcher import DirectoryWatcher, WatchTarget
+
+
+def _targets(tmp_path):
+    return [
+        WatchTarget("satellite", str(tmp_path / "sat"), "images"),
+        WatchTarget("ground_sensors", str(tmp_path / "ground.csv"), "csv"),
+        WatchTarget("social_media", str(tmp_path / "social.csv"), "csv"),
+    ]
+
+
+def test_watcher_picks_up_new_files_and_appended_rows(tmp_path):
+    (tmp_path / "sat").mkdir()
+    ground = tmp_path / "ground.csv"
+    ground.write_text(
+        "timestamp,lat,lon,pm25,noise_db,vibration,temp_c\n"
+        "2025-01-01T12:00:00+00:00,37.34,-122.01,10,40,0.1,20\n"
+        "2025-01-01T12:01:00+00:00,37.34,-122.01,20,50,0.2,21\n",
+        encoding="utf-8",
+    )
+    index = tmp_path / "index.json"
+    watcher = DirectoryWatcher({}, _targets(tmp_path), index_path=str(index))
+
+    first = watcher.poll()
+    assert [e["source"] for e in first] == ["ground_sensor", "ground_sensor"]
+    assert watcher.poll() == []  # nothing changed
+
+    # Append one complete row and one partial row: only the complete row is consumed
+    with ground.open("a", encoding="utf-8") as f:
+        f.write("2025-01-01T12:02:00+00:00,37.34,-122.01,90,90,0.9,22\n2025-01-01T12:03")
+    appended = watcher.poll()
+    assert len(appended) == 1
+    assert appended[0]["timestamp"] == "2025-01-01T12:02:00+00:00"
+    assert appended[0]["features"]["pm25_z"] > 1.0  # scored against running stats
+
+    with ground.open("a", encoding="utf-8") as f:
+        f.write(":00+00:00,37.34,-122.01,10,40,0.1,20\n")
+    assert [e["timestamp"] for e in watcher.poll()] == ["2025-01-01T12:03:00+00:00"]
+
+    shutil.copy("data/satellite/sample1.png", tmp_path / "sat" / "new.png")
+    (tmp_path / "social.csv").write_text(
+        "timestamp,source,text,lat,lon\n2025-01-01T12:00:00+00:00,twitter,Dumping,,\n",
+        encoding="utf-8",
+    )
+    assert sorted(e["source"] for e in watcher.poll()) == ["satellite", "twitter"]
+
+    # A restarted watcher resumes from the persisted index
+    assert DirectoryWatcher({}, _targets(tmp_path), index_path=str(index)).poll() == []
+
+
+def test_watcher_restarts_truncated_csv(tmp_path):
+    social = tmp_path / "social.csv"
+    header = "timestamp,source,text,lat,lon\n"
+    social.write_text(header + "2025-01-01T12:00:00+00:00,x,one,,\n" * 3, encoding="utf-8")
+    watcher = DirectoryWatcher({}, _targets(tmp_path))
+    assert len(watcher.poll()) == 3
+    social.write_text(header + "2025-01-01T13:00:00+00:00,x,two,,\n", encoding="utf-8")
+    assert [e["features"]["text"] for e in watcher.poll()] == ["two"]
+
+
+def test_watch_saves_offsets_only_after_processing(tmp_path, monkeypatch):
+    from open_encroachment import pipeline
+    from open_encroachment.ingestion.watcher import watch
+
+    social = tmp_path / "social.csv"
+    social.write_text(
+        "timestamp,source,text,lat,lon\n2025-01-01T12:00:00+00:00,x,one,,\n", encoding="utf-8"
+    )
+    cfg = {
+        "watch": {
+            "index_path": str(tmp_path / "index.json"),
+            "targets": [{"source": "social_media", "path": str(social)}],
+        }
+    }
+    monkeypatch.setattr(pipeline, "prepare_dirs", lambda cfg: None)
+
+    def crash(cfg, events):
+        raise RuntimeError("crashed mid-batch")
+
+    monkeypatch.setattr(pipeline, "process_events", crash)
+    with pytest.raises(RuntimeError):
+        next(watch(cfg, once=True))
+
+    seen = []
+    monkeypatch.setattr(pipeline, "process_events", lambda cfg, events: seen.extend(events) or {})
+    assert [r["new_events"] for r in watch(cfg, once=True)] == [1]
+    assert [e["features"]["text"] for e in seen] == ["one"]
+    assert list(watch(cfg, once=True)) == []  # committed after the successful run